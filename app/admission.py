@@ -0,0 +1,205 @@
+"""
+Admission control for debate connections.
+
+``AdmissionController`` decides whether a new connection may join before
+the server does any per-client work (snapshot, queue, history). Checks run
+cheapest first:
+
+1. Optional per-IP cap on concurrent connections.
+2. Load: while the process is over its memory limit or the event loop is
+   lagging, new spectators are turned away, and existing spectators are
+   shed a fraction at a time. New participants are only turned away once
+   no spectators are left to shed.
+3. Capacity: separate caps for participants and spectators.
+4. Connect rate: a token bucket shared by every new connection.
+
+A rejected connection gets a ``waiting_room`` answer with ``retry_after``
+seconds instead of an error, so a viral link turns into a queue of
+retrying clients rather than an outage.
+"""
+
+import asyncio
+import os
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from .rate_limit import TokenBucket
+
+
+DEFAULT_ADMISSION: Dict[str, Any] = {
+    # Concurrent participants (websocket and HTTP viewers with their own queue)
+    'max_clients': 500,
+    # Concurrent read-only spectators (shared ring buffer)
+    'max_spectators': 5000,
+    # New connections per second, with bursts up to connect_burst
+    'connect_rate': 20.0,
+    'connect_burst': 50,
+    # Concurrent connections from one IP address; None disables. A classroom
+    # or venue behind one NAT shares an address, so only cap this where
+    # viewers are known to have their own
+    'per_ip': None,
+    # Resident memory (MB) above which the server counts as overloaded; None disables
+    'memory_limit_mb': None,
+    # Event loop lag (seconds) above which the server counts as overloaded
+    'max_loop_lag': 0.25,
+    # Share of spectators disconnected per overloaded sample
+    'shed_fraction': 0.1,
+    # Seconds between load samples
+    'sample_interval': 1.0,
+    # Suggested wait for clients turned away by capacity or load
+    'retry_after': 5.0,
+}
+
+
+class Rejection(NamedTuple):
+    """Why a connection was turned away and when to try again."""
+    reason: str
+    retry_after: float
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB, or None where unavailable."""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+class AdmissionController:
+    """Connection caps, connect rate and load shedding for one server."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 on_shed: Optional[Callable[[int], Any]] = None):
+        """
+        Args:
+            config: Overrides for DEFAULT_ADMISSION
+            on_shed: Called with a number of spectators to disconnect while
+                the server is overloaded
+        """
+        self.config = {**DEFAULT_ADMISSION, **(config or {})}
+        self.on_shed = on_shed
+        self.bucket = TokenBucket(self.config['connect_rate'], self.config['connect_burst'])
+
+        # connection -> (ip, spectator)
+        self._admitted: Dict[Hashable, Tuple[str, bool]] = {}
+        self._per_ip: Counter = Counter()
+        self.clients = 0
+        self.spectators = 0
+
+        # Latest load samples
+        self.loop_lag = 0.0
+        self.rss_mb: Optional[float] = None
+        self._sampler: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self.admitted = 0
+        self.rejections: Counter = Counter()
+        self.shed = 0
+
+    def admit(self, connection: Hashable, ip: str, spectator: bool = False) -> Optional[Rejection]:
+        """
+        Decide whether a new connection may join, and record it if so.
+
+        Args:
+            connection: The connection (released with ``release``)
+            ip: Client address used for the per-IP cap
+            spectator: Whether it joins the read-only spectator tier
+
+        Returns:
+            Rejection, or None if admitted
+        """
+        self._start_sampling()
+        config = self.config
+
+        if config['per_ip'] is not None and self._per_ip[ip] >= config['per_ip']:
+            return self._reject('ip_limit', config['retry_after'])
+
+        if self.overloaded() and (spectator or self.spectators == 0):
+            return self._reject('overloaded', config['retry_after'] * 2)
+
+        if spectator and self.spectators >= config['max_spectators']:
+            return self._reject('spectators_full', config['retry_after'])
+        if not spectator and self.clients >= config['max_clients']:
+            return self._reject('clients_full', config['retry_after'])
+
+        if not self.bucket.consume():
+            return self._reject('connect_rate', max(1.0, self.bucket.retry_after()))
+
+        self._admitted[connection] = (ip, spectator)
+        self._per_ip[ip] += 1
+        if spectator:
+            self.spectators += 1
+        else:
+            self.clients += 1
+        self.admitted += 1
+        return None
+
+    def _reject(self, reason: str, retry_after: float) -> Rejection:
+        self.rejections[reason] += 1
+        return Rejection(reason, round(retry_after, 1))
+
+    def release(self, connection: Hashable) -> None:
+        """Forget an admitted connection that left."""
+        entry = self._admitted.pop(connection, None)
+        if entry is None:
+            return
+        ip, spectator = entry
+        self._per_ip[ip] -= 1
+        if self._per_ip[ip] <= 0:
+            del self._per_ip[ip]
+        if spectator:
+            self.spectators -= 1
+        else:
+            self.clients -= 1
+
+    def overloaded(self) -> bool:
+        """Whether the latest samples show memory or CPU (event loop) pressure."""
+        limit = self.config['memory_limit_mb']
+        if limit is not None and self.rss_mb is not None and self.rss_mb > limit:
+            return True
+        return self.loop_lag > self.config['max_loop_lag']
+
+    def _start_sampling(self) -> None:
+        if self._sampler is None:
+            self._schedule_sample(asyncio.get_running_loop())
+
+    def _schedule_sample(self, loop: asyncio.AbstractEventLoop) -> None:
+        interval = self.config['sample_interval']
+        self._sampler = loop.call_later(interval, self._sample, loop, loop.time() + interval)
+
+    def _sample(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        """Measure loop lag and memory; shed spectators while overloaded."""
+        # A busy loop runs this timer late; the delay is the lag
+        self.loop_lag = max(0.0, loop.time() - expected)
+        if self.config['memory_limit_mb'] is not None:
+            self.rss_mb = current_rss_mb()
+
+        if self.overloaded() and self.spectators and self.on_shed:
+            count = max(1, int(self.spectators * self.config['shed_fraction']))
+            self.shed += count
+            self.on_shed(count)
+
+        self._schedule_sample(loop)
+
+    def close(self) -> None:
+        """Stop sampling."""
+        if self._sampler is not None:
+            self._sampler.cancel()
+            self._sampler = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Admitted counts, rejections by reason and load samples."""
+        return {
+            'clients': self.clients,
+            'spectators': self.spectators,
+            'ips': len(self._per_ip),
+            'admitted': self.admitted,
+            'rejected': sum(self.rejections.values()),
+            'rejections': dict(self.rejections),
+            'shed': self.shed,
+            'overloaded': self.overloaded(),
+            'loop_lag': round(self.loop_lag, 3),
+            'rss_mb': round(self.rss_mb, 1) if self.rss_mb is not None else None
+        }
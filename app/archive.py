@@ -0,0 +1,373 @@
+"""
+Compressed, randomly accessible transcript archives.
+
+An archive stores messages in independently compressed blocks so a reader
+can pull a message range, one sender's messages or just the statistics
+without decompressing the whole debate. Layout::
+
+    magic (8 bytes)
+    header length (4 bytes, big-endian) + header JSON (metadata, statistics)
+    block 0 ... block N   (compressed JSON lines, one message per line)
+    footer JSON           (block index: offsets, message_id and timestamp
+                           ranges, per-sender counts)
+    footer offset (8 bytes, big-endian) + magic (8 bytes)
+
+Convert existing JSON transcripts with ``python -m app.archive <file.json>``.
+"""
+
+import bisect
+import json
+import lzma
+import struct
+import sys
+import time
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.chat_log import Message
+
+
+ARCHIVE_MAGIC = b"AIDBARC1"
+ARCHIVE_SUFFIX = ".dbarc"
+DEFAULT_BLOCK_SIZE = 256
+
+CODECS: Dict[str, tuple] = {
+    'zlib': (lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+_LENGTH = struct.Struct('>I')
+_TRAILER = struct.Struct('>Q8s')
+
+
+class BlockInfo:
+    """Index entry for one compressed block."""
+
+    __slots__ = ('offset', 'length', 'count', 'first_id', 'last_id',
+                 'min_timestamp', 'max_timestamp', 'senders')
+
+    def __init__(self, offset: int, length: int, count: int, first_id: int,
+                 last_id: int, min_timestamp: float, max_timestamp: float,
+                 senders: Dict[str, int]):
+        self.offset = offset
+        self.length = length
+        self.count = count
+        self.first_id = first_id
+        self.last_id = last_id
+        self.min_timestamp = min_timestamp
+        self.max_timestamp = max_timestamp
+        self.senders = senders
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the footer representation."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BlockInfo':
+        """Create from the footer representation."""
+        return cls(**data)
+
+
+def write_archive(f: BinaryIO, messages: Iterable['Message'],
+                  statistics: Optional[Dict[str, Any]] = None,
+                  metadata: Optional[Dict[str, Any]] = None,
+                  codec: str = "zlib",
+                  block_size: int = DEFAULT_BLOCK_SIZE,
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Write messages to an archive, one compressed block at a time.
+
+    Args:
+        f: Binary stream opened for writing
+        messages: Iterable of Message objects in message_id order
+        statistics: Chat log statistics stored in the header
+        metadata: Extra header fields
+        codec: Block compression ('zlib' or 'lzma')
+        block_size: Messages per block
+        progress: Called with the number of messages written after each block
+
+    Returns:
+        Number of messages written
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported codec: {codec}")
+    compress = CODECS[codec][0]
+
+    header = {
+        'export_timestamp': time.time(),
+        'codec': codec,
+        'block_size': block_size,
+        'statistics': statistics or {},
+        **(metadata or {})
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    f.write(ARCHIVE_MAGIC)
+    f.write(_LENGTH.pack(len(header_bytes)))
+    f.write(header_bytes)
+    offset = len(ARCHIVE_MAGIC) + _LENGTH.size + len(header_bytes)
+
+    blocks: List[BlockInfo] = []
+    lines: List[str] = []
+    batch: List['Message'] = []
+    written = 0
+
+    def flush_block():
+        nonlocal offset
+        data = compress('\n'.join(lines).encode('utf-8'))
+        f.write(data)
+        timestamps = [msg.timestamp for msg in batch]
+        blocks.append(BlockInfo(
+            offset=offset,
+            length=len(data),
+            count=len(batch),
+            first_id=batch[0].message_id,
+            last_id=batch[-1].message_id,
+            min_timestamp=min(timestamps),
+            max_timestamp=max(timestamps),
+            senders=dict(Counter(msg.sender for msg in batch))
+        ))
+        offset += len(data)
+        lines.clear()
+        batch.clear()
+        if progress:
+            progress(written)
+
+    for msg in messages:
+        lines.append(msg.to_wire())
+        batch.append(msg)
+        written += 1
+        if len(batch) >= block_size:
+            flush_block()
+
+    if batch:
+        flush_block()
+
+    footer = json.dumps({'blocks': [block.to_dict() for block in blocks]},
+                        ensure_ascii=False).encode('utf-8')
+    f.write(footer)
+    f.write(_TRAILER.pack(offset, ARCHIVE_MAGIC))
+
+    return written
+
+
+def is_archive(filename: str) -> bool:
+    """Check whether a file starts with the archive magic bytes."""
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC
+    except OSError:
+        return False
+
+
+class TranscriptArchive:
+    """
+    Random-access reader for transcript archives.
+
+    Opening an archive reads only the header and the footer index; blocks
+    are decompressed on demand and the most recently used ones are cached.
+    """
+
+    def __init__(self, filename: str, cache_blocks: int = 8):
+        """
+        Args:
+            filename: Archive path
+            cache_blocks: Number of decompressed blocks kept in memory
+        """
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._cache: 'OrderedDict[int, List[Message]]' = OrderedDict()
+        self._cache_blocks = cache_blocks
+
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_index(self) -> None:
+        """Read the header and footer index."""
+        f = self._file
+        if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            raise ValueError(f"Not a transcript archive: {self.filename}")
+
+        (header_length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        self.header: Dict[str, Any] = json.loads(f.read(header_length))
+
+        f.seek(-_TRAILER.size, 2)
+        trailer_offset = f.tell()
+        footer_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"Truncated transcript archive: {self.filename}")
+
+        f.seek(footer_offset)
+        footer = json.loads(f.read(trailer_offset - footer_offset))
+        self.blocks = [BlockInfo.from_dict(block) for block in footer['blocks']]
+        self._first_ids = [block.first_id for block in self.blocks]
+        self._decompress = CODECS[self.header.get('codec', 'zlib')][1]
+
+    def _load_block(self, index: int) -> List['Message']:
+        """Decompress a block, using the cache when possible."""
+        from app.chat_log import Message
+
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+
+        block = self.blocks[index]
+        self._file.seek(block.offset)
+        data = self._decompress(self._file.read(block.length)).decode('utf-8')
+        messages = [Message.from_dict(json.loads(line)) for line in data.split('\n')]
+
+        self._cache[index] = messages
+        if len(self._cache) > self._cache_blocks:
+            self._cache.popitem(last=False)
+        return messages
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Header metadata (export time, codec, custom fields)."""
+        return {key: value for key, value in self.header.items() if key != 'statistics'}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get statistics without decompressing any block.
+
+        Returns:
+            Stored chat log statistics merged with counts from the index
+        """
+        by_sender: Counter = Counter()
+        for block in self.blocks:
+            by_sender.update(block.senders)
+
+        return {
+            **self.header.get('statistics', {}),
+            'archived_messages': len(self),
+            'archived_by_sender': dict(by_sender),
+            'first_message_id': self.blocks[0].first_id if self.blocks else None,
+            'last_message_id': self.blocks[-1].last_id if self.blocks else None,
+            'start_timestamp': min((b.min_timestamp for b in self.blocks), default=None),
+            'end_timestamp': max((b.max_timestamp for b in self.blocks), default=None),
+        }
+
+    def get_range(self, start_id: int, end_id: Optional[int] = None) -> List['Message']:
+        """
+        Get messages with start_id <= message_id <= end_id.
+
+        Args:
+            start_id: First message_id (inclusive)
+            end_id: Last message_id (inclusive); None reads to the end
+
+        Returns:
+            Messages in message_id order
+        """
+        index = max(bisect.bisect_right(self._first_ids, start_id) - 1, 0)
+        result = []
+        for i in range(index, len(self.blocks)):
+            block = self.blocks[i]
+            if end_id is not None and block.first_id > end_id:
+                break
+            if block.last_id < start_id:
+                continue
+            result.extend(
+                msg for msg in self._load_block(i)
+                if msg.message_id >= start_id and (end_id is None or msg.message_id <= end_id)
+            )
+        return result
+
+    def get_time_range(self, start_time: float, end_time: float) -> List['Message']:
+        """Get messages with a timestamp in [start_time, end_time]."""
+        result = []
+        for i, block in enumerate(self.blocks):
+            if block.max_timestamp < start_time or block.min_timestamp > end_time:
+                continue
+            result.extend(msg for msg in self._load_block(i)
+                          if start_time <= msg.timestamp <= end_time)
+        return result
+
+    def by_sender(self, sender: str) -> List['Message']:
+        """Get one sender's messages, skipping blocks they do not appear in."""
+        result = []
+        for i, block in enumerate(self.blocks):
+            if sender in block.senders:
+                result.extend(msg for msg in self._load_block(i) if msg.sender == sender)
+        return result
+
+    def iter_messages(self) -> Iterator['Message']:
+        """Iterate over every message, one block at a time."""
+        for i in range(len(self.blocks)):
+            yield from self._load_block(i)
+
+    def __len__(self) -> int:
+        return sum(block.count for block in self.blocks)
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+        self._cache.clear()
+
+    def __enter__(self) -> 'TranscriptArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def convert_json_transcript(source: str, destination: Optional[str] = None,
+                            codec: str = "zlib",
+                            block_size: int = DEFAULT_BLOCK_SIZE) -> Path:
+    """
+    Convert a JSON transcript written by ``save_transcript`` to an archive.
+
+    Args:
+        source: JSON transcript path
+        destination: Archive path (defaults to the source with ``.dbarc``)
+        codec: Block compression ('zlib' or 'lzma')
+        block_size: Messages per block
+
+    Returns:
+        Path of the written archive
+    """
+    from app.chat_log import Message
+
+    source_path = Path(source)
+    destination_path = Path(destination) if destination else source_path.with_suffix(ARCHIVE_SUFFIX)
+
+    with open(source_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    metadata = dict(data.get('metadata', {}))
+    statistics = metadata.pop('statistics', {})
+    metadata.pop('export_timestamp', None)
+    metadata['source'] = source_path.name
+
+    messages = (Message.from_dict(msg) for msg in data.get('messages', []))
+
+    with open(destination_path, 'wb') as f:
+        write_archive(f, messages, statistics, metadata, codec, block_size)
+
+    return destination_path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Convert JSON transcripts given on the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert JSON transcripts to archives")
+    parser.add_argument('transcripts', nargs='+', help="JSON transcript files")
+    parser.add_argument('--codec', choices=sorted(CODECS), default='zlib')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE)
+    args = parser.parse_args(argv)
+
+    for source in args.transcripts:
+        destination = convert_json_transcript(source, codec=args.codec,
+                                              block_size=args.block_size)
+        before = Path(source).stat().st_size
+        after = destination.stat().st_size
+        print(f"📦 {source} -> {destination} ({before:,} -> {after:,} bytes)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
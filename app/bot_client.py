@@ -109,6 +109,9 @@ class BotClient:
     Now with hyperactive autonomous monitoring and decision-making capabilities.
     """
 
+    # Longest a human's typing can keep a bot quiet before it speaks anyway
+    MAX_TYPING_HOLD = 15.0
+
     def __init__(self, name: str, model: str, provider: str,
                  personality: str, stance: str, api_key: str,
                  temperature: float = 0.8, max_tokens: int = 120):
@@ -146,6 +149,12 @@ class BotClient:
         self.total_responses = 0
         self.current_cooldown = self.config.min_cooldown
 
+        # Typing tracker consulted before generating, so bots do not talk
+        # over a human who is composing a message
+        self.typing_state = None
+        self.max_typing_hold = self.MAX_TYPING_HOLD
+        self._typing_hold_since: Optional[float] = None
+
         # Hyperactive behavior properties
         self.burning_questions = self._generate_burning_questions()
         self.conversation_energy = 1.0
@@ -163,7 +172,9 @@ class BotClient:
             'triggers_detected': 0,
             'passes_made': 0,
             'silence_breaks': 0,
-            'conversation_starters': 0
+            'conversation_starters': 0,
+            'typing_holds': 0,
+            'typing_hold_overrides': 0
         }
 
     def _generate_burning_questions(self) -> List[str]:
@@ -217,6 +228,39 @@ class BotClient:
         """Get bot name."""
         return self.config.name
 
+    def set_typing_state(self, typing_state, max_hold: Optional[float] = None):
+        """
+        Hold off responding while anyone tracked by ``typing_state`` is typing.
+
+        Args:
+            typing_state: Tracker with an ``is_typing()`` method
+            max_hold: Seconds of continuous holding after which the bot
+                speaks anyway (default MAX_TYPING_HOLD), so someone who
+                keeps typing cannot silence the bots
+        """
+        self.typing_state = typing_state
+        if max_hold is not None:
+            self.max_typing_hold = max_hold
+        self._typing_hold_since = None
+
+    def _hold_for_typing(self) -> bool:
+        """Whether to skip this turn because someone is typing."""
+        if self.typing_state is None or not self.typing_state.is_typing():
+            self._typing_hold_since = None
+            return False
+
+        now = time.monotonic()
+        if self._typing_hold_since is None:
+            self._typing_hold_since = now
+        elif now - self._typing_hold_since >= self.max_typing_hold:
+            # Held long enough: speak, then start a new hold
+            self._typing_hold_since = None
+            self.stats['typing_hold_overrides'] += 1
+            return False
+
+        self.stats['typing_holds'] += 1
+        return True
+
     async def start_autonomous_monitoring(self, chat_log, topic: str):
         """Start hyperactive autonomous monitoring of chat log."""
         self.is_monitoring = True
@@ -246,6 +290,10 @@ class BotClient:
                     if message.sender == self.name:
                         continue
 
+                    # Skip messages from rate-limited (flooding) senders
+                    if message.has_metadata and message.metadata.get('suppress_bots'):
+                        continue
+
                     # Process new message with hyperactive urgency
                     await self._process_new_message(message)
 
@@ -488,6 +536,11 @@ class BotClient:
                                             spontaneous: bool = False,
                                             conversation_starter: bool = False):
         """Generate and post hyperactive autonomous response."""
+        # A human is composing: skip this turn rather than spend an LLM call
+        # talking over them; their message will trigger a fresh decision
+        if self._hold_for_typing():
+            return
+
         start_time = time.time()
 
         try:
@@ -747,6 +800,51 @@ Provide a clear, energetic response that shows your personality and stance."""
 
         return random.choice(fallback_responses)
 
+    async def request_vote(self, topic: str, candidates: List[str],
+                           recent_messages: List[Message]) -> str:
+        """
+        Ask the model for a structured vote.
+
+        Args:
+            topic: Debate topic
+            candidates: Choices to vote for
+            recent_messages: Discussion the vote is based on
+
+        Returns:
+            The model's raw response, expected as a JSON ballot
+        """
+        context = "\n".join(f"{msg.sender}: {msg.content}" for msg in recent_messages[-8:])
+        choices = ", ".join(f'"{candidate}"' for candidate in candidates)
+        messages = [
+            {
+                'role': 'system',
+                'content': f"""You are {self.config.name} in a debate about: {topic}
+
+Your personality: {self.config.personality}
+Your initial stance: {self.config.stance}
+
+VOTING TIME! Vote objectively on the strength of the arguments presented, not just your initial stance.
+
+Choose exactly one of: {choices}
+
+RESPOND WITH ONLY THIS JSON:
+{{"vote": "<one of the choices>", "reasoning": "<2-3 sentences>"}}"""
+            },
+            {
+                'role': 'user',
+                'content': f"Recent debate discussion:\n{context}\n\nCast your vote now."
+            }
+        ]
+
+        start_time = time.time()
+        try:
+            response = await self.ai_provider.generate_response(messages, self.config)
+        except Exception:
+            self._update_stats(time.time() - start_time, success=False)
+            raise
+        self._update_stats(time.time() - start_time, success=True)
+        return response
+
     async def receive_message(self, message: Message) -> None:
         """Receive a message (for compatibility)."""
         if message.sender != self.name:
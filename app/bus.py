@@ -0,0 +1,608 @@
+"""
+Publish/subscribe bus for chat messages across event loops and processes.
+
+A ``ChatLog`` publishes every message to a topic named after its
+``debate_id``. Gateways in other processes, or on other machines, follow
+the topic with ``ChatLog.follow`` and serve their own clients from a local
+replica, so the audience is no longer capped by one event loop.
+
+- ``InProcessBus`` keeps everything inside one event loop.
+- ``BusBroker`` is a small TCP or Unix-socket broker process::
+
+      python -m app.bus --listen tcp://127.0.0.1:7400
+
+- ``RemoteBus`` is the broker client used by publishers and followers.
+
+Ordering: each topic is sequenced by message_id in one place (the broker or
+the in-process bus), which drops duplicates and anything older than the
+last message it forwarded. Subscriber queues also drop anything at or below
+their cursor, so every follower sees the same sequence. A backlog per topic
+lets followers resume after a cursor when they connect or reconnect.
+"""
+
+import asyncio
+import json
+import math
+import sys
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .chat_log import Message, MessageQueue
+
+
+DEFAULT_BACKLOG = 1000
+
+# Frames queued for a broker subscriber before it is disconnected; it
+# resumes from its cursor when it reconnects
+SUBSCRIBER_QUEUE_SIZE = 10000
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """
+    Parse a bus address.
+
+    Args:
+        address: ``tcp://host:port``, ``host:port``, ``unix:///path`` or a
+            filesystem path
+
+    Returns:
+        ``('tcp', (host, port))`` or ``('unix', path)``
+    """
+    if address.startswith('unix://'):
+        return 'unix', address[len('unix://'):]
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if address.startswith('tcp://'):
+        address = address[len('tcp://'):]
+    elif address.startswith('/') or address.startswith('.'):
+        return 'unix', address
+
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid bus address: {address}")
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+class TopicLog:
+    """Sequencing state and resume backlog for one topic."""
+
+    def __init__(self, backlog_size: int = DEFAULT_BACKLOG):
+        self.last_id = 0
+        self.backlog: Deque[Tuple[int, Any]] = deque(maxlen=backlog_size)
+
+    def accept(self, message_id: int, item: Any) -> bool:
+        """Record an item unless it is a duplicate or out of order."""
+        if message_id <= self.last_id:
+            return False
+        self.last_id = message_id
+        self.backlog.append((message_id, item))
+        return True
+
+    def after(self, message_id: int) -> List[Any]:
+        """Backlog items with a greater message_id, oldest first."""
+        items = []
+        for item_id, item in reversed(self.backlog):
+            if item_id <= message_id:
+                break
+            items.append(item)
+        items.reverse()
+        return items
+
+
+class MessageBus(ABC):
+    """Interface for chat message fan-out between processes."""
+
+    @abstractmethod
+    async def publish(self, topic: str, message: Message) -> None:
+        """
+        Publish a message on a topic.
+
+        Must not wait on other processes: ChatLog calls it for every message
+        in message_id order, and a slow publish would hold up the debate.
+        """
+
+    @abstractmethod
+    async def subscribe(self, topic: str,
+                        after_message_id: Optional[int] = None) -> MessageQueue:
+        """
+        Follow a topic.
+
+        Args:
+            topic: Topic name (a debate_id)
+            after_message_id: Replay retained messages after this cursor
+                first; without it only new messages are delivered
+
+        Returns:
+            Queue receiving Message objects in message_id order
+        """
+
+    @abstractmethod
+    async def unsubscribe(self, topic: str, queue: MessageQueue) -> None:
+        """Stop delivering a topic to a queue."""
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class InProcessBus(MessageBus):
+    """Bus whose publishers and subscribers share one event loop."""
+
+    def __init__(self, backlog_size: int = DEFAULT_BACKLOG):
+        """
+        Args:
+            backlog_size: Messages kept per topic for resuming subscribers
+        """
+        self.backlog_size = backlog_size
+        self.topics: Dict[str, TopicLog] = {}
+        self.subscribers: Dict[str, List[MessageQueue]] = {}
+
+    def _topic(self, topic: str) -> TopicLog:
+        log = self.topics.get(topic)
+        if log is None:
+            log = self.topics[topic] = TopicLog(self.backlog_size)
+        return log
+
+    async def publish(self, topic: str, message: Message) -> None:
+        """Deliver a message to every subscriber of the topic."""
+        if not self._topic(topic).accept(message.message_id, message):
+            return
+        for queue in self.subscribers.get(topic, ()):
+            queue.deliver(message)
+
+    async def subscribe(self, topic: str,
+                        after_message_id: Optional[int] = None) -> MessageQueue:
+        """Follow a topic, optionally replaying the backlog after a cursor."""
+        log = self._topic(topic)
+        queue = MessageQueue(cursor=log.last_id)
+
+        if after_message_id is not None:
+            for message in log.after(after_message_id):
+                queue.put_nowait(message)
+            queue.cursor = max(after_message_id, log.last_id)
+
+        self.subscribers.setdefault(topic, []).append(queue)
+        return queue
+
+    async def unsubscribe(self, topic: str, queue: MessageQueue) -> None:
+        """Stop delivering a topic to a queue."""
+        queues = self.subscribers.get(topic, [])
+        if queue in queues:
+            queues.remove(queue)
+
+
+def _encode_line(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _message_line(topic: str, message_wire: str) -> bytes:
+    """Broker-to-subscriber line embedding an already encoded message."""
+    return ('{"op":"message","topic":' + json.dumps(topic, ensure_ascii=False)
+            + ',"message":' + message_wire + '}\n').encode('utf-8')
+
+
+class _BrokerConnection:
+    """One client connection to the broker with its own writer task."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.topics: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.task = asyncio.create_task(self._write_loop())
+
+    def send(self, line: bytes) -> bool:
+        """Queue a line; a subscriber that falls too far behind is dropped."""
+        try:
+            self.queue.put_nowait(line)
+            return True
+        except asyncio.QueueFull:
+            self.writer.close()
+            return False
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                self.writer.write(await self.queue.get())
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def close(self) -> None:
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.writer.close()
+
+
+class BusBroker:
+    """TCP or Unix-socket broker that sequences and fans out topics."""
+
+    def __init__(self, backlog_size: int = DEFAULT_BACKLOG):
+        """
+        Args:
+            backlog_size: Messages kept per topic for resuming subscribers
+        """
+        self.backlog_size = backlog_size
+        self.topics: Dict[str, TopicLog] = {}
+        self.subscribers: Dict[str, Set[_BrokerConnection]] = {}
+        self.connections: Set[_BrokerConnection] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+
+        # Metrics
+        self.messages_published = 0
+        self.messages_dropped = 0
+        self.frames_sent = 0
+
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Args:
+            address: ``tcp://host:port`` or ``unix:///path`` (see parse_address)
+        """
+        kind, target = parse_address(address)
+        if kind == 'unix':
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=target)
+        else:
+            host, port = target
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def stop(self) -> None:
+        """Close every connection and stop listening."""
+        for connection in list(self.connections):
+            await connection.close()
+        self.connections.clear()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def _topic(self, topic: str) -> TopicLog:
+        log = self.topics.get(topic)
+        if log is None:
+            log = self.topics[topic] = TopicLog(self.backlog_size)
+        return log
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        connection = _BrokerConnection(reader, writer)
+        self.connections.add(connection)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self._handle_request(connection, json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"⚠️ Bad bus request: {e}")
+        except ConnectionError:
+            pass
+        finally:
+            for topic in connection.topics:
+                self.subscribers.get(topic, set()).discard(connection)
+            self.connections.discard(connection)
+            await connection.close()
+
+    def _handle_request(self, connection: _BrokerConnection, request: Dict[str, Any]) -> None:
+        op = request['op']
+        topic = request['topic']
+
+        if op == 'publish':
+            data = request['message']
+            line = _message_line(topic, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            if not self._topic(topic).accept(data['message_id'], line):
+                self.messages_dropped += 1
+                return
+            self.messages_published += 1
+            for subscriber in list(self.subscribers.get(topic, ())):
+                if subscriber.send(line):
+                    self.frames_sent += 1
+
+        elif op == 'subscribe':
+            log = self._topic(topic)
+            after = request.get('after')
+            if after is not None:
+                for line in log.after(after):
+                    connection.send(line)
+            connection.send(_encode_line({'op': 'subscribed', 'topic': topic,
+                                          'last_id': log.last_id}))
+            connection.topics.add(topic)
+            self.subscribers.setdefault(topic, set()).add(connection)
+
+        elif op == 'unsubscribe':
+            connection.topics.discard(topic)
+            self.subscribers.get(topic, set()).discard(connection)
+
+        else:
+            raise ValueError(f"unknown op {op}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broker counters."""
+        return {
+            'connections': len(self.connections),
+            'topics': len(self.topics),
+            'messages_published': self.messages_published,
+            'messages_dropped': self.messages_dropped,
+            'frames_sent': self.frames_sent
+        }
+
+
+class RemoteBus(MessageBus):
+    """
+    Client for a ``BusBroker``; reconnects and resumes from cursors.
+
+    ``publish`` never waits on the network: lines go to an outbox that a
+    single writer task drains. The same task connects (with a timeout),
+    reconnects after a drop and resubscribes, so a broker outage only
+    fills the outbox instead of stalling the publisher.
+    """
+
+    def __init__(self, address: str, reconnect_delay: float = 1.0,
+                 outbox_size: int = DEFAULT_BACKLOG, connect_timeout: float = 5.0):
+        """
+        Args:
+            address: Broker address (see parse_address)
+            reconnect_delay: Seconds between reconnect attempts
+            outbox_size: Lines buffered while disconnected; the oldest are
+                dropped beyond this
+            connect_timeout: Seconds to wait for the broker to accept
+        """
+        self.address = address
+        self.reconnect_delay = reconnect_delay
+        self.connect_timeout = connect_timeout
+
+        self.subscribers: Dict[str, List[MessageQueue]] = {}
+        self._pending_acks: Dict[str, Deque[asyncio.Future]] = {}
+        self._outbox: Deque[bytes] = deque(maxlen=outbox_size)
+        self._outbox_ready = asyncio.Event()
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._closed = False
+
+        # Metrics
+        self.outbox_dropped = 0
+        self.reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        """
+        Connect to the broker and resubscribe every followed topic.
+
+        Called by ``subscribe`` and by the writer task; raises OSError or
+        asyncio.TimeoutError when the broker cannot be reached.
+        """
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            kind, target = parse_address(self.address)
+            if kind == 'unix':
+                opening = asyncio.open_unix_connection(target)
+            else:
+                opening = asyncio.open_connection(*target)
+            self._reader, self._writer = await asyncio.wait_for(opening, self.connect_timeout)
+
+            # Resume every followed topic from the oldest cursor among its queues
+            for topic, queues in self.subscribers.items():
+                cursors = [queue.cursor for queue in queues if queue.cursor != math.inf]
+                self._writer.write(_encode_line({
+                    'op': 'subscribe', 'topic': topic,
+                    'after': min(cursors) if cursors else None
+                }))
+
+            self._reader_task = asyncio.create_task(self._read_loop(self._reader))
+            self._start_writer()
+
+    def _start_writer(self) -> None:
+        """Start the writer task unless it is already running."""
+        if not self._closed and (self._writer_task is None or self._writer_task.done()):
+            self._writer_task = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        """Drain the outbox, reconnecting whenever the connection is lost."""
+        connected_before = False
+        while not self._closed:
+            if not self.connected:
+                try:
+                    await self.connect()
+                except (OSError, asyncio.TimeoutError) as e:
+                    print(f"⚠️ Bus connect failed: {e!r}")
+                    await asyncio.sleep(self.reconnect_delay)
+                    continue
+                if connected_before:
+                    self.reconnects += 1
+                    print(f"🔌 Reconnected to message bus at {self.address}")
+            connected_before = True
+
+            lost = False
+            try:
+                while self._outbox:
+                    self._writer.write(self._outbox.popleft())
+                await self._writer.drain()
+
+                if not self._outbox:
+                    self._outbox_ready.clear()
+                    waiter = asyncio.ensure_future(self._outbox_ready.wait())
+                    await asyncio.wait({waiter, self._reader_task},
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    waiter.cancel()
+            except ConnectionError as e:
+                print(f"⚠️ Bus connection error: {e}")
+                lost = True
+
+            if lost or self._reader_task.done() or not self.connected:
+                # Lost the broker: drop the connection and retry after a pause
+                self._reader_task.cancel()
+                self._writer.close()
+                self._writer = None
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._dispatch(json.loads(line))
+        except (ConnectionError, ValueError) as e:
+            print(f"⚠️ Bus connection error: {e}")
+
+    def _dispatch(self, data: Dict[str, Any]) -> None:
+        topic = data['topic']
+        if data['op'] == 'message':
+            message = Message.from_dict(data['message'])
+            for queue in self.subscribers.get(topic, ()):
+                queue.deliver(message)
+        elif data['op'] == 'subscribed':
+            # One ack answers every subscribe waiting on the topic: callers
+            # that joined during a connect share the subscribe it sent
+            for future in self._pending_acks.pop(topic, ()):
+                if not future.done():
+                    future.set_result(data['last_id'])
+
+    def _send(self, line: bytes) -> None:
+        """Queue a line for the writer task."""
+        if len(self._outbox) == self._outbox.maxlen:
+            self.outbox_dropped += 1
+        self._outbox.append(line)
+        self._outbox_ready.set()
+        self._start_writer()
+
+    async def publish(self, topic: str, message: Message) -> None:
+        """Queue a message for the broker; never waits on the connection."""
+        self._send(('{"op":"publish","topic":' + json.dumps(topic, ensure_ascii=False)
+                    + ',"message":' + message.to_wire() + '}\n').encode('utf-8'))
+
+    async def subscribe(self, topic: str,
+                        after_message_id: Optional[int] = None) -> MessageQueue:
+        """
+        Follow a topic on the broker.
+
+        Raises OSError or asyncio.TimeoutError when the broker cannot be
+        reached or does not acknowledge within ``connect_timeout``.
+        """
+        # Without a cursor the queue ignores everything until the broker
+        # reports where the topic currently is
+        queue = MessageQueue(cursor=math.inf if after_message_id is None else after_message_id)
+        self.subscribers.setdefault(topic, []).append(queue)
+
+        ack = asyncio.get_running_loop().create_future()
+        self._pending_acks.setdefault(topic, deque()).append(ack)
+        try:
+            if not self.connected:
+                await self.connect()  # Sends the subscription for every queue
+            else:
+                self._send(_encode_line({'op': 'subscribe', 'topic': topic,
+                                         'after': after_message_id}))
+            last_id = await asyncio.wait_for(ack, self.connect_timeout)
+        except BaseException:
+            pending = self._pending_acks.get(topic)
+            if pending and ack in pending:
+                pending.remove(ack)
+            await self.unsubscribe(topic, queue)
+            raise
+
+        if queue.cursor == math.inf:
+            queue.cursor = last_id
+        return queue
+
+    async def unsubscribe(self, topic: str, queue: MessageQueue) -> None:
+        """Stop delivering a topic to a queue."""
+        queues = self.subscribers.get(topic, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self.subscribers.pop(topic, None)
+            if self.connected:
+                self._send(_encode_line({'op': 'unsubscribe', 'topic': topic}))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection and outbox counters."""
+        return {
+            'connected': self.connected,
+            'outbox': len(self._outbox),
+            'outbox_dropped': self.outbox_dropped,
+            'reconnects': self.reconnects
+        }
+
+    async def close(self) -> None:
+        """Flush the outbox and disconnect."""
+        self._closed = True
+        for task in (self._writer_task, self._reader_task):
+            if task:
+                task.cancel()
+        await asyncio.gather(*[task for task in (self._writer_task, self._reader_task) if task],
+                             return_exceptions=True)
+        if self.connected:
+            while self._outbox:
+                self._writer.write(self._outbox.popleft())
+            try:
+                await self._writer.drain()
+            except ConnectionError:
+                pass
+            self._writer.close()
+        self._writer = None
+
+
+def create_bus(config: Dict[str, Any]) -> Optional[MessageBus]:
+    """
+    Create a message bus from the ``bus`` config section.
+
+    Args:
+        config: Bus configuration (``backend``, ``address``, ``backlog``)
+
+    Returns:
+        Bus instance, or None when the chat log is not shared
+    """
+    backend = config.get('backend', 'none')
+
+    if backend == 'none':
+        return None
+
+    if backend == 'memory':
+        return InProcessBus(backlog_size=config.get('backlog', DEFAULT_BACKLOG))
+
+    if backend == 'remote':
+        return RemoteBus(config.get('address', 'tcp://127.0.0.1:7400'))
+
+    raise ValueError(f"Unsupported bus backend: {backend}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a standalone broker."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the debate message bus broker")
+    parser.add_argument('--listen', default='tcp://127.0.0.1:7400',
+                        help="tcp://host:port or unix:///path/to/socket")
+    parser.add_argument('--backlog', type=int, default=DEFAULT_BACKLOG,
+                        help="messages kept per topic for resuming followers")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        broker = BusBroker(backlog_size=args.backlog)
+        server = await broker.start(args.listen)
+        print(f"📡 Message bus listening on {args.listen}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\n🛑 Message bus stopped")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,31 +4,65 @@ Enhanced with web broadcasting capabilities for real-time interface.
 """
 
 import asyncio
+import itertools
+import uuid
 import json
+import sys
 import time
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterator, Optional, TYPE_CHECKING
 from pathlib import Path
 from collections import deque
 
+from .segments import SegmentStore
+from .transcript import (export_transcript, TranscriptReader, SUPPORTED_FORMATS,
+                         PROGRESS_INTERVAL, ProgressCallback)
+
 # Avoid circular imports
 if TYPE_CHECKING:
     from app.web_server import DebateWebServer
+    from app.storage import StorageBackend
+    from app.bus import MessageBus
 
 
-@dataclass
 class Message:
-    """Represents a single chat message."""
-    sender: str
-    content: str
-    timestamp: float
-    message_id: int
-    message_type: str = "chat"  # chat, system, moderator, vote
-    metadata: Optional[Dict[str, Any]] = None
-
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    """
+    Represents a single chat message.
+
+    Slotted so that large archives stay small in memory: ``sender`` and
+    ``message_type`` are interned and ``metadata`` is only allocated the first
+    time it is accessed.
+    """
+
+    __slots__ = ('sender', 'content', 'timestamp', 'message_id',
+                 'message_type', '_metadata')
+
+    def __init__(self, sender: str, content: str, timestamp: float,
+                 message_id: int, message_type: str = "chat",
+                 metadata: Optional[Dict[str, Any]] = None):
+        setattr_ = object.__setattr__
+        setattr_(self, 'sender', sys.intern(sender))
+        setattr_(self, 'content', content)
+        setattr_(self, 'timestamp', timestamp)
+        setattr_(self, 'message_id', message_id)
+        setattr_(self, 'message_type', sys.intern(message_type))  # chat, system, moderator, vote
+        setattr_(self, '_metadata', metadata or None)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Message metadata, allocated on first access."""
+        if self._metadata is None:
+            object.__setattr__(self, '_metadata', {})
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]):
+        self._metadata = value or None
+
+    @property
+    def has_metadata(self) -> bool:
+        """Check for metadata without allocating it."""
+        return bool(self._metadata)
 
     @property
     def formatted_timestamp(self) -> str:
@@ -37,13 +71,104 @@ class Message:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary."""
-        return asdict(self)
+        return {
+            'sender': self.sender,
+            'content': self.content,
+            'timestamp': self.timestamp,
+            'message_id': self.message_id,
+            'message_type': self.message_type,
+            'metadata': dict(self._metadata) if self._metadata else {}
+        }
+
+    def to_wire(self) -> str:
+        """Encode message as compact JSON for fan-out, omitting empty metadata."""
+        data = {
+            'sender': self.sender,
+            'content': self.content,
+            'timestamp': self.timestamp,
+            'message_id': self.message_id,
+            'message_type': self.message_type
+        }
+        if self._metadata:
+            data['metadata'] = dict(self._metadata)
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Message':
         """Create message from dictionary."""
         return cls(**data)
 
+    def freeze(self) -> 'FrozenMessage':
+        """Return an immutable copy of this message."""
+        return FrozenMessage(self.sender, self.content, self.timestamp,
+                             self.message_id, self.message_type, self._metadata)
+
+    def _key(self) -> tuple:
+        return (self.sender, self.content, self.timestamp, self.message_id,
+                self.message_type, self._metadata or {})
+
+    def __eq__(self, other):
+        if not isinstance(other, Message):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(sender={self.sender!r}, content={self.content!r}, "
+                f"timestamp={self.timestamp!r}, message_id={self.message_id!r}, "
+                f"message_type={self.message_type!r}, metadata={dict(self._metadata or {})!r})")
+
+    def __reduce__(self):
+        return (type(self), (self.sender, self.content, self.timestamp, self.message_id,
+                             self.message_type, dict(self._metadata) if self._metadata else None))
+
+
+class FrozenMessage(Message):
+    """
+    Immutable message, safe to share between archives and fan-out caches.
+
+    Metadata is copied on construction and exposed read-only, so neither the
+    original message nor readers of the frozen one can change it.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, sender: str, content: str, timestamp: float,
+                 message_id: int, message_type: str = "chat",
+                 metadata: Optional[Dict[str, Any]] = None):
+        super().__init__(sender, content, timestamp, message_id, message_type)
+        object.__setattr__(self, '_metadata', MappingProxyType(dict(metadata or {})))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}' of FrozenMessage")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}' of FrozenMessage")
+
+    def __hash__(self):
+        return hash((self.sender, self.timestamp, self.message_id))
+
+    def freeze(self) -> 'FrozenMessage':
+        """Frozen messages are already immutable."""
+        return self
+
+
+class MessageQueue(asyncio.Queue):
+    """Subscriber queue that remembers the last message_id delivered to it."""
+
+    def __init__(self, cursor: int = 0):
+        super().__init__()
+        self.cursor = cursor
+
+    def deliver(self, message: Message) -> bool:
+        """Queue a message unless it was already delivered (e.g. by a replay)."""
+        if message.message_id <= self.cursor:
+            return False
+        self.put_nowait(message)
+        self.cursor = message.message_id
+        return True
+
 
 class ChatLog:
     """
@@ -51,9 +176,39 @@ class ChatLog:
     Enhanced with web broadcasting for real-time interface updates.
     """
 
-    def __init__(self, max_messages: int = 1000):
+    def __init__(self, max_messages: int = 1000,
+                 cold_storage_dir: Optional[str] = None,
+                 spill_to_disk: bool = True,
+                 storage: Optional['StorageBackend'] = None,
+                 debate_id: Optional[str] = None,
+                 bus: Optional['MessageBus'] = None):
+        """
+        Args:
+            max_messages: Size of the in-memory (hot) message ring
+            cold_storage_dir: Directory for segments of evicted messages; a
+                temporary directory is used when None
+            spill_to_disk: Keep evicted messages in cold storage instead of
+                dropping them
+            storage: Optional durable backend that receives every message
+            debate_id: Key for this debate in the storage backend and bus
+            bus: Optional message bus that receives every message, so
+                gateways in other processes can follow this debate
+        """
         self.messages: deque = deque(maxlen=max_messages)
         self.message_counter = 0
+
+        # Cold tier: messages evicted from the hot ring, created on first eviction
+        self.spill_to_disk = spill_to_disk
+        self.cold_storage_dir = cold_storage_dir
+        self.cold_storage: Optional[SegmentStore] = None
+
+        # Durable storage (e.g. SQLite), written by the backend's own thread
+        self.storage = storage
+        self.debate_id = debate_id or uuid.uuid4().hex
+
+        # Cross-process fan-out, published to after local delivery
+        self.bus = bus
+
         self.subscribers: List[asyncio.Queue] = []
         self._lock = asyncio.Lock()
 
@@ -62,15 +217,7 @@ class ChatLog:
         self.response_times: Dict[str, float] = {}
 
         # Enhanced statistics
-        self.stats = {
-            'total_messages': 0,
-            'messages_by_sender': {},
-            'start_time': time.time(),
-            'bot_responses': 0,
-            'human_responses': 0,
-            'moderator_messages': 0,
-            'silence_breaks': 0
-        }
+        self.stats = self._new_stats()
 
     def set_web_server(self, web_server: 'DebateWebServer'):
         """Set the web server for broadcasting messages."""
@@ -119,49 +266,164 @@ class ChatLog:
                 metadata=metadata or {}
             )
 
-            self.messages.append(message)
+            previous = self.messages[-1] if self.messages else None
+            self._append(message)
+            if self.storage:
+                self.storage.save_message(self.debate_id, message)
 
             # Update enhanced statistics
-            self.stats['total_messages'] += 1
-            self.stats['messages_by_sender'][sender] = (
-                    self.stats['messages_by_sender'].get(sender, 0) + 1
-            )
+            self._record_stats(message, previous)
+
+            await self._deliver(message, response_time)
+
+        # Outside the lock so a slow bus cannot hold up the debate. Nothing
+        # yields before publish queues the message, so the bus still sees
+        # messages in message_id order.
+        if self.bus:
+            try:
+                await self.bus.publish(self.debate_id, message)
+            except Exception as e:
+                print(f"⚠️ Failed to publish message to bus: {e}")
+
+        return message
+
+    async def _deliver(self, message: Message,
+                       response_time: Optional[float] = None) -> None:
+        """Hand a recorded message to local subscribers and the web interface."""
+        # Notify subscribers
+        await self._notify_subscribers(message)
+
+        # Broadcast to web interface
+        if self.web_server:
+            try:
+                # Determine web message type
+                web_message_type = self._get_web_message_type(message.sender, message.message_type)
+
+                await self.web_server.broadcast_message(
+                    sender=message.sender,
+                    content=message.content,
+                    message_type=web_message_type,
+                    response_time=response_time,
+                    message_id=message.message_id
+                )
+            except Exception as e:
+                print(f"⚠️ Failed to broadcast message to web: {e}")
+
+    async def follow(self, bus: 'MessageBus', debate_id: Optional[str] = None) -> None:
+        """
+        Mirror a debate published on a message bus into this log.
+
+        Runs until cancelled, so start it as a task. Messages keep their
+        original ids and reach this log's subscribers and web server as if
+        they had been added here; the log should not also be written to
+        directly. Following resumes after ``message_counter``, so a fresh
+        replica first receives the bus backlog.
+
+        Args:
+            bus: Bus the debate is published on
+            debate_id: Topic to follow (defaults to this log's debate_id)
+        """
+        topic = debate_id or self.debate_id
+        queue = await bus.subscribe(topic, after_message_id=self.message_counter)
+
+        try:
+            while True:
+                message = await queue.get()
+                async with self._lock:
+                    if message.message_id <= self.message_counter:
+                        continue
+                    self.message_counter = message.message_id
+
+                    previous = self.messages[-1] if self.messages else None
+                    self._append(message)
+                    self._record_stats(message, previous)
+
+                    await self._deliver(message)
+        finally:
+            await bus.unsubscribe(topic, queue)
+
+    @staticmethod
+    def _new_stats(start_time: Optional[float] = None) -> Dict[str, Any]:
+        """Create an empty statistics dictionary."""
+        return {
+            'total_messages': 0,
+            'messages_by_sender': {},
+            'start_time': start_time if start_time is not None else time.time(),
+            'bot_responses': 0,
+            'human_responses': 0,
+            'moderator_messages': 0,
+            'silence_breaks': 0
+        }
+
+    def _record_stats(self, message: Message, previous: Optional[Message]) -> None:
+        """
+        Update statistics for a message.
+
+        Shared by add_message and load_transcript so loaded debates
+        report the same numbers as live ones.
+
+        Args:
+            message: The message being recorded
+            previous: The message before it, for silence-break detection
+        """
+        sender = message.sender
+        self.stats['total_messages'] += 1
+        self.stats['messages_by_sender'][sender] = (
+                self.stats['messages_by_sender'].get(sender, 0) + 1
+        )
+
+        # Update type-specific stats
+        if sender in ["Socrates", "Advocate", "Skeptic", "Mediator"]:
+            self.stats['bot_responses'] += 1
+
+            # Check for silence breaks (responses within 10 seconds)
+            if previous is not None:
+                time_diff = message.timestamp - previous.timestamp
+                if time_diff < 10:
+                    self.stats['silence_breaks'] += 1
+
+        elif sender == "Moderator":
+            self.stats['moderator_messages'] += 1
+        else:
+            self.stats['human_responses'] += 1
+
+    def _append(self, message: Message) -> None:
+        """Append to the hot ring, spilling the oldest message to disk when full."""
+        if self.spill_to_disk and len(self.messages) == self.messages.maxlen:
+            if self.cold_storage is None:
+                self.cold_storage = SegmentStore(self.cold_storage_dir)
+            self.cold_storage.append(self.messages[0])
+        self.messages.append(message)
+
+    def iter_messages(self, after_message_id: int = 0) -> Iterator[Message]:
+        """
+        Iterate over all messages across the cold and hot tiers.
+
+        Both tiers are snapshotted when this is called, so the returned
+        iterator can be consumed later, even from a worker thread.
+
+        Args:
+            after_message_id: Only yield messages with a greater message_id
 
-            # Update type-specific stats
-            if sender in ["Socrates", "Advocate", "Skeptic", "Mediator"]:
-                self.stats['bot_responses'] += 1
-
-                # Check for silence breaks (responses within 10 seconds)
-                if len(self.messages) > 1:
-                    last_message = list(self.messages)[-2]
-                    time_diff = message.timestamp - last_message.timestamp
-                    if time_diff < 10:
-                        self.stats['silence_breaks'] += 1
-
-            elif sender == "Moderator":
-                self.stats['moderator_messages'] += 1
-            else:
-                self.stats['human_responses'] += 1
-
-            # Notify subscribers
-            await self._notify_subscribers(message)
-
-            # Broadcast to web interface
-            if self.web_server:
-                try:
-                    # Determine web message type
-                    web_message_type = self._get_web_message_type(sender, message_type)
-
-                    await self.web_server.broadcast_message(
-                        sender=sender,
-                        content=content,
-                        message_type=web_message_type,
-                        response_time=response_time
-                    )
-                except Exception as e:
-                    print(f"⚠️ Failed to broadcast message to web: {e}")
-
-            return message
+        Returns:
+            Iterator of messages in message_id order
+        """
+        hot = list(self.messages)
+        cold_snapshot = self.cold_storage.snapshot() if self.cold_storage else None
+        cold = self.cold_storage
+
+        def generate():
+            hot_first_id = hot[0].message_id if hot else None
+            if cold_snapshot:
+                for message in cold.iter_messages(after_message_id, cold_snapshot):
+                    if hot_first_id is not None and message.message_id >= hot_first_id:
+                        break
+                    yield message
+            for message in hot:
+                if message.message_id > after_message_id:
+                    yield message
+
+        return generate()
 
     def _get_web_message_type(self, sender: str, message_type: str) -> str:
         """Determine web message type based on sender and message type."""
@@ -181,18 +443,37 @@ class ChatLog:
         # Send to all active subscribers
         for queue in self.subscribers:
             try:
-                await queue.put(message)
+                if isinstance(queue, MessageQueue):
+                    queue.deliver(message)
+                else:
+                    await queue.put(message)
             except Exception as e:
                 print(f"Failed to notify subscriber: {e}")
 
-    def subscribe(self) -> asyncio.Queue:
+    def subscribe(self, after_message_id: Optional[int] = None) -> asyncio.Queue:
         """
         Subscribe to receive new messages.
 
+        When ``after_message_id`` is given, every retained message after that
+        cursor is queued first, then live messages follow with no gap and no
+        duplicates. A cursor ahead of ``message_counter`` replays the whole log.
+
+        Args:
+            after_message_id: Replay messages with a greater message_id
+
         Returns:
             Queue that will receive new Message objects
         """
-        queue = asyncio.Queue()
+        queue = MessageQueue(cursor=self.message_counter)
+
+        if after_message_id is not None:
+            if after_message_id > self.message_counter:
+                # Cursor from an earlier log (restart, clear() or a loaded
+                # transcript): none of this log's messages were delivered
+                after_message_id = 0
+            for message in self.get_messages_after(after_message_id):
+                queue.put_nowait(message)
+
         self.subscribers.append(queue)
         return queue
 
@@ -201,6 +482,42 @@ class ChatLog:
         if queue in self.subscribers:
             self.subscribers.remove(queue)
 
+    def get_messages_after(self, message_id: int,
+                           limit: Optional[int] = None) -> List[Message]:
+        """
+        Get messages with a message_id greater than the cursor.
+
+        Falls back to cold storage when the cursor is older than the hot ring.
+
+        Args:
+            message_id: Cursor; 0 returns everything
+            limit: Maximum number of messages to return (oldest first)
+
+        Returns:
+            Messages in message_id order
+        """
+        if self.cold_storage and self.messages and self.messages[0].message_id > message_id + 1:
+            return list(itertools.islice(self.iter_messages(message_id), limit))
+
+        # Walk back from the newest message; replay windows are usually short
+        backlog = []
+        for message in reversed(self.messages):
+            if message.message_id <= message_id:
+                break
+            backlog.append(message)
+        backlog.reverse()
+
+        if limit:
+            backlog = backlog[:limit]
+
+        return backlog
+
+    def _reset_subscriber_cursors(self) -> None:
+        """Point subscriber cursors at the current message counter."""
+        for queue in self.subscribers:
+            if isinstance(queue, MessageQueue):
+                queue.cursor = self.message_counter
+
     def get_messages(self, limit: Optional[int] = None,
                      sender: Optional[str] = None,
                      message_type: Optional[str] = None,
@@ -208,6 +525,8 @@ class ChatLog:
         """
         Get messages with optional filtering.
 
+        Reads across the hot ring and cold storage.
+
         Args:
             limit: Maximum number of messages to return
             sender: Filter by sender name
@@ -217,23 +536,28 @@ class ChatLog:
         Returns:
             List of matching messages
         """
-        messages = list(self.messages)
+        unfiltered = not (sender or message_type or since_timestamp)
+        if unfiltered and limit and limit <= len(self.messages):
+            # The newest messages are all in the hot ring
+            return list(self.messages)[-limit:]
+
+        messages = self.iter_messages() if self.cold_storage else iter(list(self.messages))
 
         # Apply filters
         if sender:
-            messages = [m for m in messages if m.sender == sender]
+            messages = (m for m in messages if m.sender == sender)
 
         if message_type:
-            messages = [m for m in messages if m.message_type == message_type]
+            messages = (m for m in messages if m.message_type == message_type)
 
         if since_timestamp:
-            messages = [m for m in messages if m.timestamp > since_timestamp]
+            messages = (m for m in messages if m.timestamp > since_timestamp)
 
         # Apply limit
         if limit:
-            messages = messages[-limit:]
+            return list(deque(messages, maxlen=limit))
 
-        return messages
+        return list(messages)
 
     def get_recent_messages(self, count: int = 10) -> List[Message]:
         """Get the most recent messages."""
@@ -265,7 +589,7 @@ class ChatLog:
 
     def search_messages(self, query: str, case_sensitive: bool = False) -> List[Message]:
         """
-        Search messages by content.
+        Search messages by content across the hot ring and cold storage.
 
         Args:
             query: Search query
@@ -278,7 +602,7 @@ class ChatLog:
             query = query.lower()
 
         results = []
-        for message in self.messages:
+        for message in self.iter_messages():
             content = message.content if case_sensitive else message.content.lower()
             if query in content:
                 results.append(message)
@@ -301,6 +625,7 @@ class ChatLog:
                                     if duration > 0 else 0),
             'session_duration_minutes': duration / 60,
             'current_message_count': len(self.messages),
+            'archived_messages': len(self.cold_storage) if self.cold_storage else 0,
             'response_rate': {
                 'bots': self.stats['bot_responses'] / max(1, self.stats['total_messages']),
                 'humans': self.stats['human_responses'] / max(1, self.stats['total_messages']),
@@ -318,184 +643,144 @@ class ChatLog:
                 print(f"⚠️ Failed to broadcast statistics: {e}")
 
     async def save_transcript(self, filename: str,
-                              format_type: str = "json") -> None:
+                              format_type: str = "json",
+                              compress: Optional[bool] = None,
+                              progress_callback: Optional[ProgressCallback] = None) -> int:
         """
         Save chat transcript to file.
 
+        The transcript is streamed to disk in a worker thread so the event
+        loop keeps serving bots and websocket clients during large exports.
+
         Args:
             filename: Output filename
-            format_type: Format (json, txt, html)
-        """
-        filepath = Path(filename)
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-
-        messages = list(self.messages)
-
-        if format_type == "json":
-            data = {
-                'metadata': {
-                    'export_timestamp': time.time(),
-                    'total_messages': len(messages),
-                    'statistics': self.get_statistics(),
-                    'web_enabled': self.web_server is not None
-                },
-                'messages': [msg.to_dict() for msg in messages]
-            }
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-        elif format_type == "txt":
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write("=== AI JUBILEE DEBATE TRANSCRIPT ===\n")
-                f.write(f"Session Duration: {self.get_statistics()['session_duration_minutes']:.1f} minutes\n")
-                f.write(f"Total Messages: {len(messages)}\n")
-                f.write(f"Bot Responses: {self.stats['bot_responses']}\n")
-                f.write(f"Silence Breaks: {self.stats['silence_breaks']}\n\n")
-
-                for msg in messages:
-                    f.write(f"[{msg.formatted_timestamp}] {msg.sender}: {msg.content}\n")
-
-        elif format_type == "html":
-            html_content = self._generate_html_transcript(messages)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            format_type: Format (json, txt, html, archive)
+            compress: Gzip the output (defaults to True for ``.gz`` filenames)
+            progress_callback: Called on the event loop as
+                ``callback(written, total)`` while the export runs
 
-        else:
+        Returns:
+            Number of messages written
+        """
+        if format_type not in SUPPORTED_FORMATS:
             raise ValueError(f"Unsupported format: {format_type}")
 
-    def _generate_html_transcript(self, messages: List[Message]) -> str:
-        """Generate enhanced HTML transcript."""
-        stats = self.get_statistics()
-
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>AI Jubilee Debate Transcript</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-                .header {{ background: white; padding: 20px; border-radius: 10px; margin-bottom: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }}
-                .stat-card {{ background: white; padding: 15px; border-radius: 8px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-                .stat-value {{ font-size: 2em; font-weight: bold; color: #4f46e5; }}
-                .stat-label {{ color: #666; margin-top: 5px; }}
-                .message {{ margin: 10px 0; padding: 15px; border-left: 4px solid #ccc; background: white; border-radius: 0 8px 8px 0; }}
-                .moderator {{ border-left-color: #8b5cf6; background: #faf5ff; }}
-                .bot {{ border-left-color: #10b981; background: #f0fdf4; }}
-                .human {{ border-left-color: #f59e0b; background: #fffbeb; }}
-                .system {{ border-left-color: #6c757d; background: #e9ecef; }}
-                .timestamp {{ color: #6c757d; font-size: 0.9em; }}
-                .sender {{ font-weight: bold; margin-right: 10px; }}
-                .response-time {{ background: #4f46e5; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; margin-left: 10px; }}
-                .content {{ margin-top: 8px; line-height: 1.5; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🎭 AI Jubilee Debate Transcript</h1>
-                <p><strong>Session Duration:</strong> {stats['session_duration_minutes']:.1f} minutes</p>
-                <p><strong>Generated:</strong> {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
-            </div>
-            
-            <div class="stats">
-                <div class="stat-card">
-                    <div class="stat-value">{stats['total_messages']}</div>
-                    <div class="stat-label">Total Messages</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{stats['bot_responses']}</div>
-                    <div class="stat-label">Bot Responses</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{stats['silence_breaks']}</div>
-                    <div class="stat-label">Silence Breaks</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-value">{stats['messages_per_minute']:.1f}</div>
-                    <div class="stat-label">Messages/Minute</div>
-                </div>
-            </div>
+        # Snapshot on the loop; the worker thread must not iterate the live deque
+        messages = self.iter_messages()
+        total = len(self.messages) + (len(self.cold_storage) if self.cold_storage else 0)
+
+        thread_callback = None
+        if progress_callback:
+            loop = asyncio.get_running_loop()
+
+            def thread_callback(written: int, total: Optional[int]) -> None:
+                loop.call_soon_threadsafe(progress_callback, written, total)
+
+        return await asyncio.to_thread(
+            export_transcript,
+            messages,
+            filename,
+            format_type,
+            statistics=self.get_statistics(),
+            metadata={'web_enabled': self.web_server is not None},
+            classify=lambda msg: self._get_web_message_type(msg.sender, msg.message_type),
+            compress=compress,
+            progress_callback=thread_callback,
+            total=total
+        )
+
+    async def load_transcript(self, filename: str,
+                              progress_callback: Optional[ProgressCallback] = None) -> int:
         """
+        Load a transcript, replacing the current messages.
 
-        for msg in messages:
-            css_class = self._get_web_message_type(msg.sender, msg.message_type)
-            html += f"""
-            <div class="message {css_class}">
-                <div>
-                    <span class="timestamp">[{msg.formatted_timestamp}]</span>
-                    <span class="sender">{msg.sender}:</span>
-                </div>
-                <div class="content">{msg.content.replace('', '<br>')}</div>
-            </div>
-            """
-
-        html += """
-        </body>
-        </html>
-        """
+        JSON transcripts (optionally gzip-compressed) are decoded
+        incrementally and archives are read block by block, in a worker
+        thread, so memory stays bounded however large the file is. Messages
+        beyond the in-memory ring go to cold storage when spilling is
+        enabled, and all statistics are rebuilt from the loaded messages.
 
-        return html
+        Args:
+            filename: Input filename (JSON transcript or archive)
+            progress_callback: Called on the event loop as ``callback(loaded, total)``
 
-    async def load_transcript(self, filename: str) -> None:
+        Returns:
+            Number of messages loaded
         """
-        Load transcript from JSON file.
+        from .archive import TranscriptArchive, is_archive
 
-        Args:
-            filename: Input filename
-        """
         filepath = Path(filename)
 
         if not filepath.exists():
             raise FileNotFoundError(f"Transcript file not found: {filename}")
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if is_archive(filename):
+            archive = TranscriptArchive(filename)
+            messages = archive.iter_messages()
+            get_total = lambda: len(archive)
+            close = archive.close
+        else:
+            reader = TranscriptReader(filename)
+            messages = (Message.from_dict(msg_data) for msg_data in reader)
+            get_total = lambda: reader.metadata.get('total_messages')
+            close = messages.close
+
+        def next_batch() -> List[Message]:
+            return list(itertools.islice(messages, PROGRESS_INTERVAL))
 
         # Clear current messages
         async with self._lock:
             self.messages.clear()
             self.message_counter = 0
+            self._drop_cold_storage()
+            self.stats = self._new_stats()
 
-            # Reset stats
-            self.stats = {
-                'total_messages': 0,
-                'messages_by_sender': {},
-                'start_time': time.time(),
-                'bot_responses': 0,
-                'human_responses': 0,
-                'moderator_messages': 0,
-                'silence_breaks': 0
-            }
+            loaded = 0
+            previous = None
+            try:
+                while True:
+                    batch = await asyncio.to_thread(next_batch)
+                    if not batch:
+                        break
 
-            # Load messages
-            for msg_data in data.get('messages', []):
-                message = Message.from_dict(msg_data)
-                self.messages.append(message)
-                self.message_counter = max(self.message_counter, message.message_id)
+                    if previous is None:
+                        self.stats['start_time'] = batch[0].timestamp
 
-                # Update stats
-                self.stats['total_messages'] += 1
-                self.stats['messages_by_sender'][message.sender] = (
-                    self.stats['messages_by_sender'].get(message.sender, 0) + 1
-                )
+                    for message in batch:
+                        self._append(message)
+                        self.message_counter = max(self.message_counter, message.message_id)
+                        self._record_stats(message, previous)
+                        previous = message
 
-        print(f"📄 Loaded {len(self.messages)} messages from transcript")
+                    loaded += len(batch)
+                    if progress_callback:
+                        progress_callback(loaded, get_total())
+            finally:
+                close()
+
+            self._reset_subscriber_cursors()
+
+        print(f"📄 Loaded {loaded} messages from transcript")
+        return loaded
 
     def clear(self) -> None:
         """Clear all messages from the chat log."""
         self.messages.clear()
         self.message_counter = 0
         self.response_times.clear()
-        self.stats = {
-            'total_messages': 0,
-            'messages_by_sender': {},
-            'start_time': time.time(),
-            'bot_responses': 0,
-            'human_responses': 0,
-            'moderator_messages': 0,
-            'silence_breaks': 0
-        }
+        self._reset_subscriber_cursors()
+        self._drop_cold_storage()
+        self.stats = self._new_stats()
+
+    def _drop_cold_storage(self) -> None:
+        """Discard cold storage segments."""
+        if self.cold_storage:
+            self.cold_storage.close()
+            self.cold_storage = None
+
+    def close(self) -> None:
+        """Release cold storage files."""
+        self._drop_cold_storage()
 
     def get_participant_stats(self, participant_name: str) -> Dict[str, Any]:
         """Get statistics for a specific participant."""
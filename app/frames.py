@@ -0,0 +1,150 @@
+"""
+Encode-once websocket frames.
+
+Broadcast frames are serialized a single time and the same immutable string
+is handed to every socket. Chat message frames are also cached by message,
+so replays and history batches reuse the encoding done for the live
+broadcast. ``orjson`` is used when installed; the stdlib ``json`` module is
+the fallback.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+if TYPE_CHECKING:
+    from app.chat_log import Message
+
+
+def _encode_stdlib(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def _encode_orjson(data: Any) -> str:
+    try:
+        return orjson.dumps(data).decode('utf-8')
+    except TypeError:
+        # Non-string keys or exotic values: let the stdlib handle them
+        return _encode_stdlib(data)
+
+
+JSON_BACKENDS: Dict[str, Callable[[Any], str]] = {'json': _encode_stdlib}
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = _encode_orjson
+
+_encode: Callable[[Any], str] = JSON_BACKENDS.get('orjson', _encode_stdlib)
+
+
+def set_json_backend(name: str) -> None:
+    """
+    Select the JSON encoder used for frames.
+
+    Args:
+        name: 'json' or 'orjson' (only when installed)
+    """
+    global _encode
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"JSON backend not available: {name}")
+    _encode = JSON_BACKENDS[name]
+
+
+def get_json_backend() -> str:
+    """Name of the JSON encoder in use."""
+    return 'orjson' if _encode is _encode_orjson else 'json'
+
+
+def encode_frame(data: Any) -> str:
+    """Serialize a frame with the active JSON backend."""
+    return _encode(data)
+
+
+class FrameCache:
+    """
+    Bounded LRU cache of encoded frames keyed by channel and key.
+
+    Message frames are keyed by ``(message_id, timestamp)`` so a chat log
+    that is cleared and restarts its ids never serves a stale frame.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        """
+        Args:
+            maxsize: Number of frames kept
+        """
+        self.maxsize = maxsize
+        self._frames: 'OrderedDict[tuple, str]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, channel: str, key: Hashable,
+            build: Callable[[], Any]) -> str:
+        """
+        Return the cached frame, encoding ``build()`` on a miss.
+
+        Args:
+            channel: Frame family (e.g. 'message', 'message_data')
+            key: Identity of the payload within the channel
+            build: Produces the frame payload to encode
+
+        Returns:
+            Encoded frame
+        """
+        cache_key = (channel, key)
+        frame = self._frames.get(cache_key)
+        if frame is not None:
+            self._frames.move_to_end(cache_key)
+            self.hits += 1
+            return frame
+
+        self.misses += 1
+        frame = _encode(build())
+        self._store(cache_key, frame)
+        return frame
+
+    def _store(self, cache_key: tuple, frame: str) -> None:
+        """Insert a frame, evicting the least recently used one."""
+        self._frames[cache_key] = frame
+        if len(self._frames) > self.maxsize:
+            self._frames.popitem(last=False)
+
+    def message_data(self, message: 'Message') -> str:
+        """Encoded ``message.to_dict()``, shared by live and history frames."""
+        return self.get('message_data', (message.message_id, message.timestamp),
+                        message.to_dict)
+
+    def message_frame(self, message: 'Message') -> str:
+        """Encoded ``{"type": "message", "data": ...}`` frame for a chat message."""
+        cache_key = ('message', (message.message_id, message.timestamp))
+        frame = self._frames.get(cache_key)
+        if frame is not None:
+            self._frames.move_to_end(cache_key)
+            self.hits += 1
+            return frame
+
+        self.misses += 1
+        frame = '{"type":"message","data":' + self.message_data(message) + '}'
+        self._store(cache_key, frame)
+        return frame
+
+    def history_frame(self, messages: Iterable['Message'],
+                      last_message_id: int) -> str:
+        """Encoded history frame assembled from cached message encodings."""
+        data = ','.join(self.message_data(msg) for msg in messages)
+        return '{"type":"history","data":[' + data + '],"last_message_id":' + str(int(last_message_id)) + '}'
+
+    def clear(self) -> None:
+        """Drop every cached frame."""
+        self._frames.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters."""
+        return {'frames': len(self), 'hits': self.hits, 'misses': self.misses,
+                'backend': get_json_backend()}
@@ -0,0 +1,283 @@
+"""
+Single-port realtime gateway for debate websockets.
+
+``RealtimeGateway`` owns one websocket listener and routes each connection
+to a room by path (``/rooms/<room_id>`` or ``/<room_id>``) or by a
+``?room=<room_id>`` query parameter. A room is any connection handler, such
+as ``DebateWebServer.handle_client`` or ``StreamingServer.handle_client``,
+so the web interface and the streaming API for any number of debates can
+share one port and one heartbeat.
+
+Rooms may register optional subprotocols (such as the binary wire format).
+The gateway picks one only if the client offers it; clients that offer
+none still connect and get the default JSON protocol.
+
+``ChannelIndex`` keeps subscribers per channel so a broadcast walks only
+the clients that want it instead of checking every client.
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+
+# Broadcast channels clients can subscribe to
+CHANNELS = ('chat', 'votes', 'bot_activity', 'stats')
+
+# Close code sent when a connection names a room that does not exist
+UNKNOWN_ROOM_CLOSE_CODE = 1008
+
+
+class ChannelIndex:
+    """
+    Per-channel subscriber sets.
+
+    Clients receive every channel until they subscribe to specific ones.
+    Those "broad" clients live in one set; narrowed clients are indexed
+    under each channel they chose. Both are disjoint, so the recipients
+    of a channel are the broad set plus that channel's index.
+    """
+
+    def __init__(self, broad: Optional[Set[Any]] = None,
+                 channels: Iterable[str] = CHANNELS):
+        """
+        Args:
+            broad: Set of clients that receive every channel; may be shared
+                with the owner's own client set
+            channels: Valid channel names
+        """
+        self.broad: Set[Any] = broad if broad is not None else set()
+        self.channels = tuple(channels)
+        self._subscribers: Dict[str, Set[Any]] = {channel: set() for channel in self.channels}
+        self._narrowed: Dict[Any, FrozenSet[str]] = {}
+
+    def add(self, client: Any) -> None:
+        """Register a client for every channel."""
+        self.remove(client)
+        self.broad.add(client)
+
+    def subscribe(self, client: Any, channels: Optional[Iterable[str]]) -> List[str]:
+        """
+        Limit a client to some channels.
+
+        Args:
+            client: Connected client
+            channels: Channel names; empty or None restores every channel
+
+        Returns:
+            Channels the client now receives (unknown names are ignored)
+        """
+        chosen = frozenset(channel for channel in (channels or ()) if channel in self._subscribers)
+        self.remove(client)
+
+        if not chosen or len(chosen) == len(self.channels):
+            self.broad.add(client)
+            return list(self.channels)
+
+        self._narrowed[client] = chosen
+        for channel in chosen:
+            self._subscribers[channel].add(client)
+        return [channel for channel in self.channels if channel in chosen]
+
+    def remove(self, client: Any) -> None:
+        """Forget a client."""
+        self.broad.discard(client)
+        for channel in self._narrowed.pop(client, ()):
+            self._subscribers[channel].discard(client)
+
+    def recipients(self, *channels: str) -> List[Any]:
+        """
+        Clients that should receive a frame published on any of ``channels``.
+
+        Returns a list so callers may safely drop clients while sending.
+        """
+        if not self._narrowed:
+            return list(self.broad)
+
+        if len(channels) == 1:
+            narrowed = self._subscribers.get(channels[0], ())
+        else:
+            narrowed = set()
+            for channel in channels:
+                narrowed |= self._subscribers.get(channel, set())
+        return [*self.broad, *narrowed]
+
+    def get_channels(self, client: Any) -> List[str]:
+        """Channels a client receives."""
+        chosen = self._narrowed.get(client)
+        if chosen is None:
+            return list(self.channels)
+        return [channel for channel in self.channels if channel in chosen]
+
+    def __contains__(self, client: Any) -> bool:
+        return client in self.broad or client in self._narrowed
+
+    def __len__(self) -> int:
+        return len(self.broad) + len(self._narrowed)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Subscriber counts per channel."""
+        broad = len(self.broad)
+        return {channel: broad + len(subscribers)
+                for channel, subscribers in self._subscribers.items()}
+
+
+class RealtimeGateway:
+    """One websocket listener serving many debate rooms."""
+
+    def __init__(self, host: str = "localhost", port: int = 8081,
+                 ping_interval: float = 20, ping_timeout: float = 10,
+                 max_size: int = 1024 * 1024, subprotocols: Sequence[str] = ()):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port shared by every room
+            ping_interval: Seconds between heartbeat pings (shared by all rooms)
+            ping_timeout: Seconds to wait for a pong before dropping a client
+            max_size: Largest inbound frame in bytes
+            subprotocols: Optional subprotocols, in order of preference
+        """
+        self.host = host
+        self.port = port
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.max_size = max_size
+        self.subprotocols: List[str] = list(subprotocols)
+
+        self.rooms: Dict[str, Callable[[Any], Awaitable[None]]] = {}
+        self.default_room: Optional[str] = None
+        self.server = None
+
+        # Metrics
+        self.connections: Dict[str, int] = {}
+        self.total_connections: Dict[str, int] = {}
+        self.rejected_connections = 0
+        self.start_time = time.time()
+
+    def add_room(self, room_id: str, handler: Callable[[Any], Awaitable[None]],
+                 default: bool = False) -> None:
+        """
+        Route a room to a connection handler.
+
+        Args:
+            room_id: Room name used in the path or ``room`` query parameter
+            handler: Coroutine function called with each websocket
+            default: Serve this room for connections that name no room
+        """
+        if room_id in self.rooms:
+            raise ValueError(f"Room {room_id} already exists")
+
+        self.rooms[room_id] = handler
+        self.connections[room_id] = 0
+        self.total_connections[room_id] = 0
+        if default or self.default_room is None:
+            self.default_room = room_id
+
+    def remove_room(self, room_id: str) -> None:
+        """Stop routing new connections to a room."""
+        self.rooms.pop(room_id, None)
+        self.connections.pop(room_id, None)
+        self.total_connections.pop(room_id, None)
+        if self.default_room == room_id:
+            self.default_room = next(iter(self.rooms), None)
+
+    def add_subprotocol(self, subprotocol: str) -> None:
+        """Accept an optional subprotocol (takes effect for new handshakes)."""
+        if subprotocol not in self.subprotocols:
+            self.subprotocols.append(subprotocol)
+
+    def _select_subprotocol(self, first: Any, second: Any) -> Optional[str]:
+        """
+        Pick the first of our subprotocols the client offered, or none.
+
+        The websockets library calls this as ``(connection, offered)`` in
+        its asyncio API and as ``(offered, server_protocols)`` in the legacy
+        one; either way a client that offers nothing is accepted.
+        """
+        offered = first if isinstance(first, (list, tuple)) else second
+        for subprotocol in self.subprotocols:
+            if subprotocol in (offered or ()):
+                return subprotocol
+        return None
+
+    def resolve_room(self, path: str) -> Optional[str]:
+        """
+        Find the room a request path names.
+
+        Args:
+            path: Request path including any query string
+
+        Returns:
+            Room id, or None if the path names an unknown room
+        """
+        parsed = urlparse(path or '/')
+        room = parse_qs(parsed.query).get('room')
+        if room:
+            room_id = room[0]
+        else:
+            parts = [part for part in parsed.path.split('/') if part]
+            if parts and parts[0] == 'rooms':
+                parts = parts[1:]
+            room_id = parts[0] if parts else self.default_room
+
+        return room_id if room_id in self.rooms else None
+
+    async def start(self):
+        """Start listening."""
+        print(f"🚀 Starting realtime gateway on ws://{self.host}:{self.port}")
+
+        self.server = await websockets.serve(
+            self._handle_connection,
+            self.host,
+            self.port,
+            max_size=self.max_size,
+            select_subprotocol=self._select_subprotocol,
+            ping_interval=self.ping_interval,
+            ping_timeout=self.ping_timeout
+        )
+
+        print(f"✅ Realtime gateway serving {len(self.rooms)} room(s) on ws://{self.host}:{self.port}")
+        return self.server
+
+    async def stop(self) -> None:
+        """Stop listening and close every connection."""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle_connection(self, websocket) -> None:
+        """Route a new connection to its room."""
+        request = getattr(websocket, 'request', None)
+        path = getattr(request, 'path', None) or getattr(websocket, 'path', '') or '/'
+        room_id = self.resolve_room(path)
+
+        if room_id is None:
+            self.rejected_connections += 1
+            await websocket.close(code=UNKNOWN_ROOM_CLOSE_CODE, reason="Unknown room")
+            return
+
+        self.connections[room_id] += 1
+        self.total_connections[room_id] += 1
+        try:
+            await self.rooms[room_id](websocket)
+        finally:
+            if room_id in self.connections:
+                self.connections[room_id] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection counts per room."""
+        return {
+            'rooms': {
+                room_id: {
+                    'connections': self.connections[room_id],
+                    'total_connections': self.total_connections[room_id]
+                }
+                for room_id in self.rooms
+            },
+            'connections': sum(self.connections.values()),
+            'rejected_connections': self.rejected_connections,
+            'uptime_seconds': time.time() - self.start_time
+        }
@@ -0,0 +1,358 @@
+"""
+Server-Sent Events and long-poll transports for the debate web server.
+
+Viewers behind proxies that break websockets, and pages embedding a debate,
+can follow it over plain HTTP. Each HTTP viewer joins ``DebateWebServer``
+exactly like a websocket client: it gets the cached room snapshot, a bounded
+outbound queue and channel subscriptions, and is sent the same frame strings
+that are encoded once per broadcast.
+
+- ``GET /events`` is an SSE stream. Frames that advance the ``message_id``
+  cursor carry an ``id:``, so browsers resume with ``Last-Event-ID``.
+- ``GET /poll`` is the long-poll fallback. The first request opens a
+  session; the following ones (``?session=<id>``) wait for the next batch.
+
+Both accept ``?channels=chat,votes`` and ``?after=<message_id>``.
+"""
+
+import asyncio
+import math
+import re
+import secrets
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+
+# Encoded SSE events kept for frames still being fanned out
+SSE_CACHE_SIZE = 256
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_HEARTBEAT = 15.0
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+SSE_RETRY_MS = 3000
+
+_FRAME_TYPE = re.compile(r'\{"type":\s*"(\w+)"')
+_MESSAGE_ID = re.compile(r'"message_id":\s*(\d+)')
+_LAST_MESSAGE_ID = re.compile(r'"last_message_id":\s*(\d+)')
+
+HTTP_HEADERS = [('Access-Control-Allow-Origin', '*'), ('Cache-Control', 'no-store')]
+
+
+def frame_cursor(frame: str) -> Optional[int]:
+    """
+    Read the message_id cursor a frame advances a client to, without
+    parsing the JSON.
+
+    Args:
+        frame: Encoded frame
+
+    Returns:
+        The chat message's id, a history or snapshot's ``last_message_id``,
+        or None for other frames
+    """
+    match = _FRAME_TYPE.match(frame)
+    if not match:
+        return None
+    frame_type = match.group(1)
+    if frame_type == 'message':
+        ids = _MESSAGE_ID.findall(frame)
+        return int(ids[-1]) if ids else None
+    if frame_type in ('history', 'room_snapshot'):
+        match = _LAST_MESSAGE_ID.search(frame)
+        return int(match.group(1)) if match else None
+    return None
+
+
+class SseEncoder:
+    """Wraps encoded frames as SSE events, once per frame."""
+
+    def __init__(self, maxsize: int = SSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._events: 'OrderedDict[str, bytes]' = OrderedDict()
+
+        # Metrics
+        self.encodes = 0
+        self.hits = 0
+
+    def encode(self, frame: str) -> bytes:
+        """Get the SSE event for a frame; every client shares the bytes."""
+        event = self._events.get(frame)
+        if event is not None:
+            self.hits += 1
+            return event
+
+        cursor = frame_cursor(frame)
+        event = ((f"id: {cursor}\n" if cursor is not None else "")
+                 + "data: " + frame + "\n\n").encode()
+        self.encodes += 1
+        self._events[frame] = event
+        if len(self._events) > self.maxsize:
+            self._events.popitem(last=False)
+        return event
+
+
+class SseConnection:
+    """An event stream, adapted to the websocket interface ``ClientSender`` writes to."""
+
+    def __init__(self, writer: asyncio.StreamWriter, encoder: SseEncoder):
+        self.writer = writer
+        self.encoder = encoder
+        self.remote_address = writer.get_extra_info('peername')
+        self.closed = asyncio.Event()
+
+    async def send(self, frame: str) -> None:
+        if self.closed.is_set() or self.writer.is_closing():
+            raise websockets.exceptions.ConnectionClosed(None, None)
+        try:
+            self.writer.write(self.encoder.encode(frame))
+            await self.writer.drain()
+        except ConnectionError as e:
+            self.closed.set()
+            raise websockets.exceptions.ConnectionClosed(None, None) from e
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed.set()
+        self.writer.close()
+
+
+class LongPollSession:
+    """Frames waiting for a long-poll client's next request."""
+
+    def __init__(self, session_id: str, max_batch: int = 256):
+        self.session_id = session_id
+        self.max_batch = max_batch
+        self.remote_address = ('long-poll', session_id)
+        self.closed = False
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+        self._frames: List[str] = []
+        self._ready = asyncio.Event()
+        self._room = asyncio.Event()
+        self._room.set()
+
+    async def send(self, frame: str) -> None:
+        """
+        Buffer a frame for the next poll.
+
+        Waits while a full batch is pending, so a client that stops polling
+        backs up its outbound queue and is downgraded or evicted like a
+        slow websocket.
+        """
+        while len(self._frames) >= self.max_batch and not self.closed:
+            self._room.clear()
+            await self._room.wait()
+        if self.closed:
+            raise websockets.exceptions.ConnectionClosed(None, None)
+        self._frames.append(frame)
+        self._ready.set()
+
+    async def take(self, timeout: float) -> List[str]:
+        """Wait up to ``timeout`` seconds for frames and return them all."""
+        if not self._frames and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        frames, self._frames = self._frames, []
+        self._room.set()
+        return frames
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed = True
+        self._ready.set()
+        self._room.set()
+
+
+class HttpStreamEndpoints:
+    """SSE and long-poll routes feeding from a ``DebateWebServer``."""
+
+    def __init__(self, web_server, poll_timeout: float = 25.0,
+                 session_timeout: float = 60.0, max_batch: int = 256,
+                 heartbeat: float = SSE_HEARTBEAT):
+        """
+        Args:
+            web_server: DebateWebServer whose broadcasts are served
+            poll_timeout: Seconds a long-poll request waits for frames
+            session_timeout: Seconds a long-poll session survives without a request
+            max_batch: Frames buffered per long-poll session
+            heartbeat: Seconds between keep-alive comments on idle event streams
+        """
+        self.web_server = web_server
+        self.poll_timeout = poll_timeout
+        self.session_timeout = session_timeout
+        self.max_batch = max_batch
+        self.heartbeat = heartbeat
+
+        self.encoder = SseEncoder()
+        self.sse_clients: Set[SseConnection] = set()
+        self.sessions: Dict[str, LongPollSession] = {}
+
+        # Metrics
+        self.sse_connections = 0
+        self.polls = 0
+        self.sessions_expired = 0
+
+    def mount(self, server, events_path: str = "/events", poll_path: str = "/poll") -> None:
+        """
+        Add the routes to a ``StaticFileServer``.
+
+        Args:
+            server: HTTP server serving the web interface
+            events_path: Path of the SSE stream
+            poll_path: Path of the long-poll endpoint
+        """
+        server.add_route(events_path, self.handle_events)
+        server.add_route(poll_path, self.handle_poll)
+
+    @staticmethod
+    def _parse_request(target: str, headers: Dict[str, str]) -> Tuple[Dict[str, str], Optional[int],
+                                                                       Optional[List[str]]]:
+        """Query parameters, resume cursor and channels of a request."""
+        query = {key: values[0] for key, values in parse_qs(urlparse(target).query).items()}
+        cursor = headers.get('last-event-id') or query.get('after') or query.get('lastEventId')
+        channels = query.get('channels')
+        return (query,
+                int(cursor) if cursor and cursor.isdigit() else None,
+                [c for c in channels.split(',') if c] if channels else None)
+
+    def _busy(self, rejection) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """503 with Retry-After and a waiting-room body for a turned-away viewer."""
+        return (503, HTTP_HEADERS + [('Retry-After', str(math.ceil(rejection.retry_after))),
+                                     ('Content-Type', 'application/json')],
+                self.web_server.waiting_room_frame(rejection).encode())
+
+    @staticmethod
+    def _method_not_allowed() -> Tuple[int, List[Tuple[str, str]], bytes]:
+        return 405, [('Allow', 'GET')], b''
+
+    async def handle_events(self, method: str, target: str, headers: Dict[str, str],
+                            reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Stream broadcasts as Server-Sent Events until the client leaves."""
+        if method != 'GET':
+            return self._method_not_allowed()
+
+        _, cursor, channels = self._parse_request(target, headers)
+        connection = SseConnection(writer, self.encoder)
+        rejection = self.web_server.admit(connection, connection.remote_address)
+        if rejection:
+            return self._busy(rejection)
+
+        writer.write(("HTTP/1.1 200 OK\r\n"
+                      "Content-Type: text/event-stream\r\n"
+                      "Cache-Control: no-store\r\n"
+                      "Connection: keep-alive\r\n"
+                      "X-Accel-Buffering: no\r\n"
+                      "Access-Control-Allow-Origin: *\r\n\r\n"
+                      f"retry: {SSE_RETRY_MS}\n\n").encode())
+
+        self.sse_connections += 1
+        self.sse_clients.add(connection)
+
+        # The client never sends anything; EOF means it went away
+        eof = asyncio.ensure_future(self._wait_for_eof(reader))
+        closed = asyncio.ensure_future(connection.closed.wait())
+        try:
+            await self.web_server.join_client(connection, cursor, channels)
+            while True:
+                done, _ = await asyncio.wait({eof, closed}, timeout=self.heartbeat,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if done:
+                    break
+                writer.write(b": keepalive\n\n")
+        except ConnectionError:
+            pass
+        finally:
+            eof.cancel()
+            closed.cancel()
+            self.sse_clients.discard(connection)
+            await self.web_server.leave_client(connection)
+        return None
+
+    @staticmethod
+    async def _wait_for_eof(reader: asyncio.StreamReader) -> None:
+        """Read and discard whatever the client sends until it closes."""
+        try:
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+
+    async def handle_poll(self, method: str, target: str, headers: Dict[str, str],
+                          reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer a long-poll request with the frames queued for its session."""
+        if method != 'GET':
+            return self._method_not_allowed()
+
+        query, cursor, channels = self._parse_request(target, headers)
+        session_id = query.get('session')
+        self.polls += 1
+
+        if session_id:
+            session = self.sessions.get(session_id)
+            if session is None or session.closed:
+                self.sessions.pop(session_id, None)
+                body = b'{"type":"session_expired"}'
+                return 410, HTTP_HEADERS + [('Content-Type', 'application/json')], body
+        else:
+            session = LongPollSession(secrets.token_urlsafe(12), self.max_batch)
+            rejection = self.web_server.admit(session, writer.get_extra_info('peername'))
+            if rejection:
+                return self._busy(rejection)
+            self.sessions[session.session_id] = session
+            try:
+                await self.web_server.join_client(session, cursor, channels)
+            except BaseException:
+                self.sessions.pop(session.session_id, None)
+                await session.close()
+                await self.web_server.leave_client(session)
+                raise
+
+        if session.expiry:
+            session.expiry.cancel()
+        try:
+            frames = await session.take(self.poll_timeout)
+        finally:
+            session.expiry = asyncio.get_running_loop().call_later(
+                self.session_timeout, self._expire, session.session_id)
+
+        # The frames are already encoded; only the envelope is built here
+        body = ('{"type":"poll","session":"' + session.session_id
+                + '","frames":[' + ','.join(frames) + ']}').encode()
+        return 200, HTTP_HEADERS + [('Content-Type', 'application/json')], body
+
+    def _expire(self, session_id: str) -> None:
+        """Drop a long-poll session whose client stopped polling."""
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return
+        self.sessions_expired += 1
+        asyncio.ensure_future(session.close())
+        asyncio.ensure_future(self.web_server.leave_client(session))
+
+    async def close(self) -> None:
+        """Disconnect every HTTP viewer."""
+        for connection in list(self.sse_clients):
+            await connection.close()
+        for session_id in list(self.sessions):
+            session = self.sessions.pop(session_id)
+            if session.expiry:
+                session.expiry.cancel()
+            await session.close()
+            await self.web_server.leave_client(session)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection and encoding counters."""
+        return {
+            'sse_clients': len(self.sse_clients),
+            'sse_connections': self.sse_connections,
+            'poll_sessions': len(self.sessions),
+            'polls': self.polls,
+            'sessions_expired': self.sessions_expired,
+            'sse_encodes': self.encoder.encodes,
+            'sse_cache_hits': self.encoder.hits
+        }
@@ -15,6 +15,8 @@ from .bot_client import BotClient
 from .human_client import HumanClient
 from .chat_log import ChatLog
 from .voting import VotingSystem
+from .storage import create_storage
+from .bus import create_bus
 from .streaming import StreamingServer
 from .utils import setup_logging, load_config
 
@@ -43,11 +45,19 @@ async def start_debate_session(
     # Setup logging
     setup_logging(config.get('chat', {}).get('log_level', 'INFO'))
 
+    # Optional durable storage shared by the chat log and voting system
+    storage = create_storage(config.get('storage', {}))
+
+    # Optional message bus so gateway processes can follow this debate
+    bus = create_bus(config.get('bus', {}))
+
     # Initialize chat log
-    chat_log = ChatLog()
+    chat_log = ChatLog(storage=storage, bus=bus)
+    if bus:
+        print(f"📡 Publishing debate {chat_log.debate_id} on the message bus")
 
     # Initialize voting system
-    voting_system = VotingSystem(config.get('voting', {}))
+    voting_system = VotingSystem(config.get('voting', {}), storage=storage)
 
     # Select topic
     if not topic:
@@ -129,6 +139,12 @@ async def start_debate_session(
         if config.get('chat', {}).get('save_transcripts', True):
             await chat_log.save_transcript(f"debate_{topic[:20]}.json")
 
+        if bus:
+            await bus.close()
+
+        if storage:
+            await asyncio.to_thread(storage.close)
+
 
 @click.command()
 @click.option('--topic', '-t', help='Debate topic')
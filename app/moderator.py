@@ -4,6 +4,7 @@ Now acts as an AI-powered facilitator using the same system as other bots.
 """
 
 import asyncio
+import functools
 import time
 import random
 from typing import List, Dict, Any, Optional
@@ -446,11 +447,39 @@ class Moderator:
             self.phase_times[DebatePhase.VOTING]
         )
 
-        await asyncio.sleep(self.phase_times[DebatePhase.VOTING])
+        # Bots vote concurrently; the phase ends as soon as every eligible
+        # voter has voted instead of always waiting out the full duration
+        collection = asyncio.ensure_future(self.collect_bot_votes())
+        await self.voting_system.wait_for_votes()
+        await asyncio.gather(collection, return_exceptions=True)
 
         results = await self.voting_system.end_voting()
         return results
 
+    async def collect_bot_votes(self) -> Dict[str, Optional[str]]:
+        """
+        Ask every eligible bot participant for a vote at once.
+
+        Votes are recorded in the active voting session as they arrive; all
+        bots share the session's deadline.
+
+        Returns:
+            Bot name -> candidate voted for (None if it gave no valid vote)
+        """
+        voting = self.voting_system
+        if not voting.is_active:
+            return {}
+
+        recent_messages = self.chat_log.get_messages(limit=10)
+        ballots = {}
+        for name, participant in self.participants.items():
+            if not isinstance(participant, BotClient) or not voting.is_eligible_voter(name):
+                continue
+            ballots[name] = functools.partial(participant.request_vote, self.topic,
+                                              list(voting.candidates), recent_messages)
+
+        return await voting.collect_votes(ballots)
+
     async def _results_phase(self, voting_results: Dict[str, Any]):
         """Announce final results."""
         self.state.phase = DebatePhase.RESULTS
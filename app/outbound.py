@@ -0,0 +1,185 @@
+"""
+Per-client outbound queues for websocket broadcasting.
+
+Each connected client gets a ``ClientSender``: a bounded queue of encoded
+frames drained by its own writer task. Broadcasting becomes an O(1)
+enqueue per client, so one stalled socket no longer delays everyone else.
+Slow consumers are first downgraded (low-priority frames such as bot
+activity are dropped for them) and evicted if they still cannot keep up.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import websockets
+
+
+# Close code sent to evicted clients ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ClientSender:
+    """Bounded outbound queue and writer task for one websocket."""
+
+    def __init__(self, websocket, max_queue: int = 256,
+                 slow_send_threshold: float = 0.5,
+                 send_timeout: float = 10.0,
+                 on_evict: Optional[Callable[['ClientSender', str], None]] = None):
+        """
+        Args:
+            websocket: Connection to write to
+            max_queue: Frames queued before the client counts as overflowing
+            slow_send_threshold: Seconds per send above which the client is downgraded
+            send_timeout: Seconds a single send may take before the client is evicted
+            on_evict: Called as ``on_evict(sender, reason)`` when the client is evicted
+        """
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.slow_send_threshold = slow_send_threshold
+        self.send_timeout = send_timeout
+        self.on_evict = on_evict
+
+        self.degraded = False
+        self.closed = False
+
+        # Metrics
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.last_send_latency = 0.0
+        self.max_send_latency = 0.0
+        self.connected_at = time.time()
+
+        self._queue: Deque[Tuple[str, bool]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, frame: str, droppable: bool = False) -> bool:
+        """
+        Queue an encoded frame without waiting.
+
+        Args:
+            frame: Encoded frame
+            droppable: Whether the frame may be skipped for a slow client
+
+        Returns:
+            True if the frame was queued
+        """
+        if self.closed:
+            return False
+
+        if droppable and self.degraded:
+            self.frames_dropped += 1
+            return False
+
+        if len(self._queue) >= self.max_queue:
+            if not self.degraded:
+                self._degrade()
+            if droppable:
+                self.frames_dropped += 1
+                return False
+            if len(self._queue) >= self.max_queue:
+                self.evict("send queue overflow")
+                return False
+
+        self._queue.append((frame, droppable))
+        self._wakeup.set()
+        return True
+
+    def _degrade(self) -> None:
+        """Stop sending low-priority frames and purge the queued ones."""
+        self.degraded = True
+        before = len(self._queue)
+        self._queue = deque(item for item in self._queue if not item[1])
+        self.frames_dropped += before - len(self._queue)
+        print(f"🐢 Downgraded slow client {getattr(self.websocket, 'remote_address', '')}")
+
+    async def _run(self) -> None:
+        """Writer task: send queued frames in order."""
+        loop = asyncio.get_running_loop()
+
+        while not self.closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            frame, _ = self._queue.popleft()
+            started = loop.time()
+            try:
+                await asyncio.wait_for(self.websocket.send(frame), self.send_timeout)
+            except asyncio.TimeoutError:
+                self.evict("send timeout")
+                return
+            except websockets.exceptions.ConnectionClosed:
+                self.evict("connection closed")
+                return
+            except Exception as e:
+                print(f"❌ Error sending to client: {e}")
+                self.evict("send error")
+                return
+
+            latency = loop.time() - started
+            self.frames_sent += 1
+            self.last_send_latency = latency
+            self.max_send_latency = max(self.max_send_latency, latency)
+
+            if latency > self.slow_send_threshold:
+                if not self.degraded:
+                    self._degrade()
+            elif self.degraded and not self._queue:
+                # Caught up with fast sends: restore full fidelity
+                self.degraded = False
+
+    def evict(self, reason: str) -> None:
+        """Stop sending and close the connection."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self._wakeup.set()
+
+        if reason != "connection closed":
+            print(f"🚫 Evicting client {getattr(self.websocket, 'remote_address', '')}: {reason}")
+            asyncio.ensure_future(self._close_websocket(reason))
+
+        if self.on_evict:
+            self.on_evict(self, reason)
+
+    async def _close_websocket(self, reason: str) -> None:
+        """Close the websocket, ignoring errors from a dead connection."""
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason=reason),
+                self.send_timeout
+            )
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Stop the writer task; queued frames are discarded."""
+        self.closed = True
+        self._queue.clear()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of frames waiting to be sent."""
+        return len(self._queue)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery metrics for this client."""
+        return {
+            'queue_depth': self.queue_depth,
+            'degraded': self.degraded,
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'last_send_latency': self.last_send_latency,
+            'max_send_latency': self.max_send_latency,
+            'connected_for': time.time() - self.connected_at
+        }
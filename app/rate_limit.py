@@ -0,0 +1,215 @@
+"""
+Token-bucket rate limiting for inbound websocket traffic.
+
+``InboundLimiter`` checks every client frame in two steps:
+
+1. Before JSON parsing: the frame size and the connection's overall frame
+   budget. Floods are rejected without parsing them.
+2. After parsing: a quota per message type (``human_message``, ``typing``,
+   ``ping``...) per connection, plus one chat budget per connection shared
+   by every chat message type.
+
+Everything is keyed on the connection, never on the client-supplied sender
+name, so one client cannot spend another's budget. Connections whose chat
+messages were rejected recently count as flooding. Their accepted messages
+are still shown but do not trigger bots, so spam cannot drive LLM calls.
+"""
+
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+
+DEFAULT_LIMITS: Dict[str, Any] = {
+    'max_frame_bytes': 8192,
+    # Every frame from one connection
+    'connection': {'rate': 20.0, 'burst': 40},
+    # Per message type, per connection
+    'types': {
+        'human_message': {'rate': 0.5, 'burst': 5},
+        'user_message': {'rate': 0.5, 'burst': 5},
+        'typing': {'rate': 5.0, 'burst': 10},
+        'stop_typing': {'rate': 5.0, 'burst': 10},
+        'ping': {'rate': 1.0, 'burst': 5},
+        # Replays and snapshots cost far more to answer than to ask for
+        'resume': {'rate': 1.0, 'burst': 10},
+        'state_resync': {'rate': 0.5, 'burst': 3},
+    },
+    # Chat messages per connection, across chat message types
+    'chat': {'rate': 0.5, 'burst': 5},
+    # Seconds after a rejected chat message during which a connection's
+    # messages do not trigger bots
+    'flood_window': 30.0,
+}
+
+CHAT_TYPES = frozenset({'human_message', 'user_message'})
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second up to ``burst``."""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float, now: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic() if now is None else now
+
+    def available(self, tokens: float = 1.0, now: Optional[float] = None) -> bool:
+        """Refill, then report whether ``tokens`` could be taken."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= tokens
+
+    def consume(self, tokens: float = 1.0, now: Optional[float] = None) -> bool:
+        """Take tokens if available."""
+        if self.available(tokens, now):
+            self.tokens -= tokens
+            return True
+        return False
+
+    def retry_after(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` will be available."""
+        if self.tokens >= tokens or self.rate <= 0:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+
+class _ConnectionLimits:
+    """Buckets and flood state for one connection."""
+
+    __slots__ = ('frames', 'chat', 'types', 'rejected_at')
+
+    def __init__(self, frames: TokenBucket, chat: TokenBucket):
+        self.frames = frames
+        self.chat = chat
+        self.types: Dict[str, TokenBucket] = {}
+        self.rejected_at: Optional[float] = None  # Last rejected chat message
+
+
+class InboundLimiter:
+    """Per-connection and per-type limits for client frames."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: Overrides for DEFAULT_LIMITS (``types`` entries are merged)
+        """
+        config = config or {}
+        self.max_frame_bytes = config.get('max_frame_bytes', DEFAULT_LIMITS['max_frame_bytes'])
+        self.connection_limit = {**DEFAULT_LIMITS['connection'], **config.get('connection', {})}
+        self.type_limits = {**DEFAULT_LIMITS['types'], **config.get('types', {})}
+        self.chat_limit = {**DEFAULT_LIMITS['chat'], **config.get('chat', {})}
+        self.flood_window = config.get('flood_window', DEFAULT_LIMITS['flood_window'])
+
+        # Dropped by forget() when a connection closes
+        self._connections: Dict[Any, _ConnectionLimits] = {}
+
+        # Metrics
+        self.accepted = 0
+        self.rejections: Counter = Counter()
+
+    def _connection(self, connection: Any) -> _ConnectionLimits:
+        limits = self._connections.get(connection)
+        if limits is None:
+            limits = self._connections[connection] = _ConnectionLimits(
+                TokenBucket(self.connection_limit['rate'], self.connection_limit['burst']),
+                TokenBucket(self.chat_limit['rate'], self.chat_limit['burst']))
+        return limits
+
+    def check_frame(self, connection: Any, frame: Any) -> Optional[str]:
+        """
+        Cheap checks on a raw frame, before it is parsed.
+
+        Args:
+            connection: Connection the frame arrived on
+            frame: Raw frame (str or bytes)
+
+        Returns:
+            Rejection reason, or None to accept
+        """
+        size = len(frame)
+        if isinstance(frame, str) and size <= self.max_frame_bytes < size * 4:
+            # The limit is in bytes and UTF-8 needs up to 4 per character
+            size = len(frame.encode('utf-8'))
+        if size > self.max_frame_bytes:
+            return self._reject('frame_too_large')
+        if not self._connection(connection).frames.consume():
+            return self._reject('connection_rate')
+        return None
+
+    def check_message(self, connection: Any, message_type: str) -> Optional[str]:
+        """
+        Per-type and chat quotas for a parsed message.
+
+        Tokens are only taken once every applicable bucket has one, so a
+        rejected message costs nothing.
+
+        Args:
+            connection: Connection the message arrived on
+            message_type: The message's ``type``
+
+        Returns:
+            Rejection reason, or None to accept
+        """
+        limits = self._connection(connection)
+        chat = message_type in CHAT_TYPES
+        buckets = []
+
+        limit = self.type_limits.get(message_type)
+        if limit:
+            bucket = limits.types.get(message_type)
+            if bucket is None:
+                bucket = limits.types[message_type] = TokenBucket(limit['rate'], limit['burst'])
+            if not bucket.available():
+                return self._reject(f"type_rate:{message_type}", limits if chat else None)
+            buckets.append(bucket)
+
+        if chat:
+            if not limits.chat.available():
+                return self._reject('chat_rate', limits)
+            buckets.append(limits.chat)
+
+        for bucket in buckets:
+            bucket.consume()
+        self.accepted += 1
+        return None
+
+    def _reject(self, reason: str, limits: Optional[_ConnectionLimits] = None) -> str:
+        self.rejections[reason] += 1
+        if limits is not None:
+            limits.rejected_at = time.monotonic()
+        return reason
+
+    def retry_after(self, connection: Any, message_type: str) -> float:
+        """Seconds until a rejected message type would be accepted again."""
+        limits = self._connection(connection)
+        waits = [limits.frames.retry_after()]
+        bucket = limits.types.get(message_type)
+        if bucket:
+            waits.append(bucket.retry_after())
+        if message_type in CHAT_TYPES:
+            waits.append(limits.chat.retry_after())
+        return max(waits)
+
+    def is_flooding(self, connection: Any) -> bool:
+        """Whether a connection's chat messages were rejected within the flood window."""
+        limits = self._connections.get(connection)
+        return (limits is not None and limits.rejected_at is not None
+                and time.monotonic() - limits.rejected_at < self.flood_window)
+
+    def forget(self, connection: Any) -> None:
+        """Drop a closed connection's buckets."""
+        self._connections.pop(connection, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Acceptance and rejection counters."""
+        return {
+            'accepted': self.accepted,
+            'rejected': sum(self.rejections.values()),
+            'rejections': dict(self.rejections),
+            'flooding_connections': sum(1 for connection in self._connections
+                                        if self.is_flooding(connection))
+        }
@@ -0,0 +1,189 @@
+"""
+On-disk cold storage for chat messages evicted from the in-memory ring.
+
+Messages are appended as JSON lines to segment files. A segment is sealed
+(made immutable) once it holds ``segment_size`` messages, and each segment
+keeps a sparse ``message_id -> byte offset`` index so reads can seek close
+to a cursor instead of scanning the whole file.
+"""
+
+import bisect
+import json
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.chat_log import Message
+
+
+class Segment:
+    """A single segment file and its sparse index."""
+
+    __slots__ = ('path', 'first_id', 'last_id', 'first_timestamp',
+                 'last_timestamp', 'count', 'size', 'index_ids',
+                 'index_offsets', 'sealed')
+
+    def __init__(self, path: Path, first_id: int):
+        self.path = path
+        self.first_id = first_id
+        self.last_id = first_id
+        self.first_timestamp = 0.0
+        self.last_timestamp = 0.0
+        self.count = 0
+        self.size = 0
+        self.index_ids: List[int] = []
+        self.index_offsets: List[int] = []
+        self.sealed = False
+
+    def offset_for(self, after_id: int) -> int:
+        """Return a byte offset at or before the first message after ``after_id``."""
+        position = bisect.bisect_right(self.index_ids, after_id) - 1
+        return self.index_offsets[position] if position >= 0 else 0
+
+
+class SegmentStore:
+    """
+    Append-only store of immutable message segments.
+
+    Writes happen on the event loop (one buffered line per evicted message).
+    Reads use a snapshot of segment boundaries, so a worker thread can
+    stream a snapshot while the loop keeps appending.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 segment_size: int = 10000, index_interval: int = 64):
+        """
+        Args:
+            directory: Where segments are written; a temporary directory that
+                is removed with the store is used when None
+            segment_size: Messages per segment before it is sealed
+            index_interval: Messages between sparse index entries
+        """
+        if directory is None:
+            self.directory = Path(tempfile.mkdtemp(prefix="aidebate-chatlog-"))
+            self._cleanup = weakref.finalize(self, shutil.rmtree,
+                                             str(self.directory), True)
+        else:
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._cleanup = None
+
+        self.segment_size = segment_size
+        self.index_interval = index_interval
+
+        self.segments: List[Segment] = []
+        self._active_file = None
+
+    def append(self, message: 'Message') -> None:
+        """Append a message; message_ids must be increasing."""
+        segment = self.segments[-1] if self.segments else None
+        if segment is None or segment.sealed:
+            segment = self._open_segment(message.message_id)
+
+        if segment.count % self.index_interval == 0:
+            segment.index_ids.append(message.message_id - 1)
+            segment.index_offsets.append(segment.size)
+
+        line = message.to_wire().encode('utf-8') + b'\n'
+        self._active_file.write(line)
+
+        if segment.count == 0:
+            segment.first_timestamp = message.timestamp
+        segment.size += len(line)
+        segment.count += 1
+        segment.last_id = message.message_id
+        segment.last_timestamp = message.timestamp
+
+        if segment.count >= self.segment_size:
+            self._seal(segment)
+
+    def _open_segment(self, first_id: int) -> Segment:
+        """Start a new active segment."""
+        segment = Segment(self.directory / f"segment-{first_id:012d}.jsonl", first_id)
+        self._active_file = open(segment.path, 'wb')
+        self.segments.append(segment)
+        return segment
+
+    def _seal(self, segment: Segment) -> None:
+        """Close a full segment and write its index next to it."""
+        self._active_file.close()
+        self._active_file = None
+        segment.sealed = True
+
+        index = {
+            'first_id': segment.first_id,
+            'last_id': segment.last_id,
+            'count': segment.count,
+            'index': list(zip(segment.index_ids, segment.index_offsets))
+        }
+        segment.path.with_suffix('.idx').write_text(json.dumps(index), encoding='utf-8')
+
+    def flush(self) -> None:
+        """Flush the active segment so readers see every appended message."""
+        if self._active_file:
+            self._active_file.flush()
+
+    def snapshot(self) -> List[Tuple[Segment, int]]:
+        """
+        Capture segment boundaries for a consistent read.
+
+        Returns:
+            (segment, byte size) pairs covering everything appended so far
+        """
+        self.flush()
+        return [(segment, segment.size) for segment in self.segments]
+
+    def iter_messages(self, after_id: int = 0,
+                      snapshot: Optional[List[Tuple[Segment, int]]] = None) -> Iterator['Message']:
+        """
+        Iterate stored messages with a message_id greater than ``after_id``.
+
+        Args:
+            after_id: Cursor; 0 reads everything
+            snapshot: Boundaries from ``snapshot()``; taken now when omitted
+
+        Yields:
+            Messages in message_id order
+        """
+        from app.chat_log import Message
+
+        if snapshot is None:
+            snapshot = self.snapshot()
+
+        for segment, size in snapshot:
+            if segment.last_id <= after_id:
+                continue
+
+            with open(segment.path, 'rb') as f:
+                offset = segment.offset_for(after_id)
+                f.seek(offset)
+                while offset < size:
+                    line = f.readline()
+                    offset += len(line)
+                    data = json.loads(line)
+                    if data['message_id'] > after_id:
+                        yield Message.from_dict(data)
+
+    @property
+    def first_id(self) -> Optional[int]:
+        """Oldest stored message_id."""
+        return self.segments[0].first_id if self.segments else None
+
+    @property
+    def last_id(self) -> Optional[int]:
+        """Newest stored message_id."""
+        return self.segments[-1].last_id if self.segments else None
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self.segments)
+
+    def close(self) -> None:
+        """Close the active segment and remove temporary storage."""
+        if self._active_file:
+            self._active_file.close()
+            self._active_file = None
+        if self._cleanup:
+            self._cleanup()
@@ -0,0 +1,191 @@
+"""
+Read-only spectator tier backed by a shared ring buffer.
+
+Participants get their own outbound queue (``ClientSender``). Spectators,
+who only watch, share one append-only ring of encoded frames per room
+instead. Each spectator is a reader holding its offset into the ring:
+it writes whatever is new and then sleeps until the next append. Sending
+waits for the socket to drain, so a slow spectator simply falls behind.
+There is no queue, dict entry or copy of any frame per spectator.
+
+A spectator that falls more than the ring's capacity behind skips ahead:
+it is sent a fresh room snapshot and continues from the newest frame.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import websockets
+
+
+class FrameRing:
+    """Fixed-size, append-only buffer of encoded frames addressed by sequence number."""
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: Frames kept for readers that are behind
+        """
+        self.capacity = capacity
+        self.head = 0  # sequence number of the next frame
+        self._frames: List[Optional[str]] = [None] * capacity
+        self._appended = asyncio.Event()
+
+    @property
+    def tail(self) -> int:
+        """Oldest sequence number still held."""
+        return max(0, self.head - self.capacity)
+
+    def append(self, frame: str) -> int:
+        """Add a frame and wake waiting readers; returns its sequence number."""
+        seq = self.head
+        self._frames[seq % self.capacity] = frame
+        self.head = seq + 1
+        self._appended.set()
+        self._appended.clear()
+        return seq
+
+    def get(self, seq: int) -> Optional[str]:
+        """Frame at a sequence number, or None if it was overwritten or not written yet."""
+        if self.tail <= seq < self.head:
+            return self._frames[seq % self.capacity]
+        return None
+
+    async def wait(self, offset: int) -> None:
+        """Wait until there is a frame at ``offset``."""
+        while offset >= self.head:
+            await self._appended.wait()
+
+
+class Spectator:
+    """One spectator: its connection and its offset into the ring."""
+
+    __slots__ = ('websocket', 'offset')
+
+    def __init__(self, websocket, offset: int):
+        self.websocket = websocket
+        self.offset = offset
+
+
+class SpectatorRoom:
+    """A room's ring buffer and the spectators reading it."""
+
+    def __init__(self, capacity: int = 1024,
+                 snapshot: Optional[Callable[[], str]] = None):
+        """
+        Args:
+            capacity: Frames buffered for spectators that are behind
+            snapshot: Returns the encoded room snapshot sent to a spectator
+                that fell out of the buffer
+        """
+        self.ring = FrameRing(capacity)
+        self.snapshot = snapshot
+        self.spectators: Set[Spectator] = set()
+
+        # Metrics
+        self.total_spectators = 0
+        self.overruns = 0
+        self.shed_spectators = 0
+
+    def __len__(self) -> int:
+        return len(self.spectators)
+
+    def publish(self, frame: str) -> None:
+        """Append an encoded broadcast frame for every spectator."""
+        self.ring.append(frame)
+
+    async def serve(self, websocket, initial_frames: Iterable[str] = ()) -> None:
+        """
+        Stream the room to a spectator until it disconnects.
+
+        Args:
+            websocket: Spectator connection
+            initial_frames: Encoded frames sent before the live stream (the
+                room snapshot, a history replay)
+        """
+        spectator = Spectator(websocket, self.ring.head)
+        self.spectators.add(spectator)
+        self.total_spectators += 1
+
+        pump = asyncio.create_task(self._pump(spectator, list(initial_frames)))
+        try:
+            # Read-only: anything the spectator sends is discarded
+            async for _ in websocket:
+                pass
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            pump.cancel()
+            await asyncio.gather(pump, return_exceptions=True)
+            self.spectators.discard(spectator)
+
+    async def _pump(self, spectator: Spectator, initial_frames: List[str]) -> None:
+        """Write frames from the spectator's offset up to the ring head."""
+        ring = self.ring
+        websocket = spectator.websocket
+        try:
+            for frame in initial_frames:
+                await websocket.send(frame)
+
+            while True:
+                if spectator.offset >= ring.head:
+                    await ring.wait(spectator.offset)
+                    continue
+
+                if spectator.offset < ring.tail:
+                    # Fell out of the buffer: start over from a fresh snapshot
+                    self.overruns += 1
+                    spectator.offset = ring.head
+                    if self.snapshot:
+                        await websocket.send(self.snapshot())
+                    continue
+
+                frame = ring.get(spectator.offset)
+                spectator.offset += 1
+                await websocket.send(frame)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def shed(self, count: int, frame: Optional[str] = None) -> int:
+        """
+        Disconnect up to ``count`` spectators to relieve load.
+
+        Args:
+            count: Spectators to disconnect, furthest behind first
+            frame: Encoded frame sent to each before closing (a waiting-room
+                notice)
+
+        Returns:
+            Number of spectators disconnected
+        """
+        victims = sorted(self.spectators, key=lambda s: s.offset)[:count]
+        for spectator in victims:
+            self.spectators.discard(spectator)
+        self.shed_spectators += len(victims)
+
+        async def disconnect(websocket):
+            if frame is not None:
+                await websocket.send(frame)
+            await websocket.close(code=1013, reason="Server busy")
+
+        await asyncio.gather(*[disconnect(spectator.websocket) for spectator in victims],
+                             return_exceptions=True)
+        return len(victims)
+
+    async def close(self) -> None:
+        """Disconnect every spectator."""
+        await asyncio.gather(*[spectator.websocket.close() for spectator in list(self.spectators)],
+                             return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Spectator counts, ring position and lag."""
+        head = self.ring.head
+        return {
+            'spectators': len(self.spectators),
+            'total_spectators': self.total_spectators,
+            'ring_head': head,
+            'ring_capacity': self.ring.capacity,
+            'overruns': self.overruns,
+            'shed': self.shed_spectators,
+            'max_lag': max((head - s.offset for s in self.spectators), default=0)
+        }
@@ -0,0 +1,161 @@
+"""
+Versioned state synchronisation for websocket clients.
+
+Slowly changing state (debate stats, bot status) is published per channel.
+The server remembers the last state sent on each channel and broadcasts
+only the changed fields as a JSON-patch style delta::
+
+    {"type": "state_delta", "channel": "stats", "base_version": 4,
+     "version": 5, "ops": [{"op": "replace", "path": "/message_count", "value": 41}]}
+
+Clients apply a delta only if ``base_version`` matches their copy and
+otherwise ask for a ``state_snapshot`` with a ``state_resync`` message.
+Snapshots are also sent on connect.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional
+
+
+def _escape(key: Any) -> str:
+    """Escape a key for use in a JSON pointer (RFC 6901)."""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token: str) -> str:
+    """Reverse ``_escape``."""
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def diff_state(old: Dict[str, Any], new: Dict[str, Any],
+               path: str = '') -> List[Dict[str, Any]]:
+    """
+    Compute the operations that turn ``old`` into ``new``.
+
+    Nested dictionaries are diffed recursively; lists and scalars are
+    replaced whole.
+
+    Args:
+        old: Previous state
+        new: Current state
+        path: JSON pointer prefix for nested calls
+
+    Returns:
+        List of add/replace/remove operations
+    """
+    ops: List[Dict[str, Any]] = []
+
+    for key in old:
+        if key not in new:
+            ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+
+    for key, value in new.items():
+        pointer = f"{path}/{_escape(key)}"
+        if key not in old:
+            ops.append({'op': 'add', 'path': pointer, 'value': value})
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            ops.extend(diff_state(old[key], value, pointer))
+        elif type(value) is not type(old[key]) or value != old[key]:
+            ops.append({'op': 'replace', 'path': pointer, 'value': value})
+
+    return ops
+
+
+def apply_ops(state: Dict[str, Any], ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply delta operations to a state dictionary in place.
+
+    Args:
+        state: State to modify
+        ops: Operations from ``diff_state``
+
+    Returns:
+        The modified state
+    """
+    for op in ops:
+        tokens = [_unescape(token) for token in op['path'].split('/')[1:]]
+        target = state
+        for token in tokens[:-1]:
+            target = target.setdefault(token, {})
+
+        if op['op'] == 'remove':
+            target.pop(tokens[-1], None)
+        else:
+            target[tokens[-1]] = op['value']
+
+    return state
+
+
+class StateChannel:
+    """Last published state and version for one channel."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version = 0
+        self.state: Dict[str, Any] = {}
+
+    def publish(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Record a new state.
+
+        Args:
+            state: Full current state for the channel
+
+        Returns:
+            Delta frame, or None when nothing changed
+        """
+        ops = diff_state(self.state, state)
+        if not ops:
+            return None
+
+        self.state = copy.deepcopy(state)
+        self.version += 1
+        return {
+            'type': 'state_delta',
+            'channel': self.name,
+            'base_version': self.version - 1,
+            'version': self.version,
+            'ops': ops
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full state frame for a joining or resyncing client."""
+        return {
+            'type': 'state_snapshot',
+            'channel': self.name,
+            'version': self.version,
+            'state': self.state
+        }
+
+
+class StateSync:
+    """Collection of versioned state channels."""
+
+    def __init__(self):
+        self.channels: Dict[str, StateChannel] = {}
+
+    def _channel(self, name: str) -> StateChannel:
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = StateChannel(name)
+        return channel
+
+    def publish(self, channel: str, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Publish a channel's full state; returns the delta frame or None."""
+        return self._channel(channel).publish(state)
+
+    def get_state(self, channel: str) -> Dict[str, Any]:
+        """Last published state for a channel (do not modify)."""
+        return self._channel(channel).state
+
+    def snapshot(self, channel: str) -> Optional[Dict[str, Any]]:
+        """Snapshot frame for a channel, or None if it was never published."""
+        state_channel = self.channels.get(channel)
+        if state_channel is None or state_channel.version == 0:
+            return None
+        return state_channel.snapshot()
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Snapshot frames for every published channel."""
+        return [channel.snapshot() for channel in self.channels.values()
+                if channel.version > 0]
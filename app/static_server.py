@@ -0,0 +1,367 @@
+"""
+Asyncio static file server for the web interface.
+
+Assets are read once into memory, gzip-compressed ahead of time and tagged
+with a content hash. Requests are answered from memory:
+- ``If-None-Match`` revalidations get ``304 Not Modified``
+- clients that accept gzip get the precompressed body
+- ``Cache-Control`` lets browsers reuse assets between page loads
+
+HTML is served with ``no-cache`` (always revalidated, so updates show up
+immediately); other assets may be cached for ``max_age`` seconds. Other
+paths, such as the HTTP event stream endpoints, can be routed to handlers
+with ``add_route``.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import time
+from functools import lru_cache
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 512
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json',
+                      'image/svg+xml')
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 410: 'Gone', 503: 'Service Unavailable'}
+
+# Largest request head accepted
+MAX_REQUEST_HEAD = 16 * 1024
+
+# Largest request body skipped to keep a connection alive; nothing here reads
+# bodies, so a bigger one gets its response and the connection is closed
+MAX_DISCARDED_BODY = 64 * 1024
+
+Response = Tuple[int, List[Tuple[str, str]], bytes]
+
+# Route handler: ``handler(method, target, headers, reader, writer)`` returns a
+# response, or None after taking over the connection (e.g. an event stream)
+RouteHandler = Callable[[str, str, Dict[str, str], asyncio.StreamReader, asyncio.StreamWriter],
+                        Awaitable[Optional[Response]]]
+
+
+@lru_cache(maxsize=64)
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip.
+
+    Honours q-values, so ``gzip;q=0`` refuses it; ``*`` covers gzip when
+    gzip is not listed. Headers repeat across clients, hence the cache.
+    """
+    wildcard = False
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if coding not in ('gzip', 'x-gzip', '*'):
+            continue
+
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if coding == '*':
+            wildcard = quality > 0
+        else:
+            return quality > 0
+    return wildcard
+
+
+class StaticAsset:
+    """One file held in memory with its precomputed response headers."""
+
+    __slots__ = ('path', 'body', 'gzip_body', 'etag', 'content_type',
+                 'cache_control', 'last_modified', 'mtime')
+
+    def __init__(self, path: Path, body: bytes, mtime: float, max_age: int):
+        self.path = path
+        self.body = body
+        self.mtime = mtime
+
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+        self.content_type = content_type
+
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.cache_control = ('no-cache' if content_type.startswith('text/html')
+                              else f'public, max-age={max_age}')
+
+        self.gzip_body: Optional[bytes] = None
+        if len(body) >= COMPRESS_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+
+
+class StaticAssets:
+    """In-memory cache of a directory's files."""
+
+    def __init__(self, directory: Union[str, Path], max_age: int = 3600,
+                 auto_reload: bool = False):
+        """
+        Args:
+            directory: Directory to serve
+            max_age: Cache lifetime in seconds for non-HTML assets
+            auto_reload: Re-check file modification times on each request
+                (for development)
+        """
+        self.directory = Path(directory).resolve()
+        self.max_age = max_age
+        self.auto_reload = auto_reload
+        self._assets: Dict[str, StaticAsset] = {}
+
+        # Metrics
+        self.requests = 0
+        self.not_modified = 0
+        self.gzip_responses = 0
+        self.disk_reads = 0
+
+    def _resolve(self, url_path: str) -> Optional[Path]:
+        """Map a normalized URL path to a file inside the directory."""
+        relative = url_path.lstrip('/')
+        path = (self.directory / relative).resolve()
+        if path != self.directory and self.directory not in path.parents:
+            return None
+        return path if path.is_file() else None
+
+    def get(self, url_path: str) -> Optional[StaticAsset]:
+        """
+        Get a cached asset, loading it on first use.
+
+        Args:
+            url_path: Request path (``/`` maps to ``index.html``)
+
+        Returns:
+            Asset, or None if no such file exists
+        """
+        url_path = unquote(url_path.split('?', 1)[0].split('#', 1)[0]) or '/'
+        if url_path.endswith('/'):
+            url_path += 'index.html'
+        asset = self._assets.get(url_path)
+        if asset is not None:
+            if not self.auto_reload:
+                return asset
+            try:
+                if asset.path.stat().st_mtime == asset.mtime:
+                    return asset
+            except OSError:
+                self._assets.pop(url_path, None)
+                return None
+
+        path = self._resolve(url_path)
+        if path is None:
+            return None
+
+        stat = path.stat()
+        asset = StaticAsset(path, path.read_bytes(), stat.st_mtime, self.max_age)
+        self.disk_reads += 1
+        self._assets[url_path] = asset
+        return asset
+
+    def preload(self) -> int:
+        """Load and compress every file up front; returns the number loaded."""
+        count = 0
+        for path in self.directory.rglob('*'):
+            if path.is_file():
+                self.get('/' + path.relative_to(self.directory).as_posix())
+                count += 1
+        return count
+
+    def clear(self) -> None:
+        """Drop cached assets so they are re-read on next request."""
+        self._assets.clear()
+
+    def respond(self, method: str, url_path: str,
+                headers: Dict[str, str]) -> Response:
+        """
+        Build a response for a request.
+
+        Args:
+            method: HTTP method
+            url_path: Request path
+            headers: Request headers with lower-case names
+
+        Returns:
+            ``(status, headers, body)``
+        """
+        self.requests += 1
+
+        if method not in ('GET', 'HEAD'):
+            return 405, [('Allow', 'GET, HEAD'), ('Content-Length', '0')], b''
+
+        asset = self.get(url_path)
+        if asset is None:
+            body = b'Not Found'
+            return 404, [('Content-Type', 'text/plain; charset=utf-8'),
+                         ('Content-Length', str(len(body)))], body if method == 'GET' else b''
+
+        response_headers = [
+            ('ETag', asset.etag),
+            ('Last-Modified', asset.last_modified),
+            ('Cache-Control', asset.cache_control),
+            ('Vary', 'Accept-Encoding'),
+        ]
+
+        if_none_match = headers.get('if-none-match')
+        if if_none_match and (if_none_match.strip() == '*'
+                              or asset.etag in [tag.strip().removeprefix('W/')
+                                                for tag in if_none_match.split(',')]):
+            self.not_modified += 1
+            return 304, response_headers, b''
+
+        body = asset.body
+        if asset.gzip_body is not None and accepts_gzip(headers.get('accept-encoding', '')):
+            body = asset.gzip_body
+            response_headers.append(('Content-Encoding', 'gzip'))
+            self.gzip_responses += 1
+
+        response_headers += [('Content-Type', asset.content_type),
+                             ('Content-Length', str(len(body)))]
+        return 200, response_headers, body if method == 'GET' else b''
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counters."""
+        return {
+            'assets': len(self._assets),
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            'gzip_responses': self.gzip_responses,
+            'disk_reads': self.disk_reads
+        }
+
+
+class StaticFileServer:
+    """Minimal HTTP/1.1 server for ``StaticAssets`` on the asyncio loop."""
+
+    def __init__(self, directory: Union[str, Path], host: str = "", port: int = 8080,
+                 max_age: int = 3600, keep_alive_timeout: float = 15.0):
+        """
+        Args:
+            directory: Directory to serve
+            host: Interface to listen on ("" for all)
+            port: Port to listen on
+            max_age: Cache lifetime in seconds for non-HTML assets
+            keep_alive_timeout: Seconds an idle keep-alive connection stays open
+        """
+        self.assets = StaticAssets(directory, max_age=max_age)
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.routes: Dict[str, RouteHandler] = {}
+
+    def add_route(self, path: str, handler: RouteHandler) -> None:
+        """
+        Serve a path with a handler instead of a file.
+
+        Args:
+            path: Exact request path (without query string)
+            handler: Coroutine answering the request
+        """
+        self.routes[path] = handler
+
+    async def start(self) -> asyncio.AbstractServer:
+        """Preload the assets and start listening."""
+        self.assets.preload()
+        self.server = await asyncio.start_server(self._handle_connection,
+                                                 self.host or None, self.port)
+        print(f"🌐 Web interface running at: http://localhost:{self.port}")
+        return self.server
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'),
+                                                  self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write(writer, 400, [], b'', keep_alive=False)
+                    break
+
+                if len(head) > MAX_REQUEST_HEAD:
+                    await self._write(writer, 400, [], b'', keep_alive=False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._write(writer, 400, [], b'', keep_alive=False)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+
+                # Skip a request body so the next request starts at its head
+                length = headers.get('content-length', '0')
+                if not length.isdigit():
+                    await self._write(writer, 400, [], b'', keep_alive=False)
+                    break
+                if 'transfer-encoding' in headers or int(length) > MAX_DISCARDED_BODY:
+                    keep_alive = False
+                elif int(length):
+                    try:
+                        await asyncio.wait_for(reader.readexactly(int(length)),
+                                               self.keep_alive_timeout)
+                    except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                        break
+
+                handler = self.routes.get(target.split('?', 1)[0])
+                if handler is not None:
+                    response = await handler(method, target, headers, reader, writer)
+                    if response is None:
+                        break
+                    status, response_headers, body = response
+                else:
+                    status, response_headers, body = self.assets.respond(method, target, headers)
+                await self._write(writer, status, response_headers, body, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int,
+                     headers: List[Tuple[str, str]], body: bytes, keep_alive: bool) -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 f"Date: {formatdate(time.time(), usegmt=True)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if not any(name == 'Content-Length' for name, _ in headers):
+            headers = headers + [('Content-Length', str(len(body)))]
+        lines += [f"{name}: {value}" for name, value in headers]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
@@ -0,0 +1,346 @@
+"""
+Durable storage backends for chat messages and votes.
+
+``ChatLog`` and ``VotingSystem`` keep working from in-process structures;
+a storage backend receives a copy of every message and vote so debates
+survive restarts and can be queried without loading transcript files.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.chat_log import Message
+    from app.voting import Vote
+
+
+class StorageBackend(ABC):
+    """
+    Interface for message and vote persistence.
+
+    Writes are fire-and-forget so they can be called from the event loop;
+    reads return whatever has been persisted (call ``flush()`` first to
+    include pending writes).
+    """
+
+    @abstractmethod
+    def save_message(self, debate_id: str, message: 'Message') -> None:
+        """Persist a chat message."""
+
+    @abstractmethod
+    def save_vote(self, session_id: str, vote: 'Vote') -> None:
+        """Persist a vote; a later vote from the same voter replaces it."""
+
+    @abstractmethod
+    def get_messages(self, debate_id: str, after_message_id: int = 0,
+                     limit: Optional[int] = None,
+                     sender: Optional[str] = None) -> List['Message']:
+        """Read stored messages for a debate in message_id order."""
+
+    @abstractmethod
+    def get_votes(self, session_id: str) -> List['Vote']:
+        """Read stored votes for a voting session."""
+
+    @abstractmethod
+    def get_debates(self) -> List[Dict[str, Any]]:
+        """List stored debates with message counts and time span."""
+
+    def flush(self) -> None:
+        """Block until pending writes are persisted."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite storage using WAL mode and a dedicated writer thread.
+
+    Writes are queued and applied by the writer thread in batches: runs of
+    the same statement go through one ``executemany`` and each batch is a
+    single transaction. Statements are module constants, so sqlite3's
+    statement cache prepares each one once per connection. Reads use a
+    separate connection, which WAL lets run alongside the writer.
+
+    A batch that fails (e.g. the database is locked by another process) is
+    retried with backoff; if it still fails its writes are counted in
+    ``get_stats()`` instead of disappearing silently.
+    """
+
+    WRITE_RETRIES = 3
+    RETRY_DELAY = 0.05  # seconds, doubled on each retry
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS messages (
+            debate_id TEXT NOT NULL,
+            message_id INTEGER NOT NULL,
+            sender TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            message_type TEXT NOT NULL,
+            metadata TEXT,
+            PRIMARY KEY (debate_id, message_id)
+        );
+        DROP INDEX IF EXISTS idx_messages_sender;
+        DROP INDEX IF EXISTS idx_messages_timestamp;
+        CREATE INDEX IF NOT EXISTS idx_messages_debate_sender ON messages (debate_id, sender);
+        CREATE INDEX IF NOT EXISTS idx_messages_debate_timestamp ON messages (debate_id, timestamp);
+        CREATE TABLE IF NOT EXISTS votes (
+            session_id TEXT NOT NULL,
+            voter_id TEXT NOT NULL,
+            candidate TEXT NOT NULL,
+            justification TEXT,
+            timestamp REAL NOT NULL,
+            anonymous INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (session_id, voter_id)
+        );
+    """
+
+    INSERT_MESSAGE = (
+        "INSERT OR REPLACE INTO messages "
+        "(debate_id, message_id, sender, content, timestamp, message_type, metadata) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+    INSERT_VOTE = (
+        "INSERT OR REPLACE INTO votes "
+        "(session_id, voter_id, candidate, justification, timestamp, anonymous) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, path: str, batch_size: int = 500):
+        """
+        Args:
+            path: Database file path
+            batch_size: Maximum writes applied per transaction
+        """
+        self.path = str(path)
+        self.batch_size = batch_size
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Schema and WAL mode are set up before the writer starts
+        setup = self._connect()
+        setup.executescript(self.SCHEMA)
+        setup.close()
+
+        self._reader = self._connect()
+        self._reader_lock = threading.Lock()
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+
+        # Metrics, updated by the writer thread
+        self.writes = 0
+        self.retries = 0
+        self.failed_writes = 0
+        self.last_error: Optional[str] = None
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name="sqlite-storage-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for WAL."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def save_message(self, debate_id: str, message: 'Message') -> None:
+        """Queue a chat message for the writer thread."""
+        metadata = json.dumps(dict(message.metadata)) if message.has_metadata else None
+        self._queue.put((self.INSERT_MESSAGE, (
+            debate_id, message.message_id, message.sender, message.content,
+            message.timestamp, message.message_type, metadata
+        )))
+
+    def save_vote(self, session_id: str, vote: 'Vote') -> None:
+        """Queue a vote for the writer thread."""
+        self._queue.put((self.INSERT_VOTE, (
+            session_id, vote.voter_id, vote.candidate, vote.justification,
+            vote.timestamp, int(vote.anonymous)
+        )))
+
+    def _write_loop(self) -> None:
+        """Drain the queue in batches until closed."""
+        connection = self._connect()
+        running = True
+
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = []
+            waiters = []
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    writes.append(item)
+
+            if writes:
+                self._commit(connection, writes)
+
+            for waiter in waiters:
+                waiter.set()
+
+        connection.close()
+
+    def _commit(self, connection: sqlite3.Connection, writes: List[tuple]) -> None:
+        """Apply a batch in one transaction, retrying with backoff on errors."""
+        for attempt in range(self.WRITE_RETRIES + 1):
+            try:
+                with connection:
+                    self._apply(connection, writes)
+                self.writes += len(writes)
+                return
+            except sqlite3.Error as e:
+                self.last_error = str(e)
+                if attempt < self.WRITE_RETRIES:
+                    self.retries += 1
+                    time.sleep(self.RETRY_DELAY * 2 ** attempt)
+
+        self.failed_writes += len(writes)
+        print(f"⚠️ Storage write failed, {len(writes)} writes lost: {self.last_error}")
+
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, writes: List[tuple]) -> None:
+        """Apply writes, grouping consecutive runs of the same statement."""
+        statement = writes[0][0]
+        rows = []
+        for sql, params in writes:
+            if sql is not statement:
+                connection.executemany(statement, rows)
+                statement, rows = sql, []
+            rows.append(params)
+        connection.executemany(statement, rows)
+
+    def get_messages(self, debate_id: str, after_message_id: int = 0,
+                     limit: Optional[int] = None,
+                     sender: Optional[str] = None) -> List['Message']:
+        """
+        Read stored messages for a debate.
+
+        Args:
+            debate_id: Debate to read
+            after_message_id: Only messages with a greater message_id
+            limit: Maximum number of messages (oldest first)
+            sender: Filter by sender name
+
+        Returns:
+            Messages in message_id order
+        """
+        from app.chat_log import Message
+
+        sql = ("SELECT sender, content, timestamp, message_id, message_type, metadata "
+               "FROM messages WHERE debate_id = ? AND message_id > ?")
+        params: List[Any] = [debate_id, after_message_id]
+        if sender:
+            sql += " AND sender = ?"
+            params.append(sender)
+        sql += " ORDER BY message_id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._reader_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+
+        return [
+            Message(sender, content, timestamp, message_id, message_type,
+                    json.loads(metadata) if metadata else None)
+            for sender, content, timestamp, message_id, message_type, metadata in rows
+        ]
+
+    def get_votes(self, session_id: str) -> List['Vote']:
+        """Read stored votes for a voting session, oldest first."""
+        from app.voting import Vote
+
+        with self._reader_lock:
+            rows = self._reader.execute(
+                "SELECT voter_id, candidate, justification, timestamp, anonymous "
+                "FROM votes WHERE session_id = ? ORDER BY timestamp",
+                (session_id,)
+            ).fetchall()
+
+        return [
+            Vote(voter_id=voter_id, candidate=candidate, justification=justification,
+                 timestamp=timestamp, anonymous=bool(anonymous))
+            for voter_id, candidate, justification, timestamp, anonymous in rows
+        ]
+
+    def get_debates(self) -> List[Dict[str, Any]]:
+        """List stored debates, most recent first."""
+        with self._reader_lock:
+            rows = self._reader.execute(
+                "SELECT debate_id, COUNT(*), MIN(timestamp), MAX(timestamp) "
+                "FROM messages GROUP BY debate_id ORDER BY MAX(timestamp) DESC"
+            ).fetchall()
+
+        return [
+            {'debate_id': debate_id, 'message_count': count,
+             'start_time': start_time, 'end_time': end_time}
+            for debate_id, count, start_time, end_time in rows
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Write counters; ``failed_writes`` counts writes dropped after retries."""
+        return {
+            'writes': self.writes,
+            'retries': self.retries,
+            'failed_writes': self.failed_writes,
+            'pending': self._queue.qsize(),
+            'last_error': self.last_error
+        }
+
+    def flush(self) -> None:
+        """Block until every queued write is committed."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Commit pending writes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
+
+
+def create_storage(config: Dict[str, Any]) -> Optional[StorageBackend]:
+    """
+    Create a storage backend from the ``storage`` config section.
+
+    Args:
+        config: Storage configuration (``backend``, ``path``, ``batch_size``)
+
+    Returns:
+        Backend instance, or None for in-memory only
+    """
+    backend = config.get('backend', 'memory')
+
+    if backend == 'memory':
+        return None
+
+    if backend == 'sqlite':
+        return SQLiteStorage(config.get('path', 'debates.db'),
+                             batch_size=config.get('batch_size', 500))
+
+    raise ValueError(f"Unsupported storage backend: {backend}")
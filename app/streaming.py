@@ -3,27 +3,37 @@ Live streaming and WebSocket server for real-time debate broadcasting.
 """
 
 import asyncio
+import itertools
 import json
 import time
 import logging
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, FrozenSet, List, Set, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
+from urllib.parse import urlparse, parse_qs
 import websockets
 from websockets.server import WebSocketServerProtocol
 
 from .chat_log import ChatLog, Message
+from .frames import FrameCache, encode_frame
+from .gateway import ChannelIndex, RealtimeGateway
 from .voting import VotingSystem
 from .utils import format_time_remaining
 
 
-@dataclass
+# Chat message types a subscription can filter on
+MESSAGE_TYPES = ('chat', 'system', 'moderator', 'vote')
+
+
+@dataclass(eq=False)
 class StreamingClient:
-    """Information about a connected streaming client."""
+    """Information about a connected streaming client (hashed by identity)."""
     websocket: WebSocketServerProtocol
     client_id: str
     connected_at: float
     client_type: str = "viewer"  # viewer, participant, moderator
     metadata: Dict[str, Any] = None
+    last_message_id: int = 0  # Cursor of the last chat message delivered
+    message_types: Optional[FrozenSet[str]] = None  # Chat message filter; None for all
 
     def __post_init__(self):
         if self.metadata is None:
@@ -35,6 +45,9 @@ class StreamingServer:
     WebSocket server for live streaming debate sessions.
     """
 
+    # Messages replayed to a new client that has no resume cursor
+    HISTORY_SIZE = 10
+
     def __init__(self, chat_log: ChatLog, voting_system: VotingSystem,
                  config: Dict[str, Any]):
         self.chat_log = chat_log
@@ -42,31 +55,60 @@ class StreamingServer:
         self.config = config
 
         self.host = config.get('host', 'localhost')
-        self.port = config.get('websocket_port', 8080)
+        self.port = config.get('websocket_port', 8082)
         self.max_connections = config.get('max_connections', 100)
         self.broadcast_votes = config.get('broadcast_votes', True)
+        # Votes within one interval are coalesced into a single vote_update
+        self.vote_update_interval = config.get('vote_update_interval', 0.5)
 
         # Server state
         self.server = None
         self.clients: Dict[str, StreamingClient] = {}
         self.is_running = False
 
+        # Subscribers per broadcast channel
+        self.channels = ChannelIndex()
+
+        # Client numbering, so concurrent connects never share an id
+        self._client_ids = itertools.count(1)
+
+        # Set when serving as a room on a shared gateway
+        self.gateway: Optional[RealtimeGateway] = None
+        self.room_id: Optional[str] = None
+
         # Message subscription
         self.message_queue = None
         self.broadcast_task = None
 
+        # Encoded frames shared by every client
+        self.frames = FrameCache()
+
+        # Pending coalesced vote_update broadcast
+        self._vote_update: Optional[asyncio.TimerHandle] = None
+        self._last_vote_update = 0.0
+
         # Statistics
         self.stats = {
             'total_connections': 0,
+            'rejected_connections': 0,
             'messages_sent': 0,
             'votes_broadcast': 0,
+            'votes_received': 0,
             'start_time': time.time()
         }
 
         self.logger = logging.getLogger(__name__)
 
-    async def start(self) -> None:
-        """Start the streaming server."""
+    async def start(self, gateway: Optional[RealtimeGateway] = None,
+                    room_id: str = "stream") -> None:
+        """
+        Start the streaming server.
+
+        Args:
+            gateway: Shared gateway to join as a room instead of listening
+                on a port of its own
+            room_id: Room name on the gateway
+        """
         if self.is_running:
             return
 
@@ -74,15 +116,20 @@ class StreamingServer:
             # Subscribe to chat log messages
             self.message_queue = self.chat_log.subscribe()
 
-            # Start WebSocket server
-            self.server = await websockets.serve(
-                self._handle_client,
-                self.host,
-                self.port,
-                max_size=1024 * 1024,  # 1MB max message size
-                ping_interval=20,
-                ping_timeout=10
-            )
+            if gateway is not None:
+                gateway.add_room(room_id, self._handle_client)
+                self.gateway = gateway
+                self.room_id = room_id
+            else:
+                # Start WebSocket server
+                self.server = await websockets.serve(
+                    self._handle_client,
+                    self.host,
+                    self.port,
+                    max_size=1024 * 1024,  # 1MB max message size
+                    ping_interval=20,
+                    ping_timeout=10
+                )
 
             # Start broadcast task
             self.broadcast_task = asyncio.create_task(self._broadcast_loop())
@@ -101,6 +148,10 @@ class StreamingServer:
 
         self.is_running = False
 
+        if self._vote_update is not None:
+            self._vote_update.cancel()
+            self._vote_update = None
+
         # Stop broadcast task
         if self.broadcast_task:
             self.broadcast_task.cancel()
@@ -120,6 +171,8 @@ class StreamingServer:
         if self.server:
             self.server.close()
             await self.server.wait_closed()
+        elif self.gateway:
+            self.gateway.remove_room(self.room_id)
 
         # Unsubscribe from chat log
         if self.message_queue:
@@ -127,20 +180,20 @@ class StreamingServer:
 
         self.logger.info("Streaming server stopped")
 
-    async def _handle_client(self, websocket: WebSocketServerProtocol, path: str):
+    async def _handle_client(self, websocket: WebSocketServerProtocol, path: str = ""):
         """Handle new client connection."""
         if len(self.clients) >= self.max_connections:
+            self.stats['rejected_connections'] += 1
             await websocket.close(code=1013, reason="Server full")
             return
 
-        client_id = f"client_{int(time.time() * 1000)}"
+        client_id = f"client_{next(self._client_ids)}"
         client = StreamingClient(
             websocket=websocket,
             client_id=client_id,
             connected_at=time.time()
         )
 
-        self.clients[client_id] = client
         self.stats['total_connections'] += 1
 
         self.logger.info(f"Client {client_id} connected from {websocket.remote_address}")
@@ -152,17 +205,15 @@ class StreamingServer:
                 'client_id': client_id,
                 'server_info': {
                     'version': '1.0.0',
-                    'features': ['chat', 'voting', 'real_time']
+                    'features': ['chat', 'voting', 'real_time', 'resume']
                 }
             })
 
-            # Send recent messages
-            recent_messages = self.chat_log.get_recent_messages(10)
-            for msg in recent_messages:
-                await self._send_to_client(client, {
-                    'type': 'message',
-                    'data': msg.to_dict()
-                })
+            # Replay history and register in one step; the client cursor
+            # keeps the broadcast loop from re-sending replayed messages
+            history = self._build_history(client, self._get_resume_cursor(websocket, path))
+            self._register_client(client)
+            await self._send_frame(client, history)
 
             # Handle client messages
             async for message in websocket:
@@ -182,6 +233,12 @@ class StreamingServer:
             # Clean up client
             if client_id in self.clients:
                 del self.clients[client_id]
+            self.channels.remove(client)
+
+    def _register_client(self, client: StreamingClient) -> None:
+        """Add a client to the broadcast set (every channel until it subscribes)."""
+        self.clients[client.client_id] = client
+        self.channels.add(client)
 
     async def _process_client_message(self, client: StreamingClient, data: Dict[str, Any]):
         """Process message from client."""
@@ -190,13 +247,21 @@ class StreamingServer:
         if message_type == 'ping':
             await self._send_to_client(client, {'type': 'pong'})
 
+        elif message_type == 'resume':
+            after = data.get('after_message_id')
+            if not isinstance(after, int):
+                await self._send_error(client, "resume requires an integer after_message_id")
+            else:
+                await self._send_frame(client, self._build_history(client, after))
+
         elif message_type == 'subscribe':
             # Update client subscription preferences
-            client.metadata['subscriptions'] = data.get('channels', [])
-            await self._send_to_client(client, {
-                'type': 'subscribed',
-                'channels': client.metadata.get('subscriptions', [])
-            })
+            channels, client.message_types = self._parse_subscription(data)
+            client.metadata['subscriptions'] = self.channels.subscribe(client, channels)
+            reply = {'type': 'subscribed', 'channels': client.metadata['subscriptions']}
+            if client.message_types is not None:
+                reply['message_types'] = sorted(client.message_types)
+            await self._send_to_client(client, reply)
 
         elif message_type == 'get_stats':
             # Send server statistics
@@ -222,8 +287,10 @@ class StreamingServer:
                     'candidate': candidate
                 })
 
-                if success and self.broadcast_votes:
-                    await self._broadcast_vote_update()
+                if success:
+                    self.stats['votes_received'] += 1
+                    if self.broadcast_votes:
+                        self._schedule_vote_update()
 
             except Exception as e:
                 await self._send_error(client, f"Vote failed: {e}")
@@ -231,6 +298,66 @@ class StreamingServer:
         else:
             await self._send_error(client, f"Unknown message type: {message_type}")
 
+    def _parse_subscription(self, data: Dict[str, Any]) -> Tuple[Optional[List[str]],
+                                                                 Optional[FrozenSet[str]]]:
+        """
+        Split a subscribe request into channels and a chat message type filter.
+
+        Clients from before channels existed sent message types in
+        ``channels``; a list naming a message type that is not also a
+        channel is read as that filter, with every channel kept.
+
+        Returns:
+            ``(channels, message_types)``; None message_types means all
+        """
+        channels = data.get('channels')
+        message_types = data.get('message_types')
+        if message_types is None and channels and any(
+                name in MESSAGE_TYPES and name not in self.channels.channels for name in channels):
+            channels, message_types = None, channels
+        return channels, frozenset(message_types) if message_types else None
+
+    def _get_resume_cursor(self, websocket: WebSocketServerProtocol,
+                           path: str = "") -> Optional[int]:
+        """Read the ``after`` message_id cursor from the connection URL."""
+        request = getattr(websocket, 'request', None)
+        path = path or getattr(request, 'path', None) or getattr(websocket, 'path', '') or ''
+        after = parse_qs(urlparse(path).query).get('after')
+        if after and after[0].isdigit():
+            return int(after[0])
+        return None
+
+    def _build_history(self, client: StreamingClient,
+                       after_message_id: Optional[int] = None) -> str:
+        """
+        Build a single batch of missed messages for a client.
+
+        Also advances the client's cursor so the broadcast loop does not
+        re-send anything included in the batch.
+
+        Args:
+            client: Client to catch up
+            after_message_id: Replay everything after this cursor; without a
+                cursor, or with one ahead of the chat log, the last
+                HISTORY_SIZE messages are sent
+
+        Returns:
+            Encoded history frame
+        """
+        if after_message_id is not None and after_message_id > self.chat_log.message_counter:
+            # Cursor from an earlier log (restart, clear() or a loaded
+            # transcript); start over as a new client would
+            after_message_id = None
+
+        if after_message_id is None:
+            messages = self.chat_log.get_recent_messages(self.HISTORY_SIZE)
+        else:
+            messages = self.chat_log.get_messages_after(after_message_id)
+
+        client.last_message_id = self.chat_log.message_counter
+
+        return self.frames.history_frame(messages, client.last_message_id)
+
     async def _broadcast_loop(self):
         """Main broadcast loop for new messages."""
         try:
@@ -260,48 +387,56 @@ class StreamingServer:
         if not self.clients:
             return
 
-        broadcast_data = {
-            'type': 'message',
-            'data': message.to_dict()
-        }
+        # Encoded once, the same frame goes to every client
+        frame = self.frames.message_frame(message)
 
-        # Send to all clients
+        # Send to the chat channel's subscribers
         tasks = []
-        for client in list(self.clients.values()):
+        for client in self.channels.recipients('chat'):
             if self._should_send_to_client(client, message):
-                tasks.append(self._send_to_client(client, broadcast_data))
+                client.last_message_id = message.message_id
+                tasks.append(self._send_frame(client, frame))
 
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
             self.stats['messages_sent'] += len(tasks)
 
     def _should_send_to_client(self, client: StreamingClient, message: Message) -> bool:
-        """Determine if message should be sent to client."""
-        # Check client subscriptions
-        subscriptions = client.metadata.get('subscriptions', [])
-
-        if subscriptions:
-            # If client has specific subscriptions, check them
-            if message.message_type not in subscriptions:
-                return False
+        """Determine if message should be sent to client (channels are indexed)."""
+        # Already delivered as part of a history replay
+        if message.message_id <= client.last_message_id:
+            return False
+        return client.message_types is None or message.message_type in client.message_types
+
+    def _schedule_vote_update(self) -> None:
+        """Broadcast the live tally once the update interval allows."""
+        if self._vote_update is not None:
+            return
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, self._last_vote_update + self.vote_update_interval - time.monotonic())
+        self._vote_update = loop.call_later(delay, self._flush_vote_update)
 
-        return True
+    def _flush_vote_update(self) -> None:
+        self._vote_update = None
+        self._last_vote_update = time.monotonic()
+        asyncio.ensure_future(self._broadcast_vote_update())
 
     async def _broadcast_vote_update(self):
         """Broadcast voting update to clients."""
-        if not self.voting_system.is_active:
+        # A coalesced update can fire after voting ends; it still carries the
+        # votes cast in the last interval, so send the final counts
+        vote_summary = self.voting_system.get_vote_summary(include_ended=True)
+        if not vote_summary:
             return
 
-        vote_summary = self.voting_system.get_vote_summary()
-
-        broadcast_data = {
+        frame = encode_frame({
             'type': 'vote_update',
             'data': vote_summary
-        }
+        })
 
         tasks = []
-        for client in list(self.clients.values()):
-            tasks.append(self._send_to_client(client, broadcast_data))
+        for client in self.channels.recipients('votes'):
+            tasks.append(self._send_frame(client, frame))
 
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
@@ -309,8 +444,12 @@ class StreamingServer:
 
     async def _send_to_client(self, client: StreamingClient, data: Dict[str, Any]):
         """Send data to specific client."""
+        await self._send_frame(client, encode_frame(data))
+
+    async def _send_frame(self, client: StreamingClient, frame: str):
+        """Send an already encoded frame to a specific client."""
         try:
-            await client.websocket.send(json.dumps(data))
+            await client.websocket.send(frame)
         except websockets.exceptions.ConnectionClosed:
             # Client disconnected, will be cleaned up
             pass
@@ -330,9 +469,12 @@ class StreamingServer:
 
         return {
             'connected_clients': len(self.clients),
+            'max_connections': self.max_connections,
             'total_connections': self.stats['total_connections'],
+            'rejected_connections': self.stats['rejected_connections'],
             'messages_sent': self.stats['messages_sent'],
             'votes_broadcast': self.stats['votes_broadcast'],
+            'votes_received': self.stats['votes_received'],
             'uptime_seconds': uptime,
             'uptime_formatted': format_time_remaining(uptime),
             'is_voting_active': self.voting_system.is_active if self.voting_system else False
@@ -340,15 +482,15 @@ class StreamingServer:
 
     async def broadcast_custom_message(self, message_type: str, data: Any):
         """Broadcast custom message to all clients."""
-        broadcast_data = {
+        frame = encode_frame({
             'type': message_type,
             'data': data,
             'timestamp': time.time()
-        }
+        })
 
         tasks = []
         for client in list(self.clients.values()):
-            tasks.append(self._send_to_client(client, broadcast_data))
+            tasks.append(self._send_frame(client, frame))
 
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
@@ -356,17 +498,17 @@ class StreamingServer:
     async def send_to_specific_clients(self, client_ids: List[str],
                                        message_type: str, data: Any):
         """Send message to specific clients."""
-        message = {
+        frame = encode_frame({
             'type': message_type,
             'data': data,
             'timestamp': time.time()
-        }
+        })
 
         tasks = []
         for client_id in client_ids:
             if client_id in self.clients:
                 client = self.clients[client_id]
-                tasks.append(self._send_to_client(client, message))
+                tasks.append(self._send_frame(client, frame))
 
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
@@ -397,12 +539,64 @@ class StreamingServer:
 class StreamingManager:
     """
     High-level manager for streaming functionality.
+
+    Every session is a room on one shared ``RealtimeGateway``, so any number
+    of debates are served from a single port with one heartbeat. Clients
+    pick a session with ``/rooms/<session_id>``, ``/<session_id>`` or
+    ``?room=<session_id>``; each session keeps its own connection cap and
+    metrics.
     """
 
-    def __init__(self):
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 ping_interval: float = 20, ping_timeout: float = 10,
+                 gateway: Optional[RealtimeGateway] = None):
+        """
+        Args:
+            host: Interface to listen on (default: the first session's ``host``)
+            port: Port shared by every session (default: the first
+                session's ``websocket_port``)
+            ping_interval: Seconds between heartbeat pings for all sessions
+            ping_timeout: Seconds to wait for a pong before dropping a client
+            gateway: Existing gateway to add sessions to instead of starting one
+        """
+        self.host = host
+        self.port = port
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.gateway = gateway
+        self._owns_gateway = gateway is None
+
         self.servers: Dict[str, StreamingServer] = {}
         self.is_initialized = False
 
+    async def start(self, config: Optional[Dict[str, Any]] = None) -> RealtimeGateway:
+        """
+        Start the shared listener if it is not running yet.
+
+        Args:
+            config: Streaming configuration supplying ``host`` and
+                ``websocket_port`` when they were not given to the constructor
+        """
+        if self.is_initialized:
+            return self.gateway
+
+        config = config or {}
+        if self.gateway is None:
+            self.host = self.host or config.get('host', 'localhost')
+            if self.port is None:
+                self.port = config.get('websocket_port', 8082)
+            self.gateway = RealtimeGateway(self.host, self.port,
+                                           ping_interval=self.ping_interval,
+                                           ping_timeout=self.ping_timeout)
+            server = await self.gateway.start()
+            if self.port == 0 and server is not None:
+                self.port = self.gateway.port = server.sockets[0].getsockname()[1]
+        else:
+            self.host, self.port = self.gateway.host, self.gateway.port
+
+        self.is_initialized = True
+        return self.gateway
+
     async def create_streaming_session(self, session_id: str, chat_log: ChatLog,
                                        voting_system: VotingSystem,
                                        config: Dict[str, Any]) -> StreamingServer:
@@ -410,10 +604,10 @@ class StreamingManager:
         Create a new streaming session.
 
         Args:
-            session_id: Unique session identifier
+            session_id: Unique session identifier, also its room name
             chat_log: Chat log to stream
             voting_system: Voting system to integrate
-            config: Streaming configuration
+            config: Streaming configuration (``max_connections`` caps this session)
 
         Returns:
             StreamingServer instance
@@ -421,17 +615,16 @@ class StreamingManager:
         if session_id in self.servers:
             raise ValueError(f"Streaming session {session_id} already exists")
 
-        # Create unique port for this session
-        base_port = config.get('websocket_port', 8080)
-        port = base_port + len(self.servers)
+        gateway = await self.start(config)
 
         session_config = config.copy()
-        session_config['websocket_port'] = port
+        session_config['host'] = self.host
+        session_config['websocket_port'] = self.port
 
         server = StreamingServer(chat_log, voting_system, session_config)
         self.servers[session_id] = server
 
-        await server.start()
+        await server.start(gateway=gateway, room_id=session_id)
         return server
 
     async def stop_streaming_session(self, session_id: str):
@@ -442,7 +635,7 @@ class StreamingManager:
             del self.servers[session_id]
 
     async def stop_all_sessions(self):
-        """Stop all streaming sessions."""
+        """Stop all streaming sessions and the shared listener."""
         tasks = []
         for session_id in list(self.servers.keys()):
             tasks.append(self.stop_streaming_session(session_id))
@@ -450,6 +643,11 @@ class StreamingManager:
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
 
+        if self.gateway and self._owns_gateway:
+            await self.gateway.stop()
+            self.gateway = None
+        self.is_initialized = False
+
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a streaming session."""
         if session_id not in self.servers:
@@ -462,12 +660,25 @@ class StreamingManager:
             'client_count': server.client_count,
             'host': server.host,
             'port': server.port,
+            'path': f"/rooms/{session_id}",
             'stats': server._get_server_stats()
         }
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-session metrics and totals for the shared listener."""
+        sessions = {session_id: server._get_server_stats()
+                    for session_id, server in self.servers.items()}
+        return {
+            'port': self.port,
+            'sessions': sessions,
+            'connected_clients': sum(s['connected_clients'] for s in sessions.values()),
+            'rejected_connections': sum(s['rejected_connections'] for s in sessions.values()),
+            'gateway': self.gateway.get_stats() if self.gateway else None
+        }
+
     def list_active_sessions(self) -> List[str]:
         """Get list of active session IDs."""
         return [
             session_id for session_id, server in self.servers.items()
             if server.is_active
-        ]
\ No newline at end of file
+        ]
@@ -0,0 +1,141 @@
+"""
+Tick-based coalescing of non-chat telemetry frames.
+
+Bot activity logs, bot status changes and debate statistics are collected
+for one tick and sent as a single ``telemetry`` frame. Within a tick the
+latest status per bot and the latest stats win, and activity is counted per
+bot and log type. Chat messages do not go through the aggregator.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class TelemetryAggregator:
+    """Collect telemetry updates and emit one batched frame per tick."""
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], Awaitable[None]],
+                 tick: float = 0.1, max_activity: int = 50):
+        """
+        Args:
+            emit: Coroutine function that broadcasts a batched frame
+            tick: Seconds updates are collected before a frame is emitted
+            max_activity: Activity log lines kept per frame (newest win)
+        """
+        self.emit = emit
+        self.tick = tick
+        self.max_activity = max_activity
+
+        self._activity: List[Dict[str, Any]] = []
+        self._activity_counts: Dict[str, Dict[str, int]] = {}
+        self._bot_status: Dict[str, Dict[str, Any]] = {}
+        self._stats: Optional[Dict[str, Any]] = None
+        self._dropped_activity = 0
+
+        self._pending = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.updates_received = 0
+        self.frames_emitted = 0
+
+    def add_activity(self, bot_name: str, log_type: str, message: str,
+                     timestamp: Optional[float] = None) -> None:
+        """Record a bot activity log line."""
+        self._activity.append({
+            'bot_name': bot_name,
+            'log_type': log_type,
+            'message': message,
+            'timestamp': timestamp or time.time()
+        })
+        if len(self._activity) > self.max_activity:
+            self._activity.pop(0)
+            self._dropped_activity += 1
+
+        counts = self._activity_counts.setdefault(bot_name, {})
+        counts[log_type] = counts.get(log_type, 0) + 1
+        self._mark_pending()
+
+    def update_bot_status(self, bot_name: str, status: Dict[str, Any]) -> None:
+        """Record a bot status; the latest one in a tick wins."""
+        self._bot_status.setdefault(bot_name, {}).update(status)
+        self._mark_pending()
+
+    def update_stats(self, stats: Dict[str, Any]) -> None:
+        """Record debate statistics; the latest values in a tick win."""
+        if self._stats is None:
+            self._stats = {}
+        self._stats.update(stats)
+        self._mark_pending()
+
+    def _mark_pending(self) -> None:
+        """Note an update and make sure the tick loop is running."""
+        self.updates_received += 1
+        self._pending.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Emit at most one frame per tick while updates keep arriving."""
+        while True:
+            await self._pending.wait()
+            await asyncio.sleep(self.tick)
+            await self.flush()
+
+    def _take_frame(self) -> Optional[Dict[str, Any]]:
+        """Build the batched frame and reset the pending state."""
+        if not self._pending.is_set():
+            return None
+        self._pending.clear()
+
+        frame: Dict[str, Any] = {
+            'type': 'telemetry',
+            'timestamp': time.time()
+        }
+        if self._activity:
+            frame['activity'] = self._activity
+            frame['activity_counts'] = self._activity_counts
+        if self._dropped_activity:
+            frame['dropped_activity'] = self._dropped_activity
+        if self._bot_status:
+            frame['bot_status'] = self._bot_status
+        if self._stats is not None:
+            frame['stats'] = self._stats
+
+        self._activity = []
+        self._activity_counts = {}
+        self._bot_status = {}
+        self._stats = None
+        self._dropped_activity = 0
+        return frame
+
+    async def flush(self) -> None:
+        """Emit pending updates now."""
+        frame = self._take_frame()
+        if frame is None:
+            return
+        self.frames_emitted += 1
+        try:
+            await self.emit(frame)
+        except Exception as e:
+            print(f"❌ Error emitting telemetry: {e}")
+
+    async def close(self) -> None:
+        """Emit anything pending and stop the tick loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing metrics."""
+        return {
+            'tick': self.tick,
+            'updates_received': self.updates_received,
+            'frames_emitted': self.frames_emitted
+        }
@@ -0,0 +1,419 @@
+"""
+Streaming transcript export and import for debate chat logs.
+
+Each writer consumes messages from an iterator and writes them to disk one at
+a time, so exporting a long debate never builds the whole transcript in
+memory. Exports are meant to run in a worker thread (see
+``ChatLog.save_transcript``) so bots and websocket traffic keep flowing.
+``TranscriptReader`` does the reverse for JSON transcripts, decoding one
+message at a time from a buffered reader.
+"""
+
+import gzip
+import html
+import json
+import os
+import time
+from pathlib import Path
+from typing import (Any, Callable, Dict, Iterable, Iterator, Optional, Sized, TextIO,
+                    TYPE_CHECKING)
+
+if TYPE_CHECKING:
+    from app.chat_log import Message
+
+
+SUPPORTED_FORMATS = ("json", "txt", "html", "archive")
+
+# How many messages are written between two progress callbacks
+PROGRESS_INTERVAL = 500
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>AI Jubilee Debate Transcript</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
+        .header {{ background: white; padding: 20px; border-radius: 10px; margin-bottom: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+        .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }}
+        .stat-card {{ background: white; padding: 15px; border-radius: 8px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
+        .stat-value {{ font-size: 2em; font-weight: bold; color: #4f46e5; }}
+        .stat-label {{ color: #666; margin-top: 5px; }}
+        .message {{ margin: 10px 0; padding: 15px; border-left: 4px solid #ccc; background: white; border-radius: 0 8px 8px 0; }}
+        .moderator {{ border-left-color: #8b5cf6; background: #faf5ff; }}
+        .bot {{ border-left-color: #10b981; background: #f0fdf4; }}
+        .human {{ border-left-color: #f59e0b; background: #fffbeb; }}
+        .system {{ border-left-color: #6c757d; background: #e9ecef; }}
+        .timestamp {{ color: #6c757d; font-size: 0.9em; }}
+        .sender {{ font-weight: bold; margin-right: 10px; }}
+        .response-time {{ background: #4f46e5; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; margin-left: 10px; }}
+        .content {{ margin-top: 8px; line-height: 1.5; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🎭 AI Jubilee Debate Transcript</h1>
+        <p><strong>Session Duration:</strong> {session_duration_minutes:.1f} minutes</p>
+        <p><strong>Generated:</strong> {generated}</p>
+    </div>
+
+    <div class="stats">
+        <div class="stat-card">
+            <div class="stat-value">{total_messages}</div>
+            <div class="stat-label">Total Messages</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">{bot_responses}</div>
+            <div class="stat-label">Bot Responses</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">{silence_breaks}</div>
+            <div class="stat-label">Silence Breaks</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">{messages_per_minute:.1f}</div>
+            <div class="stat-label">Messages/Minute</div>
+        </div>
+    </div>
+"""
+
+HTML_MESSAGE = """
+    <div class="message {css_class}">
+        <div>
+            <span class="timestamp">[{timestamp}]</span>
+            <span class="sender">{sender}:</span>
+        </div>
+        <div class="content">{content}</div>
+    </div>
+"""
+
+HTML_FOOTER = """
+</body>
+</html>
+"""
+
+
+def open_transcript_file(filepath: Path, compress: bool) -> TextIO:
+    """
+    Open a transcript file for text writing, gzip-compressed if requested.
+
+    Args:
+        filepath: Destination path
+        compress: Whether to gzip the output
+
+    Returns:
+        Writable text stream
+    """
+    if compress:
+        return gzip.open(filepath, 'wt', encoding='utf-8')
+    return open(filepath, 'w', encoding='utf-8')
+
+
+def export_transcript(messages: Iterable['Message'], filename: str,
+                      format_type: str = "json",
+                      statistics: Optional[Dict[str, Any]] = None,
+                      metadata: Optional[Dict[str, Any]] = None,
+                      classify: Optional[Callable[['Message'], str]] = None,
+                      compress: Optional[bool] = None,
+                      progress_callback: Optional[ProgressCallback] = None,
+                      total: Optional[int] = None) -> int:
+    """
+    Write a transcript incrementally from a message iterator.
+
+    The file is written to a temporary ``.part`` path and moved into place
+    once complete, so readers never see a half-written transcript.
+
+    Args:
+        messages: Iterable of Message objects, consumed once
+        filename: Output filename
+        format_type: Format (json, txt, html, archive)
+        statistics: Chat log statistics for the transcript header
+        metadata: Extra fields for the JSON metadata block
+        classify: Maps a message to its CSS class for HTML output
+        compress: Gzip the output (defaults to True for ``.gz`` filenames);
+            archives are always block-compressed and ignore this
+        progress_callback: Called as ``callback(written, total)``
+        total: Number of messages that will be written, recorded in the
+            JSON and text headers and passed to the progress callback
+            (defaults to ``len(messages)`` for sized collections)
+
+    Returns:
+        Number of messages written
+    """
+    if format_type not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {format_type}")
+
+    filepath = Path(filename)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+
+    if compress is None:
+        compress = filepath.suffix == '.gz'
+
+    statistics = statistics or {}
+    if total is None and isinstance(messages, Sized):
+        total = len(messages)
+
+    if format_type == 'archive':
+        return _export_archive(messages, filepath, statistics, metadata or {},
+                               progress_callback, total)
+
+    writer = {
+        'json': _write_json,
+        'txt': _write_txt,
+        'html': _write_html,
+    }[format_type]
+
+    temp_path = filepath.with_name(filepath.name + '.part')
+    try:
+        with open_transcript_file(temp_path, compress) as f:
+            written = writer(f, messages, statistics, metadata or {}, classify,
+                             progress_callback, total)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+    if progress_callback:
+        progress_callback(written, total)
+
+    return written
+
+
+def _export_archive(messages: Iterable['Message'], filepath: Path,
+                    statistics: Dict[str, Any], metadata: Dict[str, Any],
+                    progress_callback: Optional[ProgressCallback],
+                    total: Optional[int]) -> int:
+    """Write a block-compressed archive (see ``app.archive``)."""
+    from .archive import write_archive
+
+    progress = (lambda written: progress_callback(written, total)) if progress_callback else None
+
+    temp_path = filepath.with_name(filepath.name + '.part')
+    try:
+        with open(temp_path, 'wb') as f:
+            written = write_archive(f, messages, statistics, metadata, progress=progress)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+    if progress_callback:
+        progress_callback(written, total)
+
+    return written
+
+
+def _report_progress(written: int, total: Optional[int],
+                     progress_callback: Optional[ProgressCallback]) -> None:
+    """Report progress every PROGRESS_INTERVAL messages."""
+    if progress_callback and written % PROGRESS_INTERVAL == 0:
+        progress_callback(written, total)
+
+
+def _write_json(f: TextIO, messages: Iterable['Message'],
+                statistics: Dict[str, Any], metadata: Dict[str, Any],
+                classify, progress_callback, total) -> int:
+    """Write the JSON transcript, one message object per line."""
+    # total_messages counts the messages in this file; the lifetime count
+    # (which includes evicted messages) stays in statistics
+    header = {'export_timestamp': time.time()}
+    if total is not None:
+        header['total_messages'] = total
+    header.update(statistics=statistics, **metadata)
+
+    f.write('{\n  "metadata": ')
+    f.write(json.dumps(header, ensure_ascii=False))
+    f.write(',\n  "messages": [')
+
+    written = 0
+    for msg in messages:
+        f.write(',\n    ' if written else '\n    ')
+        f.write(json.dumps(msg.to_dict(), ensure_ascii=False))
+        written += 1
+        _report_progress(written, total, progress_callback)
+
+    f.write('\n  ]\n}\n' if written else ']\n}\n')
+    return written
+
+
+def _write_txt(f: TextIO, messages: Iterable['Message'],
+               statistics: Dict[str, Any], metadata: Dict[str, Any],
+               classify, progress_callback, total) -> int:
+    """Write the plain-text transcript."""
+    f.write("=== AI JUBILEE DEBATE TRANSCRIPT ===\n")
+    f.write(f"Session Duration: {statistics.get('session_duration_minutes', 0):.1f} minutes\n")
+    if total is not None:
+        f.write(f"Total Messages: {total}\n")
+    f.write(f"Bot Responses: {statistics.get('bot_responses', 0)}\n")
+    f.write(f"Silence Breaks: {statistics.get('silence_breaks', 0)}\n\n")
+
+    written = 0
+    for msg in messages:
+        f.write(f"[{msg.formatted_timestamp}] {msg.sender}: {msg.content}\n")
+        written += 1
+        _report_progress(written, total, progress_callback)
+
+    return written
+
+
+def _write_html(f: TextIO, messages: Iterable['Message'],
+                statistics: Dict[str, Any], metadata: Dict[str, Any],
+                classify, progress_callback, total) -> int:
+    """Write the HTML transcript with escaped content."""
+    f.write(HTML_HEADER.format(
+        session_duration_minutes=statistics.get('session_duration_minutes', 0),
+        generated=time.strftime('%Y-%m-%d %H:%M:%S'),
+        total_messages=statistics.get('total_messages', total or 0),
+        bot_responses=statistics.get('bot_responses', 0),
+        silence_breaks=statistics.get('silence_breaks', 0),
+        messages_per_minute=statistics.get('messages_per_minute', 0)
+    ))
+
+    written = 0
+    for msg in messages:
+        css_class = classify(msg) if classify else msg.message_type
+        f.write(HTML_MESSAGE.format(
+            css_class=css_class,
+            timestamp=msg.formatted_timestamp,
+            sender=html.escape(msg.sender),
+            content=html.escape(msg.content).replace('\n', '<br>')
+        ))
+        written += 1
+        _report_progress(written, total, progress_callback)
+
+    f.write(HTML_FOOTER)
+    return written
+
+
+class TranscriptReader:
+    """
+    Incremental reader for JSON transcripts.
+
+    The file is read in fixed-size chunks and each value is decoded with
+    ``json.JSONDecoder.raw_decode`` as soon as it is complete, so memory
+    stays bounded by the chunk size plus one message. Values other than
+    ``messages`` (such as ``metadata``) are decoded whole and exposed on
+    ``self.metadata`` as they are reached. Gzip-compressed files are
+    detected automatically.
+    """
+
+    def __init__(self, filename: str, chunk_size: int = 65536):
+        """
+        Args:
+            filename: JSON transcript path (optionally gzip-compressed)
+            chunk_size: Characters read per chunk
+        """
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.metadata: Dict[str, Any] = {}
+
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._file: Optional[TextIO] = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield message dictionaries in file order."""
+        with open(self.filename, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+        self._file = (gzip.open(self.filename, 'rt', encoding='utf-8') if compressed
+                      else open(self.filename, 'r', encoding='utf-8'))
+
+        try:
+            self._expect('{')
+            if self._peek() == '}':
+                return
+
+            while True:
+                key = self._decode_value()
+                self._expect(':')
+
+                if key == 'messages':
+                    yield from self._iter_array()
+                else:
+                    value = self._decode_value()
+                    if key == 'metadata':
+                        self.metadata = value
+
+                if self._next_token() == '}':
+                    break
+                self._pos -= 1
+                self._expect(',')
+        finally:
+            self._file.close()
+            self._file = None
+
+    def _iter_array(self) -> Iterator[Dict[str, Any]]:
+        """Yield the elements of the array at the current position."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode_value()
+            token = self._next_token()
+            if token == ']':
+                return
+            if token != ',':
+                self._error(f"expected ',' or ']' but found {token!r}")
+
+    def _fill(self) -> bool:
+        """Read another chunk, compacting consumed input. Returns False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                self._error("unexpected end of file")
+
+    def _next_token(self) -> str:
+        """Consume and return the next non-whitespace character."""
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, char: str) -> None:
+        """Consume a specific structural character."""
+        token = self._next_token()
+        if token != char:
+            self._error(f"expected {char!r} but found {token!r}")
+
+    def _decode_value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal cut at the buffer edge may be incomplete
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _error(self, reason: str) -> None:
+        """Raise a decode error for a malformed transcript."""
+        raise ValueError(f"Malformed transcript {self.filename}: {reason}")
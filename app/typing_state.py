@@ -0,0 +1,131 @@
+"""
+Typing indicators: per-room typing sets with expiry and throttled broadcasts.
+
+Clients report ``typing`` on keystrokes (throttled on their side) and
+``stop_typing`` when they send or clear the input. ``TypingTracker`` keeps
+who is typing in each room:
+- every entry expires ``ttl`` seconds after its last report, through an
+  event loop timer, so a client that disconnects mid-sentence disappears
+- entries are tied to the connection that reported them and are dropped
+  when it leaves
+- the room's typing list is published at most once per ``interval``, and
+  only when it changed
+
+Bots check ``is_typing()`` to hold off while a human is composing.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class TypingTracker:
+    """Who is typing in each room."""
+
+    def __init__(self, publish: Callable[[str, List[str]], Awaitable[None]],
+                 ttl: float = 5.0, interval: float = 0.5):
+        """
+        Args:
+            publish: Coroutine called as ``publish(room, typing_users)``
+            ttl: Seconds a typing report stays valid
+            interval: Least seconds between two publishes for one room
+        """
+        self.publish = publish
+        self.ttl = ttl
+        self.interval = interval
+
+        # room -> sender -> expiry timer
+        self._rooms: Dict[str, Dict[str, asyncio.TimerHandle]] = {}
+        # owner (connection) -> (room, sender) pairs it reported
+        self._owners: Dict[Hashable, Set[Tuple[str, str]]] = {}
+        self._published: Dict[str, Tuple[str, ...]] = {}
+        self._last_publish: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.TimerHandle] = {}
+
+        # Metrics
+        self.reports = 0
+        self.publishes = 0
+        self.expired = 0
+
+    def start(self, room: str, sender: str, owner: Optional[Hashable] = None) -> None:
+        """Record that ``sender`` is typing in ``room``, renewing its expiry."""
+        self.reports += 1
+        loop = asyncio.get_running_loop()
+        typing = self._rooms.setdefault(room, {})
+
+        timer = typing.get(sender)
+        if timer is not None:
+            timer.cancel()
+        typing[sender] = loop.call_later(self.ttl, self._expire, room, sender)
+
+        if owner is not None:
+            self._owners.setdefault(owner, set()).add((room, sender))
+        if timer is None:
+            self._schedule(room)
+
+    def stop(self, room: str, sender: str) -> None:
+        """Record that ``sender`` stopped typing in ``room``."""
+        typing = self._rooms.get(room)
+        timer = typing.pop(sender, None) if typing else None
+        if timer is not None:
+            timer.cancel()
+            self._schedule(room)
+
+    def drop_owner(self, owner: Hashable) -> None:
+        """Forget everything a disconnected connection was typing."""
+        for room, sender in self._owners.pop(owner, ()):
+            self.stop(room, sender)
+
+    def _expire(self, room: str, sender: str) -> None:
+        typing = self._rooms.get(room)
+        if typing and typing.pop(sender, None) is not None:
+            self.expired += 1
+            self._schedule(room)
+
+    def is_typing(self, room: Optional[str] = None) -> bool:
+        """Whether anyone is typing in ``room`` (or in any room)."""
+        if room is not None:
+            return bool(self._rooms.get(room))
+        return any(self._rooms.values())
+
+    def get_typing(self, room: str) -> List[str]:
+        """Senders typing in a room, sorted."""
+        return sorted(self._rooms.get(room, ()))
+
+    def _schedule(self, room: str) -> None:
+        """Publish the room's list once the throttle interval allows."""
+        if room in self._pending:
+            return
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, self._last_publish.get(room, 0.0) + self.interval - time.monotonic())
+        self._pending[room] = loop.call_later(delay, self._flush, room)
+
+    def _flush(self, room: str) -> None:
+        self._pending.pop(room, None)
+        users = tuple(self.get_typing(room))
+        if users == self._published.get(room, ()):
+            return
+        self._published[room] = users
+        self._last_publish[room] = time.monotonic()
+        self.publishes += 1
+        asyncio.ensure_future(self.publish(room, list(users)))
+
+    def close(self) -> None:
+        """Cancel every timer."""
+        for typing in self._rooms.values():
+            for timer in typing.values():
+                timer.cancel()
+        for timer in self._pending.values():
+            timer.cancel()
+        self._rooms.clear()
+        self._pending.clear()
+        self._owners.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Typing counts and publish counters."""
+        return {
+            'typing': {room: len(typing) for room, typing in self._rooms.items() if typing},
+            'reports': self.reports,
+            'publishes': self.publishes,
+            'expired': self.expired
+        }
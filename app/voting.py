@@ -3,11 +3,17 @@ Voting system for debate evaluation and winner determination.
 """
 
 import asyncio
+import json
+import re
 import time
-from typing import Dict, List, Optional, Any
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from collections import defaultdict, Counter
 
+if TYPE_CHECKING:
+    from app.storage import StorageBackend
+
 
 @dataclass
 class Vote:
@@ -30,13 +36,74 @@ class VotingResults:
     participation_rate: float
 
 
+_JSON_OBJECT = re.compile(r'\{.*?\}', re.DOTALL)
+_BALLOT_FIELD = re.compile(r'^\W*(vote|candidate|reasoning|justification)\W*:\s*(.*)$',
+                           re.IGNORECASE | re.MULTILINE)
+
+
+def _match_candidate(choice: str, candidates: List[str]) -> Optional[str]:
+    """Resolve a free-text choice to exactly one candidate."""
+    choice = choice.strip().strip('"\'[]*.').strip()
+    for candidate in candidates:
+        if choice.lower() == candidate.lower():
+            return candidate
+    mentioned = [candidate for candidate in candidates
+                 if re.search(rf'\b{re.escape(candidate)}\b', choice, re.IGNORECASE)]
+    return mentioned[0] if len(mentioned) == 1 else None
+
+
+def parse_ballot(response: str, candidates: List[str]) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Extract a vote from a model response.
+
+    Accepts, in order of preference, a JSON object
+    (``{"vote": "...", "reasoning": "..."}``), ``VOTE:`` / ``REASONING:``
+    lines, or a response that names exactly one candidate.
+
+    Args:
+        response: Model output
+        candidates: Valid choices
+
+    Returns:
+        ``(candidate, reasoning)``, or None if no single candidate was chosen
+    """
+    for match in _JSON_OBJECT.finditer(response or ''):
+        try:
+            ballot = json.loads(match.group())
+        except ValueError:
+            continue
+        if isinstance(ballot, dict):
+            choice = ballot.get('vote', ballot.get('candidate'))
+            candidate = _match_candidate(str(choice), candidates) if choice else None
+            if candidate:
+                reasoning = ballot.get('reasoning', ballot.get('justification'))
+                return candidate, str(reasoning).strip() if reasoning else None
+
+    fields = {key.lower(): value.strip() for key, value in _BALLOT_FIELD.findall(response or '')}
+    choice = fields.get('vote', fields.get('candidate'))
+    if choice:
+        candidate = _match_candidate(choice, candidates)
+        if candidate:
+            return candidate, fields.get('reasoning', fields.get('justification')) or None
+
+    candidate = _match_candidate(response or '', candidates)
+    return (candidate, None) if candidate else None
+
+
 class VotingSystem:
     """
     Manages voting process, vote collection, and result calculation.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any],
+                 storage: Optional['StorageBackend'] = None):
+        """
+        Args:
+            config: Voting configuration
+            storage: Optional durable backend that receives every vote
+        """
         self.config = config
+        self.storage = storage
         self.enabled = config.get('enabled', True)
         self.voting_duration = config.get('voting_duration', 300)
         self.allow_participant_voting = config.get('allow_participant_voting', True)
@@ -48,19 +115,31 @@ class VotingSystem:
         self.candidates: List[str] = []
         self.eligible_voters: List[str] = []
         self.votes: Dict[str, Vote] = {}
+        # Live tally, kept up to date on every cast and change of vote
+        self.vote_counts: Counter = Counter()
+        self.session_id: Optional[str] = None
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
 
+        # Bumped on every change so observers can cache views of the state
+        self.version = 0
+
+        # Set once every eligible voter has voted, so the session can close early
+        self._all_voted = asyncio.Event()
+
         # Vote validation
         self.vote_history: List[Dict[str, Any]] = []
 
-    async def start_voting(self, candidates: List[str], duration: Optional[int] = None) -> None:
+    async def start_voting(self, candidates: List[str], duration: Optional[int] = None,
+                           voters: Optional[List[str]] = None) -> None:
         """
         Start a voting session.
 
         Args:
             candidates: List of debate participants to vote for
             duration: Voting duration in seconds (uses config default if None)
+            voters: Eligible voters (default: the candidates, if participant
+                voting is allowed, else open voting)
         """
         if not self.enabled:
             raise ValueError("Voting system is disabled")
@@ -69,11 +148,18 @@ class VotingSystem:
             raise ValueError("Voting session already active")
 
         self.candidates = candidates.copy()
-        self.eligible_voters = candidates.copy() if self.allow_participant_voting else []
+        if voters is not None:
+            self.eligible_voters = list(voters)
+        else:
+            self.eligible_voters = candidates.copy() if self.allow_participant_voting else []
         self.votes = {}
+        self.vote_counts = Counter()
+        self._all_voted = asyncio.Event()
+        self.session_id = uuid.uuid4().hex
         self.start_time = time.time()
         self.end_time = self.start_time + (duration or self.voting_duration)
         self.is_active = True
+        self.version += 1
 
         print(f"🗳️ Voting started for {len(candidates)} candidates")
         print(f"⏰ Voting closes in {duration or self.voting_duration} seconds")
@@ -98,7 +184,7 @@ class VotingSystem:
             raise ValueError("Voting period has ended")
 
         # Validate voter eligibility
-        if not self._is_eligible_voter(voter_id):
+        if not self.is_eligible_voter(voter_id):
             raise ValueError(f"Voter {voter_id} is not eligible to vote")
 
         # Validate candidate
@@ -121,11 +207,78 @@ class VotingSystem:
             anonymous=self.anonymous_votes
         )
 
+        previous = self.votes.get(voter_id)
+        if previous is not None:
+            self.vote_counts[previous.candidate] -= 1
+            if not self.vote_counts[previous.candidate]:
+                del self.vote_counts[previous.candidate]
+        self.vote_counts[candidate] += 1
+
         self.votes[voter_id] = vote
+        self.version += 1
+        if self.storage:
+            self.storage.save_vote(self.session_id, vote)
+        if self.eligible_voters and len(self.votes) >= len(self.eligible_voters):
+            self._all_voted.set()
 
         print(f"✅ Vote recorded: {voter_id} -> {candidate}")
         return True
 
+    async def wait_for_votes(self) -> bool:
+        """
+        Wait until every eligible voter has voted or the session's time is up.
+
+        Returns:
+            True if everyone voted before the deadline
+        """
+        if not self.is_active:
+            return self._all_voted.is_set()
+        try:
+            await asyncio.wait_for(self._all_voted.wait(), max(0, self.end_time - time.time()))
+        except asyncio.TimeoutError:
+            pass
+        return self._all_voted.is_set()
+
+    async def collect_votes(self, ballots: Dict[str, Callable[[], Awaitable[str]]]) -> Dict[str, Optional[str]]:
+        """
+        Ask several voters for a vote at once and record the valid ones.
+
+        Every ballot runs concurrently and shares the session's deadline.
+        Each response is parsed with ``parse_ballot`` and recorded with
+        ``cast_vote`` as soon as it arrives.
+
+        Args:
+            ballots: Voter id -> coroutine function returning the voter's
+                response text
+
+        Returns:
+            Voter id -> candidate voted for (None if the voter timed out,
+            failed or gave no valid vote)
+        """
+        if not self.is_active:
+            raise ValueError("No active voting session")
+
+        async def collect(voter_id: str, ballot: Callable[[], Awaitable[str]]) -> Optional[str]:
+            try:
+                response = await asyncio.wait_for(ballot(), max(0, self.end_time - time.time()))
+                parsed = parse_ballot(response, self.candidates)
+                if parsed is None:
+                    print(f"⚠️ No valid vote from {voter_id}")
+                    return None
+                candidate, reasoning = parsed
+                if await self.cast_vote(voter_id, candidate, reasoning):
+                    return candidate
+            except asyncio.TimeoutError:
+                print(f"⏰ {voter_id} did not vote in time")
+            except Exception as e:
+                print(f"⚠️ Vote from {voter_id} rejected: {e}")
+            return None
+
+        voter_ids = list(ballots)
+        results = await asyncio.gather(*[collect(voter_id, ballots[voter_id])
+                                         for voter_id in voter_ids])
+        return dict(zip(voter_ids, results))
+
     async def end_voting(self) -> VotingResults:
         """
         End the voting session and calculate results.
@@ -137,10 +290,10 @@ class VotingSystem:
             raise ValueError("No active voting session")
 
         self.is_active = False
+        self.version += 1
         actual_end_time = time.time()
 
-        # Calculate vote counts
-        vote_counts = Counter(vote.candidate for vote in self.votes.values())
+        vote_counts = self.vote_counts
         total_votes = len(self.votes)
 
         # Determine winner
@@ -172,6 +325,7 @@ class VotingSystem:
 
         # Store in history
         self.vote_history.append({
+            'session_id': self.session_id,
             'timestamp': actual_end_time,
             'candidates': self.candidates.copy(),
             'results': results
@@ -183,7 +337,7 @@ class VotingSystem:
 
         return results
 
-    def _is_eligible_voter(self, voter_id: str) -> bool:
+    def is_eligible_voter(self, voter_id: str) -> bool:
         """Check if a voter is eligible to vote."""
         if not self.eligible_voters:
             return True  # Open voting
@@ -199,17 +353,22 @@ class VotingSystem:
         if voter_id in self.eligible_voters:
             self.eligible_voters.remove(voter_id)
 
-    def get_vote_summary(self) -> Dict[str, Any]:
-        """Get current voting summary without ending the session."""
-        if not self.is_active:
+    def get_vote_summary(self, include_ended: bool = False) -> Dict[str, Any]:
+        """
+        Get current voting summary without ending the session.
+
+        Args:
+            include_ended: Also summarize a session that has ended, with its
+                final counts, until the next one starts or ``reset()``
+        """
+        if not self.is_active and not (include_ended and self.candidates):
             return {}
 
-        vote_counts = Counter(vote.candidate for vote in self.votes.values())
-        time_remaining = max(0, self.end_time - time.time())
+        time_remaining = max(0, self.end_time - time.time()) if self.is_active else 0
 
         return {
             'candidates': self.candidates,
-            'vote_counts': dict(vote_counts),
+            'vote_counts': dict(self.vote_counts),
             'total_votes': len(self.votes),
             'time_remaining': time_remaining,
             'is_active': self.is_active
@@ -317,8 +476,10 @@ class VotingSystem:
         self.candidates = []
         self.eligible_voters = []
         self.votes = {}
+        self.vote_counts = Counter()
         self.start_time = None
         self.end_time = None
+        self.version += 1
 
     @property
     def status(self) -> Dict[str, Any]:
@@ -7,23 +7,106 @@ import asyncio
 import json
 import time
 import websockets
-from typing import Dict, Set, Optional, Any
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlparse, parse_qs
 from websockets import WebSocketServerProtocol
 
+from .admission import AdmissionController, Rejection
+from .frames import encode_frame
+from .gateway import ChannelIndex, RealtimeGateway
+from .outbound import ClientSender
+from .rate_limit import InboundLimiter
+from .spectators import SpectatorRoom
+from .state_sync import StateSync
+from .telemetry import TelemetryAggregator
+from .typing_state import TypingTracker
+from .wire import SUBPROTOCOL as BINARY_SUBPROTOCOL, WireEncoder
+
 
 class DebateWebServer:
     """Enhanced web server for real-time debate interface with bot activity monitoring."""
 
-    def __init__(self, host: str = "localhost", port: int = 8081):
+    # Messages replayed to a new client that has no resume cursor
+    HISTORY_SIZE = 20
+
+    # Most messages one resume replay sends; clients page with further resumes
+    REPLAY_LIMIT = 200
+
+    # Frame types a slow client can miss without losing the conversation
+    DROPPABLE_TYPES = frozenset({'bot_activity', 'bot_status', 'typing', 'debate_stats',
+                                 'telemetry'})
+
+    # Subscription channel(s) each broadcast frame type belongs to
+    FRAME_CHANNELS = {
+        'message': ('chat',),
+        'typing': ('chat',),
+        'bot_activity': ('bot_activity',),
+        'bot_status': ('bot_activity',),
+        'telemetry': ('bot_activity', 'stats'),
+        'debate_stats': ('stats',),
+        'vote_update': ('votes',),
+    }
+
+    # Channel of each versioned state channel's deltas
+    STATE_CHANNELS = {'stats': 'stats', 'bots': 'bot_activity'}
+
+    def __init__(self, host: str = "localhost", port: int = 8081,
+                 max_client_queue: int = 256,
+                 slow_send_threshold: float = 0.5,
+                 send_timeout: float = 10.0,
+                 telemetry_tick: float = 0.1,
+                 rate_limits: Optional[Dict[str, Any]] = None,
+                 spectator_buffer: int = 1024,
+                 admission: Optional[Dict[str, Any]] = None):
         self.host = host
         self.port = port
+        # Clients receiving every channel; the index adds those that
+        # subscribed to specific channels
         self.clients: Set[WebSocketServerProtocol] = set()
+        self.channels = ChannelIndex(self.clients)
+        self.gateway: Optional[RealtimeGateway] = None
+
+        # One bounded outbound queue and writer task per client
+        self.senders: Dict[Any, ClientSender] = {}
+        self.max_client_queue = max_client_queue
+        self.slow_send_threshold = slow_send_threshold
+        self.send_timeout = send_timeout
+        self.evicted_clients = 0
+
+        # Bot activity, bot status and stats are coalesced into one frame per
+        # tick; a tick of 0 sends each update as its own frame
+        self.telemetry: Optional[TelemetryAggregator] = (
+            TelemetryAggregator(self._emit_telemetry, tick=telemetry_tick)
+            if telemetry_tick > 0 else None
+        )
+
+        # Stats and bot status are sent as versioned deltas
+        self.state_sync = StateSync()
+
+        # Inbound frame size, rate and per-sender limits
+        self.limiter = InboundLimiter(rate_limits)
+
+        # Read-only spectators share one ring buffer of broadcast frames
+        self.spectators = SpectatorRoom(spectator_buffer, snapshot=self.get_room_snapshot)
+
+        # Connection caps and connect rate; spectators are shed first under load
+        self.admission = AdmissionController(admission, on_shed=self._shed_spectators)
+
         self.chat_log = None
         self.moderator = None
         self.server = None
+        self.room_id = None
+
+        # Typing indicators expire on their own and are broadcast as one
+        # throttled "who is typing" frame
+        self.typing = TypingTracker(self._broadcast_typing)
+
+        # Clients that negotiated the binary wire format get chat messages
+        # as compact binary frames sharing one string table
+        self.wire = WireEncoder()
+        self.binary_clients: Set[Any] = set()
 
-        # Track typing status and bot activity
-        self.typing_users: Dict[str, float] = {}
+        # Track bot activity
         self.bot_stats: Dict[str, Dict] = {}
         self.message_count = 0
         self.bot_check_count = 0
@@ -31,20 +114,48 @@ class DebateWebServer:
 
         # Store participant info
         self.participant_info = {}
+        self.voting_system = None
+
+        # Cached room snapshot frames, rebuilt only when the room changes
+        self.room_version = 0
+        self.room_snapshot_builds = 0
+        self.room_snapshot_hits = 0
+        self._room_key: Optional[tuple] = None
+        self._room_snapshots: Dict[bool, str] = {}
+        self._participants_version = 0
+        self._participants_key: Optional[tuple] = None
+        self._participants: Optional[List[Dict[str, Any]]] = None
 
         print(f"🌐 Web server initialized on {host}:{port}")
 
-    async def start_server(self):
-        """Start the WebSocket server."""
+    async def start_server(self, gateway: Optional[RealtimeGateway] = None,
+                           room_id: str = "debate"):
+        """
+        Start serving websocket clients.
+
+        Args:
+            gateway: Shared gateway to join as a room; without one the server
+                starts its own gateway on ``host:port``
+            room_id: Room name on the gateway
+        """
+        self.room_id = room_id
+
+        if gateway is not None:
+            gateway.add_room(room_id, self.handle_client)
+            gateway.add_subprotocol(BINARY_SUBPROTOCOL)
+            self.gateway = gateway
+            print(f"✅ Debate room '{room_id}' added to gateway on ws://{gateway.host}:{gateway.port}")
+            return gateway.server
+
         print(f"🚀 Starting WebSocket server on ws://{self.host}:{self.port}")
 
-        self.server = await websockets.serve(
-            self.handle_client,
-            self.host,
-            self.port,
-            ping_interval=20,
-            ping_timeout=10
-        )
+        # Frames far over the limit close the connection in the protocol
+        # layer before they are buffered; the rest are counted and dropped
+        self.gateway = RealtimeGateway(self.host, self.port,
+                                       max_size=self.limiter.max_frame_bytes * 4,
+                                       subprotocols=[BINARY_SUBPROTOCOL])
+        self.gateway.add_room(room_id, self.handle_client, default=True)
+        self.server = await self.gateway.start()
 
         print(f"✅ WebSocket server running on ws://{self.host}:{self.port}")
         return self.server
@@ -52,38 +163,23 @@ class DebateWebServer:
     async def handle_client(self, websocket):
         """Handle new client connections."""
         print(f"👤 New client connected from {websocket.remote_address}")
-        self.clients.add(websocket)
-
-        # Send initial data
-        await self.send_to_client(websocket, {
-            'type': 'connection',
-            'status': 'connected',
-            'message': 'Connected to AI Jubilee Debate!'
-        })
+        spectator = self._is_spectator(websocket)
+        rejection = self.admit(websocket, websocket.remote_address, spectator)
+        if rejection:
+            await self._turn_away(websocket, rejection)
+            return
 
-        # Send current topic if available
-        if self.moderator and hasattr(self.moderator, 'topic'):
-            await self.send_to_client(websocket, {
-                'type': 'topic',
-                'topic': self.moderator.topic
-            })
-
-        # Send current participants if available
-        await self.send_participants_to_client(websocket)
-
-        # Send recent messages if available
-        if self.chat_log and hasattr(self.chat_log, 'messages') and len(self.chat_log.messages) > 0:
-            recent_messages = list(self.chat_log.messages)[-20:]  # Last 20 messages
-            for msg in recent_messages:
-                await self.send_to_client(websocket, {
-                    'type': 'message',
-                    'sender': msg.sender,
-                    'content': msg.content,
-                    'message_type': self._get_message_type(msg.sender),
-                    'timestamp': msg.timestamp if hasattr(msg, 'timestamp') else time.time()
-                })
+        if spectator:
+            try:
+                await self.serve_spectator(websocket)
+            finally:
+                self.admission.release(websocket)
+            return
 
         try:
+            await self.join_client(websocket, self._get_resume_cursor(websocket),
+                                   binary=self._wants_binary(websocket))
+
             # Listen for messages from this client
             async for message in websocket:
                 await self.handle_message(websocket, message)
@@ -92,13 +188,358 @@ class DebateWebServer:
         except Exception as e:
             print(f"❌ Error handling client: {e}")
         finally:
-            self.clients.discard(websocket)
+            await self.leave_client(websocket)
+
+    def admit(self, client, address: Any = None, spectator: bool = False) -> Optional[Rejection]:
+        """
+        Admission check for a new connection, before any per-client work.
+
+        Args:
+            client: New connection; released again by ``leave_client``
+            address: Remote address (the host is used for per-IP caps)
+            spectator: Whether it joins the spectator tier
+
+        Returns:
+            Rejection to answer with, or None if admitted
+        """
+        ip = address[0] if isinstance(address, (list, tuple)) and address else address
+        return self.admission.admit(client, str(ip or 'unknown'), spectator)
+
+    @staticmethod
+    def waiting_room_frame(rejection: Rejection) -> str:
+        """Encoded ``waiting_room`` answer for a turned-away client."""
+        return encode_frame({
+            'type': 'waiting_room',
+            'reason': rejection.reason,
+            'retry_after': rejection.retry_after
+        })
+
+    async def _turn_away(self, websocket, rejection: Rejection) -> None:
+        """Tell a rejected client when to retry, then close with 1013 (try again later)."""
+        print(f"⏳ Turned away {websocket.remote_address}: {rejection.reason}")
+        try:
+            await websocket.send(self.waiting_room_frame(rejection))
+            await websocket.close(code=1013, reason="Try again later")
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    def _shed_spectators(self, count: int) -> None:
+        """Disconnect spectators while the server is overloaded."""
+        frame = self.waiting_room_frame(
+            Rejection('overloaded', self.admission.config['retry_after'] * 2))
+        asyncio.ensure_future(self.spectators.shed(count, frame))
+
+    async def join_client(self, client, resume_cursor: Optional[int] = None,
+                          channels: Optional[List[str]] = None,
+                          binary: bool = False) -> None:
+        """
+        Register a connection for broadcasts and send it the room state.
+
+        Websocket clients and the HTTP streaming transports join the same
+        way; ``client`` only needs an async ``send(frame)`` and ``close()``.
+
+        Args:
+            client: Connection to register
+            resume_cursor: Replay messages after this message_id instead of
+                the recent history
+            channels: Subscribe to these channels instead of all
+            binary: Send chat messages in the binary wire format
+        """
+        resume_cursor = self._check_cursor(resume_cursor)
+        self._get_sender(client)
+        if binary:
+            # The string table comes first so later messages can refer to it
+            self.binary_clients.add(client)
+            self._get_sender(client).send(self.wire.hello())
+
+        # Everything a joining client needs arrives in one shared, cached
+        # frame. Resuming clients get it without the recent history and then
+        # a replay from their cursor. Snapshot and registration happen in one
+        # step so nothing falls between them and the first live message.
+        snapshot = self.get_room_snapshot(include_history=resume_cursor is None)
+        history = self._get_history(resume_cursor) if resume_cursor is not None else None
+        self.channels.add(client)
+        if channels:
+            self.channels.subscribe(client, channels)
+
+        self._get_sender(client).send(snapshot)
+        if history is not None:
+            await self.send_to_client(client, history)
+
+    async def serve_spectator(self, websocket) -> None:
+        """
+        Stream the room to a read-only spectator until it disconnects.
+
+        Spectators read the shared ring buffer instead of getting an
+        outbound queue; they receive every channel and cannot send.
+        """
+        resume_cursor = self._check_cursor(self._get_resume_cursor(websocket))
+        initial_frames = [self.get_room_snapshot(include_history=resume_cursor is None)]
+        if resume_cursor is not None:
+            history = self._get_history(resume_cursor)
+            if history is not None:
+                initial_frames.append(encode_frame(history))
+        await self.spectators.serve(websocket, initial_frames)
+
+    def _is_spectator(self, websocket) -> bool:
+        """Whether a connection asked for the spectator tier (``?spectate=1``)."""
+        request = getattr(websocket, 'request', None)
+        path = getattr(request, 'path', None) or getattr(websocket, 'path', '') or ''
+        return parse_qs(urlparse(path).query).get('spectate', ['0'])[0] in ('1', 'true')
+
+    def _wants_binary(self, websocket) -> bool:
+        """Whether a connection negotiated the binary wire format."""
+        if getattr(websocket, 'subprotocol', None) == BINARY_SUBPROTOCOL:
+            return True
+        request = getattr(websocket, 'request', None)
+        path = getattr(request, 'path', None) or getattr(websocket, 'path', '') or ''
+        return parse_qs(urlparse(path).query).get('wire', [''])[0] == 'binary'
+
+    async def leave_client(self, client) -> None:
+        """Unregister a connection and stop its writer task."""
+        self.channels.remove(client)
+        self.binary_clients.discard(client)
+        self.admission.release(client)
+        self.limiter.forget(client)
+        self.typing.drop_owner(client)
+        sender = self.senders.pop(client, None)
+        if sender:
+            await sender.close()
+
+    def _get_sender(self, websocket) -> ClientSender:
+        """Get or create the outbound queue for a client."""
+        sender = self.senders.get(websocket)
+        if sender is None:
+            sender = ClientSender(
+                websocket,
+                max_queue=self.max_client_queue,
+                slow_send_threshold=self.slow_send_threshold,
+                send_timeout=self.send_timeout,
+                on_evict=self._on_client_evicted
+            )
+            self.senders[websocket] = sender
+        return sender
+
+    def _on_client_evicted(self, sender: ClientSender, reason: str) -> None:
+        """Forget a client whose outbound queue gave up."""
+        self.channels.remove(sender.websocket)
+        self.binary_clients.discard(sender.websocket)
+        self.senders.pop(sender.websocket, None)
+        if reason != "connection closed":
+            self.evicted_clients += 1
+
+    def get_outbound_stats(self) -> Dict[str, Any]:
+        """Get outbound queue metrics across clients."""
+        senders = list(self.senders.values())
+        return {
+            'clients': len(senders),
+            'channels': self.channels.get_stats(),
+            'degraded_clients': sum(1 for s in senders if s.degraded),
+            'evicted_clients': self.evicted_clients,
+            'max_queue_depth': max((s.queue_depth for s in senders), default=0),
+            'frames_dropped': sum(s.frames_dropped for s in senders),
+            'room_snapshot': {
+                'version': self.room_version,
+                'builds': self.room_snapshot_builds,
+                'hits': self.room_snapshot_hits
+            },
+            'telemetry': self.telemetry.get_stats() if self.telemetry else None,
+            'spectators': self.spectators.get_stats(),
+            'typing': self.typing.get_stats(),
+            'wire': dict(self.wire.get_stats(), binary_clients=len(self.binary_clients))
+        }
+
+    def get_inbound_stats(self) -> Dict[str, Any]:
+        """Get inbound rate limiting metrics."""
+        return self.limiter.get_stats()
+
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """Get admission control metrics."""
+        return self.admission.get_stats()
+
+    def _get_resume_cursor(self, websocket) -> Optional[int]:
+        """Read the ``after`` message_id cursor from the connection URL."""
+        request = getattr(websocket, 'request', None)
+        path = getattr(request, 'path', None) or getattr(websocket, 'path', '') or ''
+        after = parse_qs(urlparse(path).query).get('after')
+        if after and after[0].isdigit():
+            return int(after[0])
+        return None
+
+    def _check_cursor(self, cursor: Optional[int]) -> Optional[int]:
+        """
+        Drop a resume cursor the chat log has not reached.
+
+        A client can hold a cursor from before a server restart, ``clear()``
+        or ``load_transcript``; trusting it would skip every live message up
+        to it, so such a client starts over with a fresh snapshot instead.
+        """
+        if cursor is not None and cursor > getattr(self.chat_log, 'message_counter', 0):
+            return None
+        return cursor
+
+    def _get_history(self, after_message_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build a single history frame for a joining or resuming client.
+
+        Args:
+            after_message_id: Replay up to REPLAY_LIMIT messages after this
+                cursor; without a cursor the last HISTORY_SIZE messages are sent
+
+        Returns:
+            History frame, or None when there is no chat log. A replay cut
+            short is marked ``truncated`` and its ``last_message_id`` is the
+            last message sent, so the client can resume from there.
+        """
+        if not self.chat_log or not hasattr(self.chat_log, 'messages'):
+            return None
+
+        last_message_id = getattr(self.chat_log, 'message_counter', 0)
+        truncated = False
+        if after_message_id is None:
+            messages = list(self.chat_log.messages)[-self.HISTORY_SIZE:]
+        else:
+            messages = self.chat_log.get_messages_after(after_message_id,
+                                                        limit=self.REPLAY_LIMIT + 1)
+            if len(messages) > self.REPLAY_LIMIT:
+                messages = messages[:self.REPLAY_LIMIT]
+                last_message_id = messages[-1].message_id
+                truncated = True
+
+        history = {
+            'type': 'history',
+            'messages': [self._message_frame(msg) for msg in messages],
+            'last_message_id': last_message_id
+        }
+        if truncated:
+            history['truncated'] = True
+        return history
+
+    def _message_frame(self, msg) -> Dict[str, Any]:
+        """Convert a chat log Message into the web message frame fields."""
+        return {
+            'sender': msg.sender,
+            'content': msg.content,
+            'message_type': self._get_message_type(msg.sender),
+            'timestamp': msg.timestamp,
+            'message_id': msg.message_id,
+            'participant_info': self.participant_info.get(msg.sender, {})
+        }
+
+    def get_room_snapshot(self, include_history: bool = True) -> str:
+        """
+        Get the encoded room snapshot sent to joining clients.
+
+        The frame carries the connection status, topic, participants, recent
+        messages, vote state and state channel snapshots. It is encoded once
+        and reused until one of those changes, so a burst of joins costs one
+        encode.
+
+        Args:
+            include_history: Include the last HISTORY_SIZE messages
+
+        Returns:
+            Encoded ``room_snapshot`` frame
+        """
+        key = self._get_room_key()
+        if key != self._room_key:
+            self._room_key = key
+            self._room_snapshots.clear()
+            self.room_version += 1
+
+        frame = self._room_snapshots.get(include_history)
+        if frame is not None:
+            self.room_snapshot_hits += 1
+            return frame
+
+        self.room_snapshot_builds += 1
+        frame = encode_frame(self._build_room_snapshot(include_history))
+        self._room_snapshots[include_history] = frame
+        return frame
+
+    def _get_room_key(self) -> tuple:
+        """Cheap fingerprint of everything the room snapshot contains."""
+        chat_log = self.chat_log
+        messages = getattr(chat_log, 'messages', None)
+        last_message = messages[-1] if messages else None
+        voting_system = self.voting_system
+
+        return (
+            getattr(self.moderator, 'topic', None),
+            self._get_participants_key(),
+            id(chat_log),
+            getattr(chat_log, 'message_counter', 0),
+            getattr(last_message, 'timestamp', None),
+            id(voting_system),
+            getattr(voting_system, 'version', None),
+            tuple((name, channel.version) for name, channel in self.state_sync.channels.items())
+        )
+
+    def _build_room_snapshot(self, include_history: bool) -> Dict[str, Any]:
+        """Assemble the room snapshot payload."""
+        # Participants first: building them fills participant_info, which
+        # the history message frames use
+        participants = self._get_participants()
+        history = self._get_history() if include_history else None
+
+        return {
+            'type': 'room_snapshot',
+            'version': self.room_version,
+            'status': 'connected',
+            'message': 'Connected to AI Jubilee Debate!',
+            'topic': getattr(self.moderator, 'topic', None),
+            'participants': participants,
+            'messages': history['messages'] if history else [],
+            'last_message_id': getattr(self.chat_log, 'message_counter', 0),
+            'votes': self._get_vote_state(),
+            'state': self.state_sync.snapshots()
+        }
+
+    def _get_vote_state(self) -> Optional[Dict[str, Any]]:
+        """Current voting session state, or None without a voting system."""
+        voting_system = self.voting_system
+        if voting_system is None:
+            return None
+
+        return {
+            'is_active': voting_system.is_active,
+            'session_id': voting_system.session_id,
+            'candidates': list(voting_system.candidates),
+            'vote_counts': dict(voting_system.vote_counts),
+            'total_votes': len(voting_system.votes),
+            'end_time': voting_system.end_time
+        }
+
+    def _get_participants_key(self) -> tuple:
+        """Fingerprint of the participant list."""
+        participants = getattr(self.moderator, 'participants', None)
+        return (self._participants_version, id(participants),
+                len(participants) if isinstance(participants, (list, dict)) else 0)
+
+    def _get_participants(self) -> Optional[List[Dict[str, Any]]]:
+        """Participant list for clients, rebuilt only when participants change."""
+        key = self._get_participants_key()
+        if key != self._participants_key:
+            self._participants_key = key
+            self._participants = self._build_participants()
+        return self._participants
 
     async def send_participants_to_client(self, websocket):
         """Send participants data to a specific client."""
-        if not self.moderator or not hasattr(self.moderator, 'participants'):
+        participants = self._get_participants()
+        if participants is None:
             return
 
+        await self.send_to_client(websocket, {
+            'type': 'participants',
+            'participants': participants
+        })
+
+    def _build_participants(self) -> Optional[List[Dict[str, Any]]]:
+        """Build participant data from the moderator and record participant info."""
+        if not self.moderator or not hasattr(self.moderator, 'participants'):
+            return None
+
         participants = []
         participant_objects = []
 
@@ -109,7 +550,7 @@ class DebateWebServer:
             participant_objects = self.moderator.participants
         else:
             print(f"⚠️ Unknown participants format: {type(self.moderator.participants)}")
-            return
+            return None
 
         for p in participant_objects:
             try:
@@ -161,29 +602,65 @@ class DebateWebServer:
                 print(f"⚠️ Error processing participant {p}: {e}")
                 continue
 
-        await self.send_to_client(websocket, {
-            'type': 'participants',
-            'participants': participants
-        })
-
-        print(f"✅ Sent {len(participants)} participants to client")
+        return participants
 
     async def handle_message(self, websocket, message):
         """Handle incoming messages from clients."""
+        # Oversized frames and floods are dropped before parsing
+        if self.limiter.check_frame(websocket, message):
+            return
+
         try:
             data = json.loads(message)
             message_type = data.get('type')
 
+            sender = None
+            if message_type == 'human_message':
+                sender = data['sender'] = str(data.get('sender', 'Human_1'))
+            elif message_type == 'user_message':
+                sender = 'Human_1'
+
+            reason = self.limiter.check_message(websocket, message_type)
+            if reason:
+                if sender is not None:
+                    await self.send_to_client(websocket, {
+                        'type': 'rate_limited',
+                        'reason': reason,
+                        'retry_after': round(self.limiter.retry_after(websocket, message_type), 2)
+                    })
+                return
+
             if message_type == 'human_message':
+                # Connections that were just rate limited do not get to trigger bots
+                data['suppress_bots'] = self.limiter.is_flooding(websocket)
                 await self.handle_human_message(data)
             elif message_type == 'user_message':  # Alternative message type
-                await self.handle_human_message({'sender': 'Human_1', 'content': data.get('content', '')})
+                await self.handle_human_message({
+                    'sender': 'Human_1',
+                    'content': data.get('content', ''),
+                    'suppress_bots': self.limiter.is_flooding(websocket)
+                })
             elif message_type == 'typing':
-                await self.handle_typing(data)
+                await self.handle_typing(data, websocket)
             elif message_type == 'stop_typing':
                 await self.handle_stop_typing(data)
             elif message_type == 'ping':
                 await self.send_to_client(websocket, {'type': 'pong'})
+            elif message_type == 'subscribe':
+                channels = self.channels.subscribe(websocket, data.get('channels'))
+                await self.send_to_client(websocket, {'type': 'subscribed', 'channels': channels})
+            elif message_type == 'state_resync':
+                channels = [data['channel']] if data.get('channel') else list(self.state_sync.channels)
+                for channel in channels:
+                    snapshot = self.state_sync.snapshot(channel)
+                    if snapshot:
+                        await self.send_to_client(websocket, snapshot)
+            elif message_type == 'resume':
+                after = data.get('after_message_id')
+                if isinstance(after, int):
+                    history = self._get_history(self._check_cursor(after))
+                    if history is not None:
+                        await self.send_to_client(websocket, history)
             else:
                 print(f"🤷 Unknown message type: {message_type}")
 
@@ -211,19 +688,24 @@ class DebateWebServer:
         # Update message count
         self.message_count += 1
 
+        # Set by handle_message for connections that were just rate limited
+        suppress_bots = data.get('suppress_bots', False)
+
         # Simulate bot checking activity immediately
-        await self.simulate_bot_checking(content)
+        if not suppress_bots:
+            await self.simulate_bot_checking(content)
 
         # Try to add to chat log - check what methods are available
-        if self.chat_log:
+        if self.chat_log is not None:
             chat_log_methods = [m for m in dir(self.chat_log) if not m.startswith('_')]
             print(f"🔍 Chat log methods: {chat_log_methods}")
 
             if hasattr(self.chat_log, 'add_message'):
+                metadata = {'suppress_bots': True} if suppress_bots else None
                 if asyncio.iscoroutinefunction(self.chat_log.add_message):
-                    result = await self.chat_log.add_message(sender, content)
+                    result = await self.chat_log.add_message(sender, content, metadata=metadata)
                 else:
-                    result = self.chat_log.add_message(sender, content)
+                    result = self.chat_log.add_message(sender, content, metadata=metadata)
                 print(f"✅ Added to chat log result: {result}")
             else:
                 print(f"⚠️ No add_message method found in chat log")
@@ -340,21 +822,27 @@ class DebateWebServer:
         # Return a random response from the appropriate set
         return bot_responses[hash(f"{bot_name}{time.time()}") % len(bot_responses)]
 
-    async def handle_typing(self, data):
+    async def handle_typing(self, data, websocket=None):
         """Handle typing indicators."""
-        sender = data.get('sender', 'Unknown')
-        self.typing_users[sender] = time.time()
-
-        await self.broadcast_to_others({
-            'type': 'typing',
-            'sender': sender
-        })
+        sender = str(data.get('sender', 'Unknown'))[:50]
+        self.typing.start(self._typing_room, sender, owner=websocket)
 
     async def handle_stop_typing(self, data):
         """Handle stop typing indicators."""
-        sender = data.get('sender', 'Unknown')
-        if sender in self.typing_users:
-            del self.typing_users[sender]
+        sender = str(data.get('sender', 'Unknown'))[:50]
+        self.typing.stop(self._typing_room, sender)
+
+    @property
+    def _typing_room(self) -> str:
+        return self.room_id or "debate"
+
+    async def _broadcast_typing(self, room: str, users: List[str]) -> None:
+        """Send the aggregated typing list."""
+        await self.broadcast_to_all({
+            'type': 'typing',
+            'users': users,
+            'timestamp': time.time()
+        })
 
     def _get_message_type(self, sender: str) -> str:
         """Determine message type based on sender."""
@@ -366,19 +854,20 @@ class DebateWebServer:
             return "human"
 
     async def send_to_client(self, websocket, data):
-        """Send data to a specific client."""
+        """Queue data for a specific client."""
         try:
-            await websocket.send(json.dumps(data))
-        except websockets.exceptions.ConnectionClosed:
-            self.clients.discard(websocket)
+            self._get_sender(websocket).send(
+                encode_frame(data), droppable=data.get('type') in self.DROPPABLE_TYPES
+            )
         except Exception as e:
             print(f"❌ Error sending to client: {e}")
 
     async def broadcast_message(self, sender: str, content: str,
                                 message_type: str = "chat",
-                                response_time: Optional[float] = None):
+                                response_time: Optional[float] = None,
+                                message_id: Optional[int] = None):
         """Broadcast a message to all connected clients."""
-        if not self.clients:
+        if not self.get_client_count():
             return
 
         # Get participant info
@@ -396,13 +885,20 @@ class DebateWebServer:
         if response_time:
             message_data['response_time'] = response_time
 
-        print(f"📢 Broadcasting message from {sender} to {len(self.clients)} clients")
+        if message_id is not None:
+            message_data['message_id'] = message_id
+
+        print(f"📢 Broadcasting message from {sender} to {self.get_client_count()} clients")
 
         await self.broadcast_to_all(message_data)
 
     async def broadcast_bot_activity(self, bot_name: str, log_type: str, message: str):
         """Broadcast bot activity logs to all connected clients."""
-        if not self.clients:
+        if not self.get_client_count():
+            return
+
+        if self.telemetry:
+            self.telemetry.add_activity(bot_name, log_type, message)
             return
 
         activity_data = {
@@ -417,10 +913,7 @@ class DebateWebServer:
 
     async def broadcast_bot_status(self, bot_name: str, status: str,
                                    stance: str = "", personality: str = ""):
-        """Broadcast bot status updates."""
-        if not self.clients:
-            return
-
+        """Broadcast bot status updates (tracked even with no clients, for snapshots)."""
         # Get bot stats
         bot_data = self.bot_stats.get(bot_name, {})
         bot_info = self.participant_info.get(bot_name, {})
@@ -437,13 +930,16 @@ class DebateWebServer:
             'last_activity': bot_data.get('last_activity', time.time())
         }
 
-        await self.broadcast_to_all(status_data)
-
-    async def broadcast_stats(self, stats: Dict[str, Any]):
-        """Broadcast debate statistics."""
-        if not self.clients:
+        if self.telemetry:
+            self.telemetry.update_bot_status(bot_name, status_data)
             return
 
+        delta = self._publish_bot_status({bot_name: status_data})
+        if delta:
+            await self.broadcast_to_all(delta)
+
+    async def broadcast_stats(self, stats: Dict[str, Any]):
+        """Broadcast debate statistics (tracked even with no clients, for snapshots)."""
         stats_data = {
             'type': 'debate_stats',
             'message_count': self.message_count,
@@ -452,27 +948,98 @@ class DebateWebServer:
             **stats
         }
 
-        await self.broadcast_to_all(stats_data)
+        if self.telemetry:
+            self.telemetry.update_stats(stats_data)
+            return
+
+        delta = self._publish_stats(stats_data)
+        if delta:
+            await self.broadcast_to_all(delta)
+
+    def _publish_stats(self, stats: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Publish the stats channel; returns the delta frame or None."""
+        stats = {key: value for key, value in stats.items() if key != 'type'}
+        return self.state_sync.publish('stats', stats)
+
+    def _publish_bot_status(self, statuses: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Merge bot statuses into the bots channel; returns the delta frame or None."""
+        bots = dict(self.state_sync.get_state('bots'))
+        for bot_name, status in statuses.items():
+            bots[bot_name] = {
+                **bots.get(bot_name, {}),
+                **{key: value for key, value in status.items() if key != 'type'}
+            }
+        return self.state_sync.publish('bots', bots)
+
+    async def _emit_telemetry(self, frame: Dict[str, Any]) -> None:
+        """Turn a telemetry tick's status and stats into deltas and broadcast it."""
+        deltas = []
+
+        bot_status = frame.pop('bot_status', None)
+        if bot_status:
+            deltas.append(self._publish_bot_status(bot_status))
+
+        stats = frame.pop('stats', None)
+        if stats is not None:
+            deltas.append(self._publish_stats(stats))
+
+        deltas = [delta for delta in deltas if delta]
+        if deltas:
+            frame['state'] = deltas
+
+        if 'activity' in frame or deltas:
+            await self.broadcast_to_all(frame)
 
     async def broadcast_to_all(self, data):
-        """Broadcast data to all connected clients."""
-        if not self.clients:
+        """
+        Broadcast data to every client subscribed to the frame's channel.
+
+        The frame is encoded once and queued for each client; writer tasks
+        deliver it concurrently, so a slow client never delays the others.
+        Chat messages are also encoded once in the binary wire format for
+        clients that negotiated it.
+        """
+        recipients = (self.channels.recipients(*self._get_frame_channels(data))
+                      if self.channels else None)
+        if not recipients and not self.spectators:
             return
 
-        message_json = json.dumps(data)
-        disconnected_clients = set()
-
-        for client in list(self.clients):
-            try:
-                await client.send(message_json)
-            except websockets.exceptions.ConnectionClosed:
-                disconnected_clients.add(client)
-            except Exception as e:
-                print(f"❌ Error broadcasting: {e}")
-                disconnected_clients.add(client)
+        binary_frame = None
+        if self.binary_clients and data.get('type') == 'message':
+            # Only server-known senders enter the shared string table;
+            # names picked by human clients are sent inline
+            sender = data.get('sender', '')
+            define, binary_frame = self.wire.encode_message(
+                data, intern_sender=(sender in self.participant_info
+                                     or self._get_message_type(sender) != 'human'))
+            if define is not None:
+                # Every binary client shares the table, subscribed to chat or not
+                for client in list(self.binary_clients):
+                    self._get_sender(client).send(define)
+
+        # JSON is only encoded if someone still needs it
+        message_json = None
+        if binary_frame is None or self.spectators or any(
+                client not in self.binary_clients for client in recipients or ()):
+            message_json = encode_frame(data)
+
+        if self.spectators:
+            self.spectators.publish(message_json)
+
+        if recipients:
+            droppable = data.get('type') in self.DROPPABLE_TYPES
+            for client in recipients:
+                if binary_frame is not None and client in self.binary_clients:
+                    self._get_sender(client).send(binary_frame, droppable)
+                else:
+                    self._get_sender(client).send(message_json, droppable)
 
-        # Remove disconnected clients
-        self.clients -= disconnected_clients
+    def _get_frame_channels(self, data: Dict[str, Any]) -> tuple:
+        """Subscription channels a broadcast frame is published on."""
+        frame_type = data.get('type')
+        if frame_type == 'state_delta':
+            return (self.STATE_CHANNELS.get(data.get('channel'), 'stats'),)
+        return self.FRAME_CHANNELS.get(frame_type, self.channels.channels)
 
     async def broadcast_to_others(self, data):
         """Broadcast to all clients except sender."""
@@ -483,9 +1050,14 @@ class DebateWebServer:
         self.chat_log = chat_log
         print(f"🔗 Web server connected to chat log: {type(chat_log)}")
 
+    def set_voting_system(self, voting_system):
+        """Set the voting system whose state is included in room snapshots."""
+        self.voting_system = voting_system
+
     def set_moderator(self, moderator):
         """Set the moderator instance."""
         self.moderator = moderator
+        self._participants_version += 1
         print(f"🎯 Web server connected to moderator: {type(moderator)}")
 
         # Initialize bot stats for all participants
@@ -509,6 +1081,7 @@ class DebateWebServer:
     def set_participants(self, participants):
         """Alternative method to set participants."""
         self.participant_info = {}
+        self._participants_version += 1
         for participant in participants:
             if hasattr(participant, 'name'):
                 name = participant.name
@@ -528,14 +1101,26 @@ class DebateWebServer:
 
     async def stop_server(self):
         """Stop the WebSocket server."""
+        if self.telemetry:
+            await self.telemetry.close()
+        self.typing.close()
+        self.admission.close()
+
+        for sender in list(self.senders.values()):
+            await sender.close()
+        self.senders.clear()
+        await self.spectators.close()
+
         if self.server:
-            self.server.close()
-            await self.server.wait_closed()
+            await self.gateway.stop()
+            self.server = None
             print(f"🛑 WebSocket server stopped")
+        elif self.gateway:
+            self.gateway.remove_room(self.room_id)
 
     def get_client_count(self) -> int:
-        """Get number of connected clients."""
-        return len(self.clients)
+        """Get number of connected clients, spectators included."""
+        return len(self.channels) + len(self.spectators)
 
     async def send_system_message(self, message: str):
         """Send a system message to all clients."""
@@ -0,0 +1,254 @@
+"""
+Compact binary encoding for chat message frames.
+
+JSON stays the default. A client that opts in, via the ``debate.bin.v1``
+subprotocol or ``?wire=binary``, receives chat messages as binary frames:
+
+    HELLO    0x00  varint version, varint epoch_ms, strings...
+    DEFINE   0x01  varint first_index, strings...
+    MESSAGE  0x02  varint message_id+1, ref sender, ref message_type,
+                   zigzag-varint ms since epoch, varint response_time_ms+1,
+                   UTF-8 content (to the end of the frame)
+
+A string entry is a varint byte length followed by UTF-8 bytes. A ref is
+a varint table index+1, or 0 followed by a string entry.
+
+Known senders and message types are interned in one append-only table per
+server. A joining client gets the whole table in its HELLO. A new string
+is announced once to every binary client with DEFINE, just before the
+first message that uses it, so every binary client shares the same table
+and each frame is still encoded once per broadcast. Any other sender (a
+name a human client picked) is sent inline, so client input never grows
+the table. Other frame types (snapshots, votes, telemetry) stay JSON
+text frames.
+
+``participant_info`` is left out of binary messages: clients already have
+it from the room snapshot's participant list.
+"""
+
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+SUBPROTOCOL = "debate.bin.v1"
+VERSION = 1
+
+OP_HELLO = 0x00
+OP_DEFINE = 0x01
+OP_MESSAGE = 0x02
+_OP_MESSAGE = bytes((OP_MESSAGE,))
+_INLINE = b'\x00'
+
+# Message types interned in the table; anything else is sent inline
+MESSAGE_TYPES: FrozenSet[str] = frozenset({'chat', 'bot', 'human', 'moderator', 'system'})
+
+
+def write_varint(buf: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+_SMALL_VARINTS = [bytes((value,)) for value in range(0x80)]
+
+
+def varint(value: int) -> bytes:
+    """Encode an unsigned varint."""
+    if value < 0x80:
+        return _SMALL_VARINTS[value]
+    buf = bytearray()
+    write_varint(buf, value)
+    return bytes(buf)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned varint; returns ``(value, next_pos)``."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _write_string(buf: bytearray, value: str) -> None:
+    encoded = value.encode('utf-8')
+    write_varint(buf, len(encoded))
+    buf += encoded
+
+
+class WireEncoder:
+    """Shared string table and encoder for one server's binary clients."""
+
+    def __init__(self, epoch: Optional[float] = None):
+        """
+        Args:
+            epoch: Reference time for relative timestamps (default: now)
+        """
+        self.epoch_ms = int((time.time() if epoch is None else epoch) * 1000)
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        # (sender, message_type) -> encoded index pair
+        self._pairs: Dict[Tuple[str, str], bytes] = {}
+        self._hello: Optional[Tuple[int, bytes]] = None
+
+        # Metrics
+        self.messages_encoded = 0
+        self.bytes_encoded = 0
+
+    def hello(self) -> bytes:
+        """HELLO frame with the epoch and the whole table, cached until the table grows."""
+        if self._hello is None or self._hello[0] != len(self.strings):
+            buf = bytearray((OP_HELLO,))
+            write_varint(buf, VERSION)
+            write_varint(buf, self.epoch_ms)
+            for value in self.strings:
+                _write_string(buf, value)
+            self._hello = (len(self.strings), bytes(buf))
+        return self._hello[1]
+
+    def _intern(self, value: str, new: List[str]) -> bytes:
+        """Ref to a table entry, adding it to the table if needed."""
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+            new.append(value)
+        return varint(index + 1)
+
+    @staticmethod
+    def _inline(value: str) -> bytes:
+        """Ref carrying the string itself."""
+        buf = bytearray(_INLINE)
+        _write_string(buf, value)
+        return bytes(buf)
+
+    def encode_message(self, data: Dict[str, Any],
+                       intern_sender: bool = True) -> Tuple[Optional[bytes], bytes]:
+        """
+        Encode a ``message`` frame.
+
+        Args:
+            data: The JSON frame's fields
+            intern_sender: Add the sender to the shared table; pass False
+                for names chosen by clients so they are sent inline
+
+        Returns:
+            ``(define, message)``: a DEFINE frame to send to every binary
+            client first (None if no new strings), and the MESSAGE frame
+        """
+        key = (str(data.get('sender', '')), str(data.get('message_type', 'chat')))
+        internable = intern_sender and key[1] in MESSAGE_TYPES
+        define = None
+        pair = self._pairs.get(key) if internable else None
+        if pair is None:
+            new: List[str] = []
+            first_new = len(self.strings)
+            pair = ((self._intern(key[0], new) if intern_sender else self._inline(key[0])) +
+                    (self._intern(key[1], new) if key[1] in MESSAGE_TYPES
+                     else self._inline(key[1])))
+            if internable:
+                # Only pairs of table entries are cached, so inline refs
+                # cannot grow the cache either
+                self._pairs[key] = pair
+            if new:
+                buf = bytearray((OP_DEFINE,))
+                write_varint(buf, first_new)
+                for value in new:
+                    _write_string(buf, value)
+                define = bytes(buf)
+
+        message_id = data.get('message_id')
+        timestamp = data.get('timestamp') or time.time()
+        response_time = data.get('response_time')
+        message = b''.join((
+            _OP_MESSAGE,
+            varint(message_id + 1 if isinstance(message_id, int) else 0),
+            pair,
+            varint(zigzag(int(timestamp * 1000) - self.epoch_ms)),
+            varint(int(response_time * 1000) + 1 if response_time else 0),
+            str(data.get('content', '')).encode('utf-8')
+        ))
+
+        self.messages_encoded += 1
+        self.bytes_encoded += len(message) + (len(define) if define else 0)
+        return define, message
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Table size and encoding counters."""
+        return {
+            'strings': len(self.strings),
+            'messages_encoded': self.messages_encoded,
+            'bytes_encoded': self.bytes_encoded
+        }
+
+
+class WireDecoder:
+    """Client-side decoder (the page has the same logic in JavaScript)."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.epoch_ms = 0
+
+    def _read_ref(self, frame: bytes, pos: int) -> Tuple[str, int]:
+        index, pos = read_varint(frame, pos)
+        if index:
+            return self.strings[index - 1], pos
+        length, pos = read_varint(frame, pos)
+        return frame[pos:pos + length].decode('utf-8'), pos + length
+
+    def _read_strings(self, frame: bytes, pos: int) -> List[str]:
+        values = []
+        while pos < len(frame):
+            length, pos = read_varint(frame, pos)
+            values.append(frame[pos:pos + length].decode('utf-8'))
+            pos += length
+        return values
+
+    def decode(self, frame: bytes) -> Optional[Dict[str, Any]]:
+        """Apply a frame; returns the JSON-equivalent message for MESSAGE frames."""
+        opcode = frame[0]
+        if opcode == OP_HELLO:
+            _, pos = read_varint(frame, 1)
+            self.epoch_ms, pos = read_varint(frame, pos)
+            self.strings = self._read_strings(frame, pos)
+            return None
+        if opcode == OP_DEFINE:
+            first, pos = read_varint(frame, 1)
+            del self.strings[first:]
+            self.strings += self._read_strings(frame, pos)
+            return None
+        if opcode != OP_MESSAGE:
+            raise ValueError(f"Unknown wire opcode {opcode}")
+
+        message_id, pos = read_varint(frame, 1)
+        sender, pos = self._read_ref(frame, pos)
+        message_type, pos = self._read_ref(frame, pos)
+        offset, pos = read_varint(frame, pos)
+        response_time, pos = read_varint(frame, pos)
+
+        message = {
+            'type': 'message',
+            'sender': sender,
+            'message_type': message_type,
+            'timestamp': (self.epoch_ms + unzigzag(offset)) / 1000,
+            'content': frame[pos:].decode('utf-8')
+        }
+        if message_id:
+            message['message_id'] = message_id - 1
+        if response_time:
+            message['response_time'] = (response_time - 1) / 1000
+        return message
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Per-broadcast CPU cost of StreamingServer as a function of client count.
+
+Compares the previous per-client json.dumps broadcast against the
+encode-once frame cache, with the stdlib and (if installed) orjson
+encoders. Sockets are no-op fakes, so the numbers are the server's own
+serialization and fan-out cost.
+
+Usage:
+    python benchmarks/bench_broadcast.py [--broadcasts 200] [--clients 1 10 100 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import frames
+from app.chat_log import ChatLog, Message
+from app.streaming import StreamingClient, StreamingServer
+from app.voting import VotingSystem
+
+
+class NullWebSocket:
+    """Socket that accepts frames without doing I/O."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    async def send(self, frame):
+        pass
+
+
+class LegacyStreamingServer(StreamingServer):
+    """The previous broadcast path: one json.dumps per client."""
+
+    async def _broadcast_message(self, message: Message):
+        broadcast_data = {'type': 'message', 'data': message.to_dict()}
+        tasks = []
+        for client in list(self.clients.values()):
+            if self._should_send_to_client(client, message):
+                client.last_message_id = message.message_id
+                tasks.append(self._send_to_client(client, broadcast_data))
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _send_to_client(self, client, data):
+        await client.websocket.send(json.dumps(data))
+
+
+def make_server(cls, clients: int) -> StreamingServer:
+    """Build a server with fake connected clients."""
+    server = cls(ChatLog(), VotingSystem({}), {})
+    for i in range(clients):
+        server._register_client(StreamingClient(NullWebSocket(), f"client_{i}", time.time()))
+    return server
+
+
+async def measure(cls, clients: int, broadcasts: int) -> float:
+    """Return CPU microseconds per broadcast."""
+    server = make_server(cls, clients)
+    content = "Remote work lets teams hire globally, but mentorship suffers. " * 4
+    messages = [
+        Message("Socrates", content, time.time(), i + 1, "chat", {'response_time': 1.2})
+        for i in range(broadcasts)
+    ]
+
+    start = time.process_time()
+    for message in messages:
+        await server._broadcast_message(message)
+    return (time.process_time() - start) / broadcasts * 1e6
+
+
+async def run(client_counts, broadcasts: int):
+    variants = [("per-client json", LegacyStreamingServer, 'json'),
+                ("encode-once json", StreamingServer, 'json')]
+    if 'orjson' in frames.JSON_BACKENDS:
+        variants.append(("encode-once orjson", StreamingServer, 'orjson'))
+
+    header = f"{'clients':>8} " + " ".join(f"{name:>20}" for name, _, _ in variants)
+    print(header)
+    for clients in client_counts:
+        row = []
+        for _, cls, backend in variants:
+            frames.set_json_backend(backend)
+            row.append(await measure(cls, clients, broadcasts))
+        speedup = row[0] / row[-1]
+        print(f"{clients:>8} " + " ".join(f"{us:>17.1f} us" for us in row)
+              + f"   ({speedup:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--broadcasts", type=int, default=200,
+                        help="messages broadcast per measurement")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="client counts to measure")
+    args = parser.parse_args()
+
+    print(f"=== Broadcast benchmark ({args.broadcasts} broadcasts, CPU time per broadcast) ===")
+    asyncio.run(run(args.clients, args.broadcasts))
+
+
+if __name__ == "__main__":
+    main()
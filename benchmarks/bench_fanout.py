@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Audience load generator: fan-out latency with many websocket viewers.
+
+Starts DebateWebServer or StreamingServer in its own process, connects
+thousands of asyncio websocket clients from one or more worker processes
+and injects synthetic chat through ChatLog.add_message at a fixed rate.
+
+Reported:
+- end-to-end latency from add_message to receipt at each client (p50/p95/p99/max)
+- frames dropped (messages a connected client never received), failed
+  connections and disconnects
+- server CPU (process time over the run) and memory (RSS idle, with
+  clients, peak)
+- the server's own outbound stats
+
+Use --output to save the report as JSON and --compare to print it next to
+an earlier one, e.g. before and after a change or on two machines.
+
+Usage:
+    python benchmarks/bench_fanout.py [--server web|stream] [--clients 1000]
+        [--spectate] [--workers 2] [--rate 5] [--duration 20] [--output report.json]
+        [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+
+# Clients opening their handshake at the same time, per worker
+CONNECT_BATCH = 200
+
+
+def raise_fd_limit() -> None:
+    """Allow as many sockets as the hard limit permits."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY
+                                                        else 65536, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def current_rss() -> Optional[int]:
+    """Resident memory of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return peak_rss()
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident memory of this process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Server process
+
+def serve(kind: str, port: int, rate: float, duration: float, message_size: int,
+          drain: float, conn) -> None:
+    """Run a server and inject chat when told to start."""
+    raise_fd_limit()
+    sys.stdout = open(os.devnull, 'w')  # the servers print per broadcast
+    asyncio.run(_serve(kind, port, rate, duration, message_size, drain, conn))
+
+
+async def _serve(kind: str, port: int, rate: float, duration: float,
+                 message_size: int, drain: float, conn) -> None:
+    from app.chat_log import ChatLog
+    from app.streaming import StreamingServer
+    from app.voting import VotingSystem
+    from app.web_server import DebateWebServer
+
+    loop = asyncio.get_running_loop()
+    chat_log = ChatLog()
+
+    if kind == 'web':
+        # Every client connects from localhost at once; lift admission limits
+        server = DebateWebServer("127.0.0.1", port, admission={
+            'max_clients': 10 ** 6, 'max_spectators': 10 ** 6, 'per_ip': 10 ** 6,
+            'connect_rate': 10 ** 6, 'connect_burst': 10 ** 6, 'max_loop_lag': float('inf')
+        })
+        server.set_chat_log(chat_log)
+        chat_log.set_web_server(server)
+        await server.start_server()
+    else:
+        server = StreamingServer(chat_log, VotingSystem({}), {
+            'host': "127.0.0.1", 'websocket_port': port, 'max_connections': 10 ** 6
+        })
+        await server.start()
+
+    rss_idle = current_rss()
+    conn.send(('ready',))
+    await loop.run_in_executor(None, conn.recv)  # 'start'
+
+    rss_connected = current_rss()
+    content = ("Remote work lets teams hire globally, but mentorship suffers. " * 20)[:message_size]
+    injected: Dict[int, float] = {}
+    count = max(1, int(rate * duration))
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for i in range(count):
+        delay = wall_start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        sent_at = time.time()
+        message = await chat_log.add_message(f"Speaker_{i % 4}", content)
+        injected[message.message_id] = sent_at
+    inject_wall = time.perf_counter() - wall_start
+
+    # Let outbound queues flush before measuring
+    await asyncio.sleep(drain)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    if kind == 'web':
+        server_stats = server.get_outbound_stats()
+    else:
+        server_stats = server._get_server_stats()
+
+    conn.send(('done', {
+        'injected': injected,
+        'inject_seconds': inject_wall,
+        'cpu_seconds': cpu,
+        'cpu_percent': cpu / wall * 100,
+        'rss_idle': rss_idle,
+        'rss_connected': rss_connected,
+        'rss_peak': peak_rss(),
+        'server_stats': server_stats
+    }))
+
+    await loop.run_in_executor(None, conn.recv)  # 'stop'
+    if kind == 'web':
+        await server.stop_server()
+    else:
+        await server.stop()
+
+
+# Client worker processes
+
+def swarm(url: str, kind: str, clients: int, conn) -> None:
+    """Connect ``clients`` viewers and record when each message arrives."""
+    raise_fd_limit()
+    asyncio.run(_swarm(url, kind, clients, conn))
+
+
+async def _swarm(url: str, kind: str, clients: int, conn) -> None:
+    import websockets
+
+    loop = asyncio.get_running_loop()
+    receipts: Dict[int, List[float]] = defaultdict(list)
+    connected = 0
+    failed = 0
+    disconnected = 0
+
+    async def viewer(ws):
+        nonlocal disconnected
+        try:
+            async for frame in ws:
+                received_at = time.time()
+                data = loads(frame)
+                if data.get('type') != 'message':
+                    continue
+                message_id = (data['data'] if kind == 'stream' else data).get('message_id')
+                if message_id is not None:
+                    receipts[message_id].append(received_at)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        except asyncio.CancelledError:
+            return
+        disconnected += 1
+
+    async def open_one():
+        nonlocal connected, failed
+        try:
+            ws = await websockets.connect(url, max_size=None, ping_interval=None,
+                                          open_timeout=60)
+        except Exception:
+            failed += 1
+            return None
+        connected += 1
+        return ws
+
+    sockets = []
+    for start in range(0, clients, CONNECT_BATCH):
+        batch = await asyncio.gather(*[open_one() for _ in range(start, min(clients, start + CONNECT_BATCH))])
+        sockets += [ws for ws in batch if ws is not None]
+    tasks = [asyncio.create_task(viewer(ws)) for ws in sockets]
+
+    conn.send(('connected', connected, failed))
+    await loop.run_in_executor(None, conn.recv)  # 'stop'
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.gather(*[ws.close() for ws in sockets], return_exceptions=True)
+
+    conn.send(('results', dict(receipts), disconnected))
+
+
+# Coordinator
+
+def receive(conn, process):
+    """Wait for a reply, failing if the process died instead."""
+    while not conn.poll(0.5):
+        if not process.is_alive():
+            raise RuntimeError(f"{process.name} exited with code {process.exitcode}")
+    return conn.recv()
+
+
+def run(args) -> Dict[str, Any]:
+    context = multiprocessing.get_context('spawn')
+    port = free_port()
+    url = f"ws://127.0.0.1:{port}/" + ("?spectate=1" if args.spectate else "")
+
+    server_conn, server_end = context.Pipe()
+    server = context.Process(target=serve, args=(args.server, port, args.rate, args.duration,
+                                                 args.message_size, args.drain, server_end))
+    server.start()
+    receive(server_conn, server)  # 'ready'
+
+    workers = []
+    per_worker = [args.clients // args.workers + (i < args.clients % args.workers)
+                  for i in range(args.workers)]
+    for clients in per_worker:
+        conn, worker_end = context.Pipe()
+        process = context.Process(target=swarm, args=(url, args.server, clients, worker_end))
+        process.start()
+        workers.append((process, conn))
+
+    connect_start = time.perf_counter()
+    connected = failed = 0
+    for process, conn in workers:
+        _, ok, bad = receive(conn, process)
+        connected += ok
+        failed += bad
+    connect_seconds = time.perf_counter() - connect_start
+    print(f"  {connected} clients connected in {connect_seconds:.1f}s ({failed} failed)")
+
+    server_conn.send('start')
+    _, server_report = receive(server_conn, server)
+    injected = server_report.pop('injected')
+
+    latencies: List[float] = []
+    received = 0
+    disconnected = 0
+    for process, conn in workers:
+        conn.send('stop')
+        _, receipts, lost = receive(conn, process)
+        disconnected += lost
+        for message_id, times in receipts.items():
+            sent_at = injected.get(message_id)
+            if sent_at is None:
+                continue
+            received += len(times)
+            latencies += [(t - sent_at) * 1000 for t in times]
+        process.join()
+
+    server_conn.send('stop')
+    server.join()
+
+    latencies.sort()
+    expected = len(injected) * connected
+    return {
+        'config': {
+            'server': args.server,
+            'clients': args.clients,
+            'spectate': args.spectate,
+            'workers': args.workers,
+            'rate': args.rate,
+            'duration': args.duration,
+            'message_size': args.message_size,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'connections': {
+            'connected': connected,
+            'failed': failed,
+            'disconnected': disconnected,
+            'connect_seconds': round(connect_seconds, 2)
+        },
+        'messages': {
+            'injected': len(injected),
+            'expected_deliveries': expected,
+            'delivered': received,
+            'dropped': expected - received
+        },
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else None
+        },
+        'server': {
+            'cpu_percent': round(server_report['cpu_percent'], 1),
+            'cpu_seconds': round(server_report['cpu_seconds'], 2),
+            'rss_idle_mb': _mb(server_report['rss_idle']),
+            'rss_connected_mb': _mb(server_report['rss_connected']),
+            'rss_peak_mb': _mb(server_report['rss_peak']),
+            'stats': server_report['server_stats']
+        }
+    }
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+SUMMARY_ROWS = [
+    ('connected', ('connections', 'connected')),
+    ('failed connections', ('connections', 'failed')),
+    ('disconnected', ('connections', 'disconnected')),
+    ('messages injected', ('messages', 'injected')),
+    ('frames dropped', ('messages', 'dropped')),
+    ('latency p50 (ms)', ('latency_ms', 'p50')),
+    ('latency p95 (ms)', ('latency_ms', 'p95')),
+    ('latency p99 (ms)', ('latency_ms', 'p99')),
+    ('latency max (ms)', ('latency_ms', 'max')),
+    ('server CPU (%)', ('server', 'cpu_percent')),
+    ('server RSS idle (MB)', ('server', 'rss_idle_mb')),
+    ('server RSS connected (MB)', ('server', 'rss_connected_mb')),
+    ('server RSS peak (MB)', ('server', 'rss_peak_mb')),
+]
+
+
+def _format(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    if baseline:
+        print(f"{'':<28}{'baseline':>12}{'this run':>12}")
+    for label, (section, key) in SUMMARY_ROWS:
+        line = f"{label:<28}"
+        if baseline:
+            line += f"{_format(baseline.get(section, {}).get(key)):>12}"
+        print(line + f"{_format(report[section][key]):>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=["web", "stream"], default="web",
+                        help="DebateWebServer (web) or StreamingServer (stream)")
+    parser.add_argument("--clients", type=int, default=1000, help="websocket viewers")
+    parser.add_argument("--spectate", action="store_true",
+                        help="connect web viewers as read-only spectators")
+    parser.add_argument("--workers", type=int, default=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                        help="client processes")
+    parser.add_argument("--rate", type=float, default=5.0, help="chat messages per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of injected chat")
+    parser.add_argument("--message-size", type=int, default=280, help="characters per message")
+    parser.add_argument("--drain", type=float, default=2.0,
+                        help="seconds to wait for deliveries after the last message")
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--compare", help="earlier JSON report to print alongside")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    print(f"=== Fan-out benchmark ({args.server}, {args.clients} clients, "
+          f"{args.rate:g} msg/s for {args.duration:g}s) ===")
+    report = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
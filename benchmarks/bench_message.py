@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Memory and serialization benchmark for chat Message objects.
+
+Compares the slotted Message against the previous dataclass layout
+(per-instance __dict__, eager metadata dict, dataclasses.asdict).
+
+Usage:
+    python benchmarks/bench_message.py [--count 200000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.chat_log import Message
+
+
+@dataclass
+class DataclassMessage:
+    """The pre-slots Message layout, kept here as a baseline."""
+    sender: str
+    content: str
+    timestamp: float
+    message_id: int
+    message_type: str = "chat"
+    metadata: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+SENDERS = ["Socrates", "Advocate", "Skeptic", "Mediator", "Moderator", "Human_1"]
+
+
+def build(cls, count: int) -> list:
+    """Build messages whose sender strings are fresh objects, as if decoded from JSON."""
+    now = time.time()
+    return [
+        cls("".join(SENDERS[i % len(SENDERS)]), f"Message number {i}", now + i, i,
+            "".join("chat"))
+        for i in range(count)
+    ]
+
+
+def measure_memory(cls, count: int) -> float:
+    """Return bytes allocated per message."""
+    gc.collect()
+    tracemalloc.start()
+    messages = build(cls, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+    return current / count
+
+
+def measure_serialization(messages: list, method: str) -> float:
+    """Return microseconds per message for the given serialization method."""
+    start = time.perf_counter()
+    if method == "to_wire":
+        for msg in messages:
+            msg.to_wire()
+    else:
+        for msg in messages:
+            json.dumps(msg.to_dict())
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000,
+                        help="number of messages to create")
+    args = parser.parse_args()
+
+    print(f"=== Message benchmark ({args.count:,} messages) ===")
+
+    legacy_bytes = measure_memory(DataclassMessage, args.count)
+    slotted_bytes = measure_memory(Message, args.count)
+    print(f"Memory / message   dataclass: {legacy_bytes:7.1f} B   "
+          f"slotted: {slotted_bytes:7.1f} B   "
+          f"({legacy_bytes / slotted_bytes:.2f}x smaller)")
+
+    legacy = build(DataclassMessage, args.count)
+    slotted = build(Message, args.count)
+    legacy_us = measure_serialization(legacy, "to_dict")
+    slotted_us = measure_serialization(slotted, "to_dict")
+    wire_us = measure_serialization(slotted, "to_wire")
+    print(f"json(to_dict)      dataclass: {legacy_us:7.2f} us  slotted: {slotted_us:7.2f} us")
+    print(f"to_wire            slotted:   {wire_us:7.2f} us  "
+          f"({legacy_us / wire_us:.2f}x faster than dataclass)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Audience voting benchmark: cast_vote throughput and live tally latency.
+
+Pushes votes from many distinct voters (plus some changes of vote)
+through VotingSystem.cast_vote and times get_vote_summary() as the
+session fills up. The maintained tally is compared with recounting every
+vote, which is what a per-vote vote_update used to cost.
+
+Usage:
+    python benchmarks/bench_votes.py [--votes 100000] [--candidates 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.voting import VotingSystem
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(votes: int, candidates: int, change_rate: float, sample_every: int) -> None:
+    names = [f"Candidate_{i}" for i in range(candidates)]
+    voting = VotingSystem({'require_justification': False, 'allow_participant_voting': False})
+
+    rng = random.Random(42)
+    ballots = []
+    for i in range(votes):
+        # Some votes are changes of vote by an earlier voter
+        voter = rng.randrange(i) if i and rng.random() < change_rate else i
+        ballots.append((f"voter_{voter}", rng.choice(names)))
+
+    summary_us = []
+    recount_us = []
+    # cast_vote logs every vote; keep the terminal out of the measurement
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        await voting.start_voting(names, duration=3600)
+        start = time.perf_counter()
+        for i, (voter, candidate) in enumerate(ballots, 1):
+            await voting.cast_vote(voter, candidate)
+            if i % sample_every == 0:
+                tick = time.perf_counter()
+                voting.get_vote_summary()
+                summary_us.append((time.perf_counter() - tick) * 1e6)
+
+                tick = time.perf_counter()
+                Counter(vote.candidate for vote in voting.votes.values())
+                recount_us.append((time.perf_counter() - tick) * 1e6)
+                start += time.perf_counter() - tick  # exclude the recount from throughput
+        elapsed = time.perf_counter() - start
+
+    assert sum(voting.vote_counts.values()) == len(voting.votes)
+    assert voting.vote_counts == Counter(vote.candidate for vote in voting.votes.values())
+
+    print(f"=== Voting benchmark ({votes:,} votes, {len(voting.votes):,} voters, "
+          f"{candidates} candidates) ===")
+    print(f"cast_vote throughput      {votes / elapsed:12,.0f} votes/s")
+    print(f"live tally (maintained)   p50 {percentile(summary_us, 0.5):8.1f} us   "
+          f"max {max(summary_us):8.1f} us")
+    print(f"full recount              p50 {percentile(recount_us, 0.5):8.1f} us   "
+          f"max {max(recount_us):8.1f} us")
+    # Recount cost grows with the session, so the mean sample is the average per vote
+    print(f"recounting on every vote would cost ~{votes * sum(recount_us) / len(recount_us) / 1e6:.1f} s "
+          f"of CPU over the window")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--votes", type=int, default=100_000, help="votes to cast")
+    parser.add_argument("--candidates", type=int, default=5, help="candidates")
+    parser.add_argument("--change-rate", type=float, default=0.1,
+                        help="share of votes that change an earlier vote")
+    parser.add_argument("--sample-every", type=int, default=1000,
+                        help="votes between tally latency samples")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.votes, args.candidates, args.change_rate, args.sample_every))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Size and encode-cost benchmark for chat message frames, JSON vs binary.
+
+Builds the same ``message`` frames DebateWebServer.broadcast_message sends
+and encodes them with encode_frame (JSON, orjson when installed), the
+stdlib json module, and WireEncoder (binary wire format), reporting bytes
+and microseconds per message.
+
+Usage:
+    python benchmarks/bench_wire.py [--count 100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.frames import encode_frame
+from app.wire import WireEncoder
+
+
+SENDERS = ["Socrates", "Advocate", "Skeptic", "Mediator", "Moderator", "Human_1"]
+
+
+def build(count: int) -> list:
+    """Build message frames with participant info, as broadcast to clients."""
+    now = time.time()
+    frames = []
+    for i in range(count):
+        sender = SENDERS[i % len(SENDERS)]
+        frames.append({
+            'type': 'message',
+            'sender': sender,
+            'content': f"Message number {i}: I think we should consider the other side.",
+            'message_type': 'moderator' if sender == "Moderator" else 'bot',
+            'timestamp': now + i * 0.25,
+            'participant_info': {'name': sender, 'type': 'bot', 'model': 'gpt-4',
+                                 'provider': 'openai', 'personality': 'philosophical'},
+            'response_time': 1.234,
+            'message_id': i
+        })
+    return frames
+
+
+def measure(frames: list, encode) -> tuple:
+    """Return (bytes per message, microseconds per message)."""
+    start = time.perf_counter()
+    total = 0
+    for frame in frames:
+        for encoded in encode(frame):
+            total += len(encoded.encode('utf-8') if isinstance(encoded, str) else encoded)
+    elapsed = time.perf_counter() - start
+    return total / len(frames), elapsed / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000,
+                        help="number of messages to encode")
+    args = parser.parse_args()
+
+    frames = build(args.count)
+    encoder = WireEncoder()
+
+    def encode_binary(frame):
+        define, message = encoder.encode_message(frame)
+        return (message,) if define is None else (define, message)
+
+    print(f"=== Wire benchmark ({args.count:,} messages) ===")
+    json_bytes, json_us = measure(frames, lambda frame: (encode_frame(frame),))
+    binary_bytes, binary_us = measure(frames, encode_binary)
+    _, stdlib_us = measure(frames, lambda frame: (json.dumps(frame, ensure_ascii=False,
+                                                             separators=(',', ':')),))
+    print(f"JSON     {json_bytes:7.1f} B   {json_us:6.2f} us   (stdlib json {stdlib_us:.2f} us)")
+    print(f"binary   {binary_bytes:7.1f} B   {binary_us:6.2f} us   "
+          f"({json_bytes / binary_bytes:.2f}x smaller, HELLO {len(encoder.hello())} B once per client)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,6 @@ NOW WITH BOT VOTING SUPPORT!
 """
 
 import asyncio
-import threading
-import http.server
-import socketserver
 from pathlib import Path
 import sys
 import os
@@ -23,30 +20,24 @@ from app.utils import load_config
 from app.moderator import Moderator
 from app.chat_log import ChatLog
 from app.voting import VotingSystem
+from app.streaming import StreamingServer
+from app.static_server import StaticFileServer
+from app.http_stream import HttpStreamEndpoints
 from app.bot_client import BotClient
 from app.human_client import HumanClient
 
 
-def serve_html():
-    """Serve the HTML interface on port 8080."""
-    PORT = 8080
+async def serve_html():
+    """Serve the HTML interface on port 8080 from the event loop."""
     web_dir = Path("web")
 
     if not web_dir.exists():
         print(f"❌ Web directory not found: {web_dir}")
-        return
-
-    class WebHandler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory=str(web_dir), **kwargs)
+        return None
 
-        def log_message(self, format, *args):
-            # Suppress HTTP server logs
-            pass
-
-    with socketserver.TCPServer(("", PORT), WebHandler) as httpd:
-        print(f"🌐 Web interface running at: http://localhost:{PORT}")
-        httpd.serve_forever()
+    html_server = StaticFileServer(web_dir, port=8080)
+    await html_server.start()
+    return html_server
 
 
 class WebServerWithVoting(DebateWebServer):
@@ -60,6 +51,8 @@ class WebServerWithVoting(DebateWebServer):
     def set_real_bots(self, bots):
         """Set the real bot instances."""
         self.real_bots = {bot.name: bot for bot in bots}
+        for bot in bots:
+            bot.set_typing_state(self.typing)
         print(f"🤖 Connected {len(self.real_bots)} real bots to web server")
 
     async def handle_human_message(self, data):
@@ -80,15 +73,20 @@ class WebServerWithVoting(DebateWebServer):
 
                 # Add message to real chat log - this triggers bot autonomous monitoring!
                 # The real chat log will handle broadcasting through its web_server connection
-                message = await self.chat_log_real.add_message(sender, content)
+                # Messages from a connection that was just rate limited are
+                # shown but do not trigger bots
+                suppress_bots = data.get('suppress_bots', False)
+                metadata = {'suppress_bots': True} if suppress_bots else None
+                message = await self.chat_log_real.add_message(sender, content, metadata=metadata)
                 print(f"✅ Added to real chat log: {message.message_id}")
 
                 # DON'T broadcast here - the real chat log already did it!
                 # await self.broadcast_message(sender, content, "human")  # REMOVED to prevent duplicates
 
                 # Log bot activity in web interface
-                for bot_name in self.real_bots.keys():
-                    await self.log_bot_check(bot_name, content)
+                if not suppress_bots:
+                    for bot_name in self.real_bots.keys():
+                        await self.log_bot_check(bot_name, content)
 
             except Exception as e:
                 print(f"⚠️ Error adding to real chat log: {e}")
@@ -101,221 +99,61 @@ class WebServerWithVoting(DebateWebServer):
     def set_real_chat_log(self, chat_log):
         """Set the real chat log instance."""
         self.chat_log_real = chat_log
+        self.chat_log = chat_log  # Used for history replay on connect
         print(f"🔗 Web server connected to REAL chat log")
 
 
 class BotVotingCapability:
-    """Adds voting capability to bots' autonomous monitoring."""
+    """Runs the bots' vote on the topic through the voting system."""
 
-    def __init__(self, bots, voting_system, chat_log, web_server, topic):
+    # Choices the bots vote on
+    CHOICES = ['YES', 'NO', 'ABSTAIN']
+
+    def __init__(self, bots, voting_system, chat_log, web_server, topic, moderator):
         self.bots = bots
         self.voting_system = voting_system
         self.chat_log = chat_log
         self.web_server = web_server
         self.topic = topic
-        self.voting_active = False
+        self.moderator = moderator
         self.bots_who_voted = set()
 
-    def add_voting_to_bots(self):
-        """Add voting detection to all bots' autonomous monitoring."""
-        for bot in self.bots:
-            # Add voting detection method to each bot
-            bot.voting_capability = self
-            bot._original_process_new_message = bot._process_new_message
-            bot._process_new_message = self._create_voting_aware_processor(bot)
-            print(f"🗳️ Added voting capability to {bot.name}")
-
-    def _create_voting_aware_processor(self, bot):
-        """Create message processor that detects voting calls."""
-
-        async def voting_aware_process_new_message(message):
-            # First check if this is a voting message
-            if await self._detect_and_handle_voting(message, bot):
-                return  # Bot will handle voting, don't do regular response
-
-            # Otherwise, proceed with normal message processing
-            await bot._original_process_new_message(message)
-
-        return voting_aware_process_new_message
-
-    async def _detect_and_handle_voting(self, message, bot):
-        """Detect if a message is calling for votes and make bot vote."""
-        content_lower = message.content.lower()
-
-        # Voting trigger words
-        voting_triggers = [
-             'cast your vote', 'time to vote',
-            'voting session', 'please vote', 'voting starts',
-            'voting begins', 'vote now', 'cast votes'
-        ]
-
-        # Check if this message is about voting
-        is_voting_message = any(trigger in content_lower for trigger in voting_triggers)
-
-        if not is_voting_message:
-            return False
-
-        # Check if this bot has already voted
-        if bot.name in self.bots_who_voted:
-            print(f"🗳️ {bot.name} already voted, skipping")
-            return True
-
-        print(f"🗳️ {bot.name} detected voting call: '{message.content[:50]}...'")
-
-        # Generate and cast vote
-        await self._make_bot_vote(bot)
-        return True
-
-    async def _make_bot_vote(self, bot):
-        """Make a bot generate and cast their vote."""
-        try:
-            # Wait a random time (1-8 seconds) to make voting feel natural
-            wait_time = random.uniform(1, 8)
-            await asyncio.sleep(wait_time)
-
-            print(f"🗳️ {bot.name} is preparing to vote...")
-
-            # Generate vote using bot's AI
-            vote_result = await self._generate_bot_vote(bot)
-
-            if vote_result:
-                # Mark as voted
-                self.bots_who_voted.add(bot.name)
-
-                # Create voting message
-                vote_message = f"🗳️ I vote: {vote_result['vote'].upper()}\n\nMy reasoning: {vote_result['reasoning']}"
-
-                # Add to chat log
-                await self.chat_log.add_message(bot.name, vote_message)
-
-                print(f"✅ {bot.name} voted: {vote_result['vote']} - {vote_result['reasoning'][:50]}...")
-
-        except Exception as e:
-            print(f"❌ {bot.name} voting error: {e}")
-
-    async def _generate_bot_vote(self, bot):
-        """Generate a vote using the bot's AI provider."""
-        try:
-            # Get recent conversation for context
-            recent_messages = list(self.chat_log.messages)[-10:] if self.chat_log.messages else []
-
-            # Create voting prompt
-            voting_prompt = self._create_voting_prompt(bot, recent_messages)
+    async def run_vote(self, duration):
+        """
+        Ask every bot for a vote at once and announce the result.
 
-            # Generate vote using bot's AI
-            response = await bot.ai_provider.generate_response(voting_prompt, bot.config)
+        All bots share one deadline and the vote closes as soon as every bot
+        has voted.
 
-            # Parse the response to extract vote and reasoning
-            return self._parse_vote_response(response, bot)
+        Args:
+            duration: Seconds the vote stays open at most
 
-        except Exception as e:
-            print(f"❌ Error generating vote for {bot.name}: {e}")
+        Returns:
+            VotingResults, or None if voting is disabled or already running
+        """
+        if not self.voting_system.enabled or self.voting_system.is_active:
             return None
 
-    def _create_voting_prompt(self, bot, recent_messages):
-        """Create a voting prompt for the bot."""
-
-        # Build conversation context
-        context = "\n".join([f"{msg.sender}: {msg.content}" for msg in recent_messages[-8:]])
-
-        messages = [
-            {
-                'role': 'system',
-                'content': f"""You are {bot.name} in a debate about: {self.topic}
-
-Your personality: {bot.config.personality}
-Your initial stance: {bot.config.stance}
-
-VOTING TIME! You must now cast your vote based on the debate discussion.
-
-IMPORTANT VOTING GUIDELINES:
-1. BE OBJECTIVE - Consider all arguments presented, not just your initial stance
-2. Base your vote on the QUALITY and STRENGTH of evidence and reasoning shared
-3. You can change your mind if compelling arguments were made
-4. Stay true to your personality while being fair and analytical
-5. Consider what would truly be best based on the discussion
-
-Your personality influences HOW you evaluate arguments:
-- If analytical: Focus on data and logical reasoning
-- If philosophical: Consider deeper implications and principles  
-- If practical: Think about real-world implementation
-- If diplomatic: Weigh all perspectives fairly
-- If passionate: Consider the human impact and urgency
+        await self.voting_system.start_voting(self.CHOICES, duration,
+                                              voters=[bot.name for bot in self.bots])
+        votes = await self.moderator.collect_bot_votes()
 
-Vote options:
-- YES/FOR: You support the topic after considering the debate
-- NO/AGAINST: You oppose the topic after considering the debate
-- ABSTAIN: Arguments were too close to call or you need more information
+        for name, choice in votes.items():
+            if choice is None:
+                continue
+            self.bots_who_voted.add(name)
+            reasoning = self.voting_system.votes[name].justification
+            vote_message = f"🗳️ I vote: {choice}"
+            if reasoning:
+                vote_message += f"\n\nMy reasoning: {reasoning}"
+            await self.chat_log.add_message(name, vote_message)
+            print(f"✅ {name} voted: {choice}")
 
-RESPOND IN THIS EXACT FORMAT:
-VOTE: [YES/NO/ABSTAIN]
-REASONING: [2-3 sentences explaining your objective assessment based on the debate discussion]
-
-Remember: Vote based on the STRONGEST ARGUMENTS presented, not just your initial position."""
-            },
-            {
-                'role': 'user',
-                'content': f"""Recent debate discussion:
-{context}
-
-Based on this discussion, please cast your objective vote on: {self.topic}
-
-Consider all the evidence and arguments presented. Vote for what you believe is truly best supported by the debate.
-
-Format:
-VOTE: [YES/NO/ABSTAIN]
-REASONING: [Your objective assessment]"""
-            }
-        ]
-
-        return messages
-
-    def _parse_vote_response(self, response, bot):
-        """Parse the bot's vote response."""
-        try:
-            lines = response.strip().split('\n')
-            vote = None
-            reasoning = None
-
-            for line in lines:
-                if line.upper().startswith('VOTE:'):
-                    vote_text = line.split(':', 1)[1].strip().upper()
-                    if 'YES' in vote_text or 'FOR' in vote_text or 'AGREE' in vote_text:
-                        vote = 'YES'
-                    elif 'NO' in vote_text or 'AGAINST' in vote_text or 'DISAGREE' in vote_text:
-                        vote = 'NO'
-                    elif 'ABSTAIN' in vote_text or 'NEUTRAL' in vote_text:
-                        vote = 'ABSTAIN'
-
-                elif line.upper().startswith('REASONING:'):
-                    reasoning = line.split(':', 1)[1].strip()
-
-            # Fallback: try to extract from anywhere in response
-            if not vote:
-                response_upper = response.upper()
-                if any(word in response_upper for word in ['YES', 'FOR', 'AGREE', 'SUPPORT']):
-                    vote = 'YES'
-                elif any(word in response_upper for word in ['NO', 'AGAINST', 'DISAGREE', 'OPPOSE']):
-                    vote = 'NO'
-                else:
-                    vote = 'ABSTAIN'
-
-            if not reasoning:
-                reasoning = f"After objectively considering the debate, this reflects the strongest position based on the evidence presented."
-
-            return {
-                'vote': vote,
-                'reasoning': reasoning
-            }
-
-        except Exception as e:
-            print(f"❌ Error parsing vote for {bot.name}: {e}")
-            # Fallback based on stance but mention objectivity
-            fallback_vote = 'YES' if bot.config.stance == 'pro' else 'NO' if bot.config.stance == 'con' else 'ABSTAIN'
-            return {
-                'vote': fallback_vote,
-                'reasoning': f"Based on my objective analysis of the debate and my {bot.config.stance} perspective."
-            }
+        results = await self.voting_system.end_voting()
+        tally = ", ".join(f"{choice}: {results.vote_counts.get(choice, 0)}" for choice in self.CHOICES)
+        await self.chat_log.add_message("Moderator",
+                                        f"🗳️ Voting closed. {tally}. Result: {results.winner or 'no votes'}")
+        return results
 
 
 async def setup_natural_bot_monitoring(bots, chat_log, web_server, topic):
@@ -421,7 +259,6 @@ class TimeManager:
     async def check_time_interventions(self):
         """Check if moderator should intervene based on config settings."""
         import time
-        import random
 
         current_time = time.time()
         elapsed = self.get_elapsed_time()
@@ -534,7 +371,6 @@ class TimeManager:
 
         # Send the intervention message
         if messages:
-            import random
             message = random.choice(messages)
             await self.chat_log.add_message("Moderator", message, message_type="moderator")
 
@@ -674,9 +510,8 @@ async def run_web_debate():
     print("🎭 AI DebateArena - Natural Conversation Mode with Voting")
     print("=" * 60)
 
-    # Start HTML server in background
-    html_thread = threading.Thread(target=serve_html, daemon=True)
-    html_thread.start()
+    # Serve the web interface from memory on the event loop
+    html_server = await serve_html()
 
     # Load your existing config
     print("📋 Loading configuration...")
@@ -684,9 +519,15 @@ async def run_web_debate():
 
     # Create WebSocket server
     print("🔗 Starting WebSocket server...")
-    web_server = WebServerWithVoting()
+    web_server = WebServerWithVoting(rate_limits=config.get('rate_limits'),
+                                     admission=config.get('admission'))
     await web_server.start_server()
 
+    # Read-only SSE (/events) and long-poll (/poll) viewers on the page server
+    http_stream = HttpStreamEndpoints(web_server)
+    if html_server:
+        http_stream.mount(html_server)
+
     # Create your existing components with integration
     print("🚀 Setting up debate components...")
 
@@ -701,6 +542,12 @@ async def run_web_debate():
     voting_config = config.get('voting', {})
     voting_system = VotingSystem(voting_config)
 
+    # The streaming API, if enabled, is another room on the same port
+    streaming_server = None
+    if config.get('streaming', {}).get('enabled', False):
+        streaming_server = StreamingServer(chat_log, voting_system, config['streaming'])
+        await streaming_server.start(gateway=web_server.gateway, room_id="stream")
+
     # Load API keys from .env file
     from dotenv import load_dotenv
     load_dotenv()
@@ -770,6 +617,7 @@ async def run_web_debate():
 
     # Connect web server to moderator
     web_server.set_moderator(moderator)
+    web_server.set_voting_system(voting_system)
 
     # Create time manager for moderator control
     print("⏰ Setting up intelligent time management...")
@@ -788,14 +636,16 @@ async def run_web_debate():
 
     # Set up bot voting capability
     print("🗳️ Setting up bot voting capabilities...")
-    bot_voting_capability = BotVotingCapability(bots, voting_system, chat_log, web_server, topic)
-    bot_voting_capability.add_voting_to_bots()
+    bot_voting_capability = BotVotingCapability(bots, voting_system, chat_log, web_server, topic,
+                                                moderator)
 
     print("🎯 System ready!")
     print(f"🌐 Open browser to: http://localhost:8080")
     print(f"🔗 WebSocket: ws://localhost:8081")
+    if streaming_server:
+        print(f"📡 Streaming API: ws://localhost:8081/rooms/stream")
     print(f"📝 Topic: {topic}")
-    print(f"🗳️ Bots will automatically vote when voting is called!")
+    print(f"🗳️ Bots will vote together when time is up!")
     print()
 
     # Send initial message
@@ -812,9 +662,9 @@ async def run_web_debate():
             f"👥 Participants:\n" + "\n".join(participant_list) +
             f"\n\n🧠 BOTS ARE NOW ACTIVELY MONITORING!\n"
             f"✨ They will respond naturally when they feel compelled\n"
-            f"🗳️ They will vote when voting is called\n"
+            f"🗳️ They will vote when time is up\n"
             f"💬 Type your message to start the natural debate!\n"
-            f"🔥 Bots check every message and decide autonomously whether to respond or vote"
+            f"🔥 Bots check every message and decide autonomously whether to respond"
     )
 
     await web_server.broadcast_message(
@@ -826,7 +676,7 @@ async def run_web_debate():
     print("🚀 NATURAL CONVERSATION MODE WITH VOTING ACTIVE!")
     print("🤖 All bots are autonomously monitoring the chat log")
     print("💬 They will respond when triggered by your messages")
-    print("🗳️ They will vote when they detect voting calls")
+    print("🗳️ They will vote together when time is up")
     print("🧠 Each message you send triggers real bot decision-making")
     print("🛑 Press Ctrl+C to stop")
 
@@ -856,13 +706,11 @@ async def run_web_debate():
             # Check if debate time is up
             remaining_time = time_manager.get_remaining_time()
 
-            if remaining_time <= 0:
-                await chat_log.add_message("Moderator",
-                                           "⏰ TIME'S UP! Time to vote!cast votes:"
-                                           )
-                print("⏰ TIME'S UP! Time to vote!cast votes:")
-
             if remaining_time <= 30:
+                await chat_log.add_message("Moderator", "⏰ TIME'S UP! Time to vote!")
+                print("⏰ TIME'S UP! Collecting bot votes")
+                await bot_voting_capability.run_vote(voting_system.voting_duration)
+
                 await chat_log.add_message("Moderator",
                                            "⏰ TIME'S UP! The debate has concluded. Thank you all for the fantastic discussion!"
                                            )
@@ -939,7 +787,12 @@ async def run_web_debate():
 
         # Stop web server
         try:
+            if streaming_server:
+                await streaming_server.stop()
+            await http_stream.close()
             await web_server.stop_server()
+            if html_server:
+                await html_server.stop()
         except Exception as e:
             print(f"⚠️ Error stopping web server: {e}")
 
@@ -0,0 +1,150 @@
+"""
+Tests for connection admission control.
+"""
+
+import pytest
+import asyncio
+import json
+from types import SimpleNamespace
+from app.admission import AdmissionController
+from app.spectators import SpectatorRoom
+from app.web_server import DebateWebServer
+
+
+class FakeSocket:
+    """Websocket stand-in that records frames and its close code."""
+
+    def __init__(self, ip: str = "10.0.0.1", path: str = "/"):
+        self.remote_address = (ip, 50000)
+        self.request = SimpleNamespace(path=path)
+        self.sent = []
+        self.close_code = None
+        self.disconnect = asyncio.Event()
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+        self.disconnect.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self.disconnect.wait()
+        raise StopAsyncIteration
+
+
+class TestAdmissionController:
+    """Test caps, rates and load handling."""
+
+    @pytest.mark.asyncio
+    async def test_caps_and_release(self):
+        admission = AdmissionController({'max_clients': 2, 'max_spectators': 1, 'per_ip': 2})
+
+        assert admission.admit("a", "1.1.1.1") is None
+        assert admission.admit("b", "1.1.1.1") is None
+        assert admission.admit("c", "1.1.1.1").reason == 'ip_limit'
+        assert admission.admit("c", "2.2.2.2").reason == 'clients_full'
+        assert admission.admit("s1", "2.2.2.2", spectator=True) is None
+        assert admission.admit("s2", "3.3.3.3", spectator=True).reason == 'spectators_full'
+
+        admission.release("a")
+        admission.release("a")
+        assert admission.admit("c", "2.2.2.2") is None
+        assert admission.get_stats()['clients'] == 2
+        admission.close()
+
+    @pytest.mark.asyncio
+    async def test_no_per_ip_cap_by_default(self):
+        """Test a venue behind one NAT address is not turned away."""
+        admission = AdmissionController({'connect_burst': 200})
+        assert all(admission.admit(i, "203.0.113.7") is None for i in range(150))
+        assert admission.get_stats()['clients'] == 150
+        admission.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_rate(self):
+        admission = AdmissionController({'connect_rate': 1, 'connect_burst': 3})
+        results = [admission.admit(i, f"10.0.0.{i}") for i in range(5)]
+
+        assert results[:3] == [None, None, None]
+        assert results[3].reason == 'connect_rate'
+        assert results[3].retry_after >= 1
+        admission.close()
+
+    @pytest.mark.asyncio
+    async def test_spectators_shed_before_participants(self):
+        shed = []
+        admission = AdmissionController({'sample_interval': 0.01, 'shed_fraction': 0.5},
+                                        on_shed=shed.append)
+        for i in range(4):
+            admission.admit(f"s{i}", f"10.0.0.{i}", spectator=True)
+
+        admission.loop_lag = 1.0
+        assert admission.admit("s9", "10.0.0.9", spectator=True).reason == 'overloaded'
+        # Participants still get in while there are spectators to shed
+        assert admission.admit("p1", "10.0.0.10") is None
+
+        admission.config['max_loop_lag'] = -1
+        await asyncio.sleep(0.03)
+        assert shed and shed[0] == 2
+
+        for i in range(4):
+            admission.release(f"s{i}")
+        assert admission.admit("p2", "10.0.0.11").reason == 'overloaded'
+        admission.close()
+
+
+class TestWebServerAdmission:
+    """Test DebateWebServer turning clients away."""
+
+    @pytest.mark.asyncio
+    async def test_full_server_answers_with_waiting_room(self):
+        server = DebateWebServer(telemetry_tick=0, admission={'max_clients': 1})
+        first = FakeSocket("10.0.0.1")
+        task = asyncio.create_task(server.handle_client(first))
+        await asyncio.sleep(0.01)
+
+        second = FakeSocket("10.0.0.2")
+        await server.handle_client(second)
+        assert second.sent == [{'type': 'waiting_room', 'reason': 'clients_full', 'retry_after': 5.0}]
+        assert second.close_code == 1013
+        assert not any(frame['type'] == 'room_snapshot' for frame in second.sent)
+
+        first.disconnect.set()
+        await task
+        assert server.get_admission_stats()['clients'] == 0
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_failed_join_releases_slot(self, monkeypatch):
+        """Test a client whose join raises does not keep its admission slot."""
+        server = DebateWebServer(telemetry_tick=0, admission={'max_clients': 1})
+
+        def broken_snapshot(include_history=True):
+            raise RuntimeError("snapshot failed")
+        monkeypatch.setattr(server, 'get_room_snapshot', broken_snapshot)
+
+        for ip in ("10.0.0.1", "10.0.0.2"):
+            await server.handle_client(FakeSocket(ip))
+
+        assert server.get_admission_stats()['clients'] == 0
+        assert not server.senders and server.get_client_count() == 0
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_shed_spectators_get_notice(self):
+        room = SpectatorRoom(capacity=8)
+        sockets = [FakeSocket(path="/?spectate=1") for _ in range(3)]
+        tasks = [asyncio.create_task(room.serve(ws)) for ws in sockets]
+        await asyncio.sleep(0.01)
+
+        assert await room.shed(2, '{"type": "waiting_room"}') == 2
+        await asyncio.sleep(0.01)
+
+        assert sum(ws.close_code == 1013 for ws in sockets) == 2
+        assert len(room) == 1 and room.get_stats()['shed'] == 2
+        await room.close()
+        await asyncio.gather(*tasks)
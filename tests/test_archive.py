@@ -0,0 +1,129 @@
+"""
+Tests for compressed transcript archives.
+"""
+
+import pytest
+import time
+from app.archive import (TranscriptArchive, convert_json_transcript, is_archive,
+                         write_archive)
+from app.chat_log import ChatLog, Message
+
+
+@pytest.fixture
+def messages():
+    """Create a batch of messages spread over three senders."""
+    start = time.time()
+    return [
+        Message(f"User{i % 3}", f"Message {i}", start + i, i + 1)
+        for i in range(1000)
+    ]
+
+
+@pytest.fixture
+def archive_path(messages, tmp_path):
+    """Write the messages to an archive with small blocks."""
+    path = tmp_path / "debate.dbarc"
+    with open(path, 'wb') as f:
+        write_archive(f, messages, statistics={'total_messages': 1000},
+                      metadata={'topic': 'AI'}, block_size=100)
+    return path
+
+
+class TestTranscriptArchive:
+    """Test suite for archive writing and reading."""
+
+    def test_stats_without_decompressing(self, archive_path):
+        """Test statistics come from the header and index only."""
+        with TranscriptArchive(str(archive_path)) as archive:
+            stats = archive.stats()
+
+            assert archive._cache == {}
+            assert len(archive.blocks) == 10
+            assert stats['total_messages'] == 1000
+            assert stats['archived_messages'] == 1000
+            assert stats['archived_by_sender'] == {'User0': 334, 'User1': 333, 'User2': 333}
+            assert stats['first_message_id'] == 1
+            assert stats['last_message_id'] == 1000
+            assert archive.metadata['topic'] == 'AI'
+
+    def test_get_range_reads_only_needed_blocks(self, archive_path):
+        """Test a range read touches only overlapping blocks."""
+        with TranscriptArchive(str(archive_path)) as archive:
+            result = archive.get_range(250, 260)
+
+            assert [m.message_id for m in result] == list(range(250, 261))
+            assert result[0].content == "Message 249"
+            assert list(archive._cache) == [2]
+
+    def test_get_range_spanning_blocks(self, archive_path):
+        """Test a range across block boundaries and to the end."""
+        with TranscriptArchive(str(archive_path)) as archive:
+            assert [m.message_id for m in archive.get_range(95, 105)] == list(range(95, 106))
+            assert len(archive.get_range(990)) == 11
+
+    def test_get_time_range(self, archive_path, messages):
+        """Test time range reads use the timestamp index."""
+        start = messages[0].timestamp
+        with TranscriptArchive(str(archive_path)) as archive:
+            result = archive.get_time_range(start + 10, start + 19)
+
+            assert [m.message_id for m in result] == list(range(11, 21))
+
+    def test_by_sender(self, archive_path):
+        """Test reading one sender's messages."""
+        with TranscriptArchive(str(archive_path)) as archive:
+            result = archive.by_sender("User1")
+
+            assert len(result) == 333
+            assert all(m.sender == "User1" for m in result)
+            assert archive.by_sender("Nobody") == []
+
+    def test_lzma_codec(self, messages, tmp_path):
+        """Test the lzma codec round-trips."""
+        path = tmp_path / "debate.dbarc"
+        with open(path, 'wb') as f:
+            write_archive(f, messages, codec="lzma")
+
+        with TranscriptArchive(str(path)) as archive:
+            assert [m.content for m in archive.iter_messages()] == [m.content for m in messages]
+
+    def test_rejects_non_archive(self, tmp_path):
+        """Test opening a non-archive file fails clearly."""
+        path = tmp_path / "plain.json"
+        path.write_text("{}")
+
+        assert not is_archive(str(path))
+        with pytest.raises(ValueError):
+            TranscriptArchive(str(path))
+
+    @pytest.mark.asyncio
+    async def test_convert_json_transcript(self, tmp_path):
+        """Test converting a saved JSON transcript."""
+        chat_log = ChatLog()
+        for i in range(20):
+            await chat_log.add_message("Alice" if i % 2 else "Bob", f"Message {i}",
+                                       metadata={'n': i})
+
+        source = tmp_path / "debate.json"
+        await chat_log.save_transcript(str(source))
+        destination = convert_json_transcript(str(source))
+
+        assert destination.suffix == ".dbarc"
+        assert is_archive(str(destination))
+        with TranscriptArchive(str(destination)) as archive:
+            assert archive.stats()['total_messages'] == 20
+            assert archive.get_range(3, 3)[0].metadata == {'n': 2}
+            assert len(archive.by_sender("Alice")) == 10
+
+    @pytest.mark.asyncio
+    async def test_save_transcript_archive_format(self, tmp_path):
+        """Test ChatLog saves archives directly."""
+        chat_log = ChatLog()
+        for i in range(5):
+            await chat_log.add_message("Alice", f"Message {i}")
+
+        path = tmp_path / "debate.dbarc"
+        assert await chat_log.save_transcript(str(path), "archive") == 5
+
+        with TranscriptArchive(str(path)) as archive:
+            assert len(archive) == 5
@@ -0,0 +1,213 @@
+"""
+Tests for the cross-process message bus.
+"""
+
+import pytest
+import asyncio
+import time
+from app.bus import BusBroker, InProcessBus, MessageBus, RemoteBus, create_bus, parse_address
+from app.chat_log import ChatLog, Message
+
+
+def make_message(message_id: int) -> Message:
+    return Message("Alice", f"Message {message_id}", time.time(), message_id)
+
+
+async def drain(queue, count: int):
+    """Read ``count`` messages from a queue."""
+    return [await asyncio.wait_for(queue.get(), 1) for _ in range(count)]
+
+
+class TestParseAddress:
+    """Test bus address parsing."""
+
+    def test_addresses(self):
+        assert parse_address("tcp://127.0.0.1:7400") == ('tcp', ('127.0.0.1', 7400))
+        assert parse_address("localhost:7400") == ('tcp', ('localhost', 7400))
+        assert parse_address("unix:///tmp/bus.sock") == ('unix', '/tmp/bus.sock')
+        assert parse_address("/tmp/bus.sock") == ('unix', '/tmp/bus.sock')
+        with pytest.raises(ValueError):
+            parse_address("nowhere")
+
+    def test_create_bus(self):
+        assert create_bus({}) is None
+        assert isinstance(create_bus({'backend': 'memory'}), InProcessBus)
+        with pytest.raises(ValueError):
+            create_bus({'backend': 'carrier-pigeon'})
+
+
+class TestInProcessBus:
+    """Test in-process fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_ordering_and_duplicates(self):
+        """Test subscribers get each message once, in message_id order."""
+        bus = InProcessBus()
+        queue = await bus.subscribe("debate")
+
+        for message_id in (1, 2, 2, 1, 3):
+            await bus.publish("debate", make_message(message_id))
+
+        assert [m.message_id for m in await drain(queue, 3)] == [1, 2, 3]
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_resume_from_backlog(self):
+        """Test a late subscriber replays the backlog after its cursor."""
+        bus = InProcessBus(backlog_size=3)
+        for message_id in range(1, 6):
+            await bus.publish("debate", make_message(message_id))
+
+        queue = await bus.subscribe("debate", after_message_id=3)
+        await bus.publish("debate", make_message(6))
+        assert [m.message_id for m in await drain(queue, 3)] == [4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_chat_log_replica(self):
+        """Test a following ChatLog mirrors the publisher."""
+        bus = InProcessBus()
+        origin = ChatLog(bus=bus)
+        await origin.add_message("Alice", "Before the replica")
+
+        replica = ChatLog(debate_id=origin.debate_id)
+        follower = replica.subscribe()
+        task = asyncio.create_task(replica.follow(bus))
+        await asyncio.sleep(0)
+
+        await origin.add_message("Bob", "After the replica")
+        await drain(follower, 2)
+
+        assert [m.content for m in replica.messages] == ["Before the replica", "After the replica"]
+        assert replica.message_counter == 2
+        assert replica.get_statistics()['total_messages'] == 2
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert not bus.subscribers[origin.debate_id]
+
+
+class TestBroker:
+    """Test the standalone broker and its client."""
+
+    @pytest.mark.asyncio
+    async def test_followers_share_one_order(self, tmp_path):
+        """Test two followers over a Unix socket see the same sequence."""
+        address = f"unix://{tmp_path / 'bus.sock'}"
+        broker = BusBroker()
+        await broker.start(address)
+
+        publisher = RemoteBus(address)
+        followers = [RemoteBus(address), RemoteBus(address)]
+        try:
+            queues = [await follower.subscribe("debate") for follower in followers]
+
+            for message_id in (1, 2, 3, 2, 4):
+                await publisher.publish("debate", make_message(message_id))
+
+            for queue in queues:
+                assert [m.message_id for m in await drain(queue, 4)] == [1, 2, 3, 4]
+            assert broker.get_stats()['messages_dropped'] == 1
+
+            # A late follower over TCP-style resume gets the backlog after its cursor
+            late = RemoteBus(address)
+            followers.append(late)
+            queue = await late.subscribe("debate", after_message_id=2)
+            assert [m.content for m in await drain(queue, 2)] == ["Message 3", "Message 4"]
+        finally:
+            for bus in [publisher, *followers]:
+                await bus.close()
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_resumes_from_cursor(self):
+        """Test a follower that loses the broker catches up after reconnecting."""
+        broker = BusBroker()
+        server = await broker.start("tcp://127.0.0.1:0")
+        port = server.sockets[0].getsockname()[1]
+        address = f"tcp://127.0.0.1:{port}"
+
+        publisher = RemoteBus(address)
+        follower = RemoteBus(address, reconnect_delay=0.01)
+        try:
+            queue = await follower.subscribe("debate")
+            await publisher.publish("debate", make_message(1))
+            assert [m.message_id for m in await drain(queue, 1)] == [1]
+
+            # Drop the follower's connection on the broker side
+            for connection in list(broker.connections):
+                if "debate" in connection.topics:
+                    connection.writer.close()
+            await asyncio.sleep(0.05)
+
+            await publisher.publish("debate", make_message(2))
+            await publisher.publish("debate", make_message(3))
+            assert [m.message_id for m in await drain(queue, 2)] == [2, 3]
+        finally:
+            await publisher.close()
+            await follower.close()
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_publish_does_not_wait_for_the_broker(self, tmp_path):
+        """Test publishing while the broker is down queues instead of blocking."""
+        address = f"unix://{tmp_path / 'bus.sock'}"
+        chat_log = ChatLog(bus=RemoteBus(address, reconnect_delay=0.01), debate_id="debate")
+        broker = BusBroker()
+        follower = RemoteBus(address)
+        try:
+            for i in range(3):
+                await asyncio.wait_for(chat_log.add_message("Alice", f"Message {i}"), 0.1)
+            assert chat_log.bus.get_stats()['outbox'] == 3
+            assert not chat_log.bus.connected
+
+            # One writer task delivers the outbox once the broker is up
+            await broker.start(address)
+            queue = await follower.subscribe("debate", after_message_id=0)
+            assert [m.content for m in await drain(queue, 3)] == [
+                "Message 0", "Message 1", "Message 2"]
+            assert chat_log.bus.get_stats()['outbox'] == 0
+        finally:
+            await chat_log.bus.close()
+            await follower.close()
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_subscribes_share_one_ack(self, tmp_path):
+        """Test two subscribes to one topic while disconnected both complete."""
+        address = f"unix://{tmp_path / 'bus.sock'}"
+        broker = BusBroker()
+        await broker.start(address)
+
+        publisher = RemoteBus(address)
+        follower = RemoteBus(address, connect_timeout=1.0)
+        try:
+            queues = await asyncio.wait_for(asyncio.gather(
+                follower.subscribe("debate"), follower.subscribe("debate")), 2)
+            await publisher.publish("debate", make_message(1))
+            for queue in queues:
+                assert [m.message_id for m in await drain(queue, 1)] == [1]
+            assert not follower._pending_acks
+        finally:
+            await publisher.close()
+            await follower.close()
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_subscribe_times_out_without_ack(self, tmp_path):
+        """Test a subscribe the broker never acknowledges fails instead of hanging."""
+        address = f"unix://{tmp_path / 'silent.sock'}"
+        server = await asyncio.start_unix_server(lambda reader, writer: None,
+                                                 str(tmp_path / 'silent.sock'))
+        follower = RemoteBus(address, connect_timeout=0.05)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await follower.subscribe("debate")
+            assert not follower.subscribers and not follower._pending_acks.get("debate")
+        finally:
+            await follower.close()
+            server.close()
+
+    def test_bus_interface_is_abstract(self):
+        """Test a bus must implement publish and subscribe."""
+        with pytest.raises(TypeError):
+            MessageBus()
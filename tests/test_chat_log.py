@@ -5,6 +5,8 @@ Tests for the ChatLog class.
 import pytest
 import asyncio
 import json
+import pickle
+import sys
 import time
 from pathlib import Path
 from unittest.mock import patch, mock_open
@@ -88,6 +90,62 @@ class TestMessage:
         assert msg.content == "Test message"
         assert msg.message_id == 5
 
+    def test_compact_layout(self):
+        """Test messages are slotted with interned sender and type."""
+        msg = Message("".join(["Ali", "ce"]), "Test", time.time(), 1, "".join(["ch", "at"]))
+
+        assert not hasattr(msg, "__dict__")
+        assert msg.sender is sys.intern("Alice")
+        assert msg.message_type is sys.intern("chat")
+
+    def test_lazy_metadata(self):
+        """Test metadata is only allocated when accessed."""
+        msg = Message("Alice", "Test", time.time(), 1)
+
+        assert not msg.has_metadata
+        assert msg._metadata is None
+        msg.metadata["key"] = "value"
+        assert msg.has_metadata
+        assert msg.to_dict()["metadata"] == {"key": "value"}
+
+    def test_to_dict_does_not_share_metadata(self):
+        """Test to_dict copies metadata instead of returning the live dict."""
+        msg = Message("Alice", "Test", time.time(), 1, metadata={"a": 1})
+        msg.to_dict()["metadata"]["a"] = 2
+
+        assert msg.metadata == {"a": 1}
+
+    def test_to_wire(self):
+        """Test compact wire encoding."""
+        msg = Message("Alice", "Hé", 1640995200.0, 7)
+        wire = json.loads(msg.to_wire())
+
+        assert wire == {"sender": "Alice", "content": "Hé", "timestamp": 1640995200.0,
+                        "message_id": 7, "message_type": "chat"}
+
+    def test_frozen_message(self):
+        """Test frozen messages reject assignment and stay equal to the original."""
+        msg = Message("Alice", "Test", time.time(), 1)
+        frozen = msg.freeze()
+
+        assert frozen == msg
+        assert hash(frozen) == hash(msg.freeze())
+        with pytest.raises(AttributeError):
+            frozen.content = "changed"
+
+    def test_frozen_message_metadata_is_a_read_only_copy(self):
+        """Test frozen metadata neither follows nor allows changes."""
+        msg = Message("Alice", "Test", time.time(), 1, metadata={'round': 1})
+        frozen = msg.freeze()
+        msg.metadata['round'] = 2
+
+        assert frozen.metadata == {'round': 1}
+        with pytest.raises(TypeError):
+            frozen.metadata['round'] = 3
+        assert json.loads(frozen.to_wire())['metadata'] == {'round': 1}
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+        assert Message("Bob", "Hi", time.time(), 2).freeze().metadata == {}
+
 
 class TestChatLog:
     """Test suite for ChatLog class."""
@@ -181,6 +239,102 @@ class TestChatLog:
 
         assert msg1.content == msg2.content == "Broadcast message"
 
+    @pytest.mark.asyncio
+    async def test_subscribe_with_cursor_replays_then_goes_live(self, chat_log):
+        """Test resuming a subscription from a message_id cursor."""
+        for i in range(4):
+            await chat_log.add_message("Alice", f"Message {i}")
+
+        queue = chat_log.subscribe(after_message_id=2)
+        await chat_log.add_message("Bob", "Live message")
+
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert [m.message_id for m in received] == [3, 4, 5]
+        assert received[-1].content == "Live message"
+
+    @pytest.mark.asyncio
+    async def test_subscribe_replay_has_no_duplicates(self, chat_log):
+        """Test a message replayed on subscribe is not delivered again live."""
+        await chat_log.add_message("Alice", "First")
+
+        # Simulate a subscriber joining after a message is stored but before
+        # subscribers are notified of it
+        chat_log.message_counter += 1
+        pending = Message("Bob", "Pending", time.time(), chat_log.message_counter)
+        chat_log.messages.append(pending)
+
+        queue = chat_log.subscribe(after_message_id=0)
+        await chat_log._notify_subscribers(pending)
+
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert [m.message_id for m in received] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_subscribe_with_stale_cursor_replays_whole_log(self, chat_log):
+        """Test a cursor from before a clear() does not hide new messages."""
+        for i in range(5):
+            await chat_log.add_message("Alice", f"Old {i}")
+        chat_log.clear()
+        await chat_log.add_message("Bob", "New")
+
+        queue = chat_log.subscribe(after_message_id=5)
+        await chat_log.add_message("Bob", "Live")
+
+        received = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert [m.content for m in received] == ["New", "Live"]
+
+    @pytest.mark.asyncio
+    async def test_subscribe_without_cursor_is_live_only(self, chat_log):
+        """Test a plain subscription does not receive earlier messages."""
+        await chat_log.add_message("Alice", "Before")
+        queue = chat_log.subscribe()
+
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_get_messages_after(self, chat_log):
+        """Test reading messages after a cursor."""
+        for i in range(5):
+            await chat_log.add_message("Alice", f"Message {i}")
+
+        assert [m.message_id for m in chat_log.get_messages_after(3)] == [4, 5]
+        assert [m.message_id for m in chat_log.get_messages_after(0, limit=2)] == [1, 2]
+        assert chat_log.get_messages_after(5) == []
+
+    @pytest.mark.asyncio
+    async def test_evicted_messages_spill_to_cold_storage(self, tmp_path):
+        """Test messages evicted from the ring stay readable from disk."""
+        chat_log = ChatLog(max_messages=3, cold_storage_dir=str(tmp_path))
+
+        for i in range(10):
+            await chat_log.add_message("Alice" if i % 2 else "Bob", f"Message {i}")
+
+        assert len(chat_log.messages) == 3
+        assert len(chat_log.cold_storage) == 7
+        assert [m.message_id for m in chat_log.get_messages()] == list(range(1, 11))
+        assert [m.message_id for m in chat_log.get_messages_after(2, limit=3)] == [3, 4, 5]
+        assert [m.message_id for m in chat_log.get_messages(sender="Bob", limit=2)] == [7, 9]
+        assert len(chat_log.search_messages("Message")) == 10
+        assert chat_log.get_statistics()['archived_messages'] == 7
+
+        output_file = tmp_path / "transcript.json"
+        assert await chat_log.save_transcript(str(output_file)) == 10
+
+        chat_log.clear()
+        assert chat_log.cold_storage is None
+        assert chat_log.get_messages() == []
+
+    @pytest.mark.asyncio
+    async def test_spill_to_disk_disabled(self):
+        """Test the ring drops evicted messages when spilling is off."""
+        chat_log = ChatLog(max_messages=3, spill_to_disk=False)
+
+        for i in range(5):
+            await chat_log.add_message("User", f"Message {i}")
+
+        assert chat_log.cold_storage is None
+        assert [m.message_id for m in chat_log.get_messages()] == [3, 4, 5]
+
     def test_unsubscribe(self, chat_log):
         """Test unsubscribing from messages."""
         queue = chat_log.subscribe()
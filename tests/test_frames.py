@@ -0,0 +1,109 @@
+"""
+Tests for encode-once websocket frames.
+"""
+
+import pytest
+import json
+import time
+from app import frames
+from app.chat_log import ChatLog, Message
+from app.frames import FrameCache, encode_frame
+from app.streaming import StreamingClient, StreamingServer
+from app.voting import VotingSystem
+
+
+class RecordingWebSocket:
+    """Websocket stand-in that records sent frames."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(frame)
+
+
+@pytest.fixture(params=sorted(frames.JSON_BACKENDS))
+def backend(request):
+    """Run a test with each available JSON backend."""
+    previous = frames.get_json_backend()
+    frames.set_json_backend(request.param)
+    yield request.param
+    frames.set_json_backend(previous)
+
+
+class TestFrameCache:
+    """Test suite for FrameCache."""
+
+    def test_encode_frame_round_trips(self, backend):
+        """Test both backends produce equivalent JSON."""
+        data = {'type': 'vote_update', 'data': {'vote_counts': {'Alice': 2}, 'é': 1.5}}
+        assert json.loads(encode_frame(data)) == data
+
+    def test_message_frame_is_encoded_once(self, backend):
+        """Test the same frame object is reused for a message."""
+        cache = FrameCache()
+        message = Message("Alice", "Hello", time.time(), 1, "chat", {'n': 1})
+
+        first = cache.message_frame(message)
+        second = cache.message_frame(message)
+
+        assert first is second
+        assert json.loads(first) == {'type': 'message', 'data': message.to_dict()}
+        assert cache.hits == 1
+
+    def test_history_reuses_message_encodings(self, backend):
+        """Test history frames are built from cached message encodings."""
+        cache = FrameCache()
+        messages = [Message("Alice", f"Message {i}", time.time(), i + 1) for i in range(3)]
+        for message in messages:
+            cache.message_frame(message)
+        misses = cache.misses
+
+        history = json.loads(cache.history_frame(messages, 3))
+
+        assert cache.misses == misses
+        assert history == {'type': 'history',
+                           'data': [m.to_dict() for m in messages],
+                           'last_message_id': 3}
+
+    def test_reused_message_id_is_not_stale(self):
+        """Test a restarted chat log never gets an old frame."""
+        cache = FrameCache()
+        old = Message("Alice", "Old", 1.0, 1)
+        new = Message("Bob", "New", 2.0, 1)
+
+        cache.message_frame(old)
+        assert json.loads(cache.message_frame(new))['data']['content'] == "New"
+
+    def test_cache_is_bounded(self):
+        """Test least recently used frames are evicted."""
+        cache = FrameCache(maxsize=4)
+        for i in range(10):
+            cache.get('vote', i, lambda: {'n': i})
+        assert len(cache) == 4
+
+    def test_unknown_backend(self):
+        """Test selecting a missing backend fails."""
+        with pytest.raises(ValueError):
+            frames.set_json_backend('simdjson')
+
+
+class TestStreamingBroadcast:
+    """Test StreamingServer sends one shared frame."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_one_frame(self):
+        """Test every client receives the identical encoded frame."""
+        server = StreamingServer(ChatLog(), VotingSystem({}), {})
+        sockets = [RecordingWebSocket() for _ in range(5)]
+        for i, websocket in enumerate(sockets):
+            server._register_client(StreamingClient(websocket, str(i), time.time()))
+
+        message = Message("Alice", "Hello", time.time(), 1)
+        await server._broadcast_message(message)
+
+        frames_sent = [websocket.sent[0] for websocket in sockets]
+        assert all(frame is frames_sent[0] for frame in frames_sent)
+        assert json.loads(frames_sent[0])['data']['message_id'] == 1
@@ -0,0 +1,140 @@
+"""
+Tests for the single-port realtime gateway and channel index.
+"""
+
+import pytest
+import asyncio
+import json
+import websockets
+from app.chat_log import ChatLog
+from app.gateway import ChannelIndex, RealtimeGateway
+from app.streaming import StreamingServer
+from app.voting import VotingSystem
+from app.web_server import DebateWebServer
+
+
+class TestChannelIndex:
+    """Test per-channel subscriber indexes."""
+
+    def test_clients_start_on_every_channel(self):
+        """Test a new client receives every channel."""
+        index = ChannelIndex()
+        index.add("a")
+        assert index.recipients('chat') == ["a"]
+        assert index.recipients('votes') == ["a"]
+        assert index.get_channels("a") == ['chat', 'votes', 'bot_activity', 'stats']
+
+    def test_subscribe_narrows_recipients(self):
+        """Test subscribing limits a client to its channels."""
+        index = ChannelIndex()
+        index.add("a")
+        index.add("b")
+
+        assert index.subscribe("b", ['votes', 'nonsense']) == ['votes']
+        assert sorted(index.recipients('chat')) == ["a"]
+        assert sorted(index.recipients('votes')) == ["a", "b"]
+        assert sorted(index.recipients('chat', 'votes')) == ["a", "b"]
+        assert index.get_stats() == {'chat': 1, 'votes': 2, 'bot_activity': 1, 'stats': 1}
+
+        # An empty subscription restores every channel
+        index.subscribe("b", [])
+        assert sorted(index.recipients('chat')) == ["a", "b"]
+
+        index.remove("a")
+        index.remove("b")
+        assert len(index) == 0
+        assert index.recipients('chat') == []
+
+    def test_shared_broad_set(self):
+        """Test the broad set can be the owner's own client set."""
+        clients = set()
+        index = ChannelIndex(clients)
+        clients.add("a")
+        assert "a" in index
+        assert index.recipients('stats') == ["a"]
+
+
+class TestRealtimeGateway:
+    """Test routing rooms on one port."""
+
+    def test_resolve_room(self):
+        """Test rooms are found by path, /rooms/ prefix or query."""
+        gateway = RealtimeGateway()
+
+        async def handler(websocket):
+            pass
+
+        gateway.add_room("debate", handler)
+        gateway.add_room("stream", handler)
+
+        assert gateway.resolve_room("/") == "debate"
+        assert gateway.resolve_room("/?after=5") == "debate"
+        assert gateway.resolve_room("/stream") == "stream"
+        assert gateway.resolve_room("/rooms/stream?after=3") == "stream"
+        assert gateway.resolve_room("/?room=stream") == "stream"
+        assert gateway.resolve_room("/missing") is None
+
+        with pytest.raises(ValueError):
+            gateway.add_room("debate", handler)
+
+    @pytest.mark.asyncio
+    async def test_web_and_streaming_rooms_share_a_port(self):
+        """Test both websocket schemas are served from one listener."""
+        gateway = RealtimeGateway(port=0)
+        web_server = DebateWebServer(telemetry_tick=0)
+        await web_server.start_server(gateway=gateway, room_id="debate")
+        streaming = StreamingServer(ChatLog(), VotingSystem({}), {})
+        await streaming.start(gateway=gateway, room_id="stream")
+        await gateway.start()
+        port = gateway.server.sockets[0].getsockname()[1]
+
+        try:
+            async with websockets.connect(f"ws://localhost:{port}/") as web_client:
+                frame = json.loads(await asyncio.wait_for(web_client.recv(), 1))
+                assert frame['type'] == 'room_snapshot'
+
+                async with websockets.connect(f"ws://localhost:{port}/rooms/stream") as stream_client:
+                    frame = json.loads(await asyncio.wait_for(stream_client.recv(), 1))
+                    assert frame['type'] == 'welcome'
+
+                    stats = gateway.get_stats()
+                    assert stats['rooms']['debate']['connections'] == 1
+                    assert stats['rooms']['stream']['connections'] == 1
+
+            async with websockets.connect(f"ws://localhost:{port}/missing") as lost_client:
+                with pytest.raises(websockets.exceptions.ConnectionClosed):
+                    await asyncio.wait_for(lost_client.recv(), 1)
+            assert gateway.get_stats()['rejected_connections'] == 1
+        finally:
+            await streaming.stop()
+            await web_server.stop_server()
+            await gateway.stop()
+
+    @pytest.mark.asyncio
+    async def test_web_server_broadcasts_by_channel(self):
+        """Test subscribed web clients only get their channels."""
+        web_server = DebateWebServer(telemetry_tick=0)
+        sent = {'all': [], 'votes': []}
+
+        class Socket:
+            remote_address = ("127.0.0.1", 0)
+
+            def __init__(self, name):
+                self.name = name
+
+            async def send(self, frame):
+                sent[self.name].append(json.loads(frame)['type'])
+
+        everything, votes_only = Socket('all'), Socket('votes')
+        web_server.channels.add(everything)
+        web_server.channels.add(votes_only)
+        await web_server.handle_message(votes_only, json.dumps({'type': 'subscribe', 'channels': ['votes']}))
+
+        await web_server.broadcast_message("Alice", "Hello")
+        await web_server.broadcast_to_all({'type': 'vote_update', 'data': {}})
+        await asyncio.sleep(0.01)
+
+        assert sent['all'] == ['message', 'vote_update']
+        assert sent['votes'] == ['subscribed', 'vote_update']
+        assert web_server.get_client_count() == 2
+        await web_server.stop_server()
@@ -0,0 +1,192 @@
+"""
+Tests for the SSE and long-poll transports.
+"""
+
+import pytest
+import pytest_asyncio
+import asyncio
+import json
+from app.chat_log import ChatLog
+from app.http_stream import HttpStreamEndpoints, frame_cursor
+from app.static_server import StaticFileServer
+from app.web_server import DebateWebServer
+
+
+@pytest_asyncio.fixture
+async def stack(tmp_path):
+    """Web server with a chat log, served over HTTP on a free port."""
+    (tmp_path / "index.html").write_text("<html></html>")
+    web_server = DebateWebServer(telemetry_tick=0)
+    chat_log = ChatLog()
+    chat_log.set_web_server(web_server)
+    web_server.set_chat_log(chat_log)
+
+    http_server = StaticFileServer(tmp_path, host="127.0.0.1", port=0)
+    endpoints = HttpStreamEndpoints(web_server, poll_timeout=0.2, heartbeat=0.1)
+    endpoints.mount(http_server)
+    listener = await http_server.start()
+    port = listener.sockets[0].getsockname()[1]
+
+    yield web_server, chat_log, endpoints, port
+
+    await endpoints.close()
+    await http_server.stop()
+
+
+async def open_events(port: int, query: str = "", headers: str = ""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /events{query} HTTP/1.1\r\nHost: x\r\n{headers}\r\n".encode())
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    assert head.startswith("HTTP/1.1 200 OK")
+    assert "text/event-stream" in head
+    return reader, writer
+
+
+async def next_event(reader):
+    """Read the next SSE event that carries data, as (id, frame)."""
+    while True:
+        block = (await asyncio.wait_for(reader.readuntil(b"\n\n"), 1)).decode()
+        fields = dict(line.split(": ", 1) for line in block.strip().split("\n")
+                      if not line.startswith(":") and ": " in line)
+        if 'data' in fields:
+            return fields.get('id'), fields['data']
+
+
+async def poll(port: int, query: str):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /poll{query} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n".encode())
+    response = await asyncio.wait_for(reader.read(), 2)
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), json.loads(body) if body else None
+
+
+class TestFrameCursor:
+    """Test reading cursors without parsing."""
+
+    def test_cursors(self):
+        assert frame_cursor('{"type":"message","sender":"A","message_id":7}') == 7
+        assert frame_cursor('{"type": "message", "content": "x", "message_id": 12}') == 12
+        assert frame_cursor('{"type":"room_snapshot","messages":[{"message_id":1}],'
+                            '"last_message_id":3}') == 3
+        assert frame_cursor('{"type":"telemetry","activity":[]}') is None
+        assert frame_cursor('not json') is None
+
+
+class TestServerSentEvents:
+    """Test the event stream."""
+
+    @pytest.mark.asyncio
+    async def test_stream_shares_frames_and_resumes(self, stack):
+        """Test SSE viewers get the websocket frames, encoded once, with ids to resume from."""
+        web_server, chat_log, endpoints, port = stack
+        await chat_log.add_message("Alice", "Before anyone joined")
+
+        viewers = [await open_events(port), await open_events(port)]
+        for reader, _ in viewers:
+            event_id, data = await next_event(reader)
+            assert event_id == "1"
+            assert json.loads(data)['type'] == 'room_snapshot'
+
+        await chat_log.add_message("Bob", "Live")
+        for reader, _ in viewers:
+            event_id, data = await next_event(reader)
+            frame = json.loads(data)
+            assert event_id == "2"
+            assert (frame['type'], frame['content']) == ('message', "Live")
+        assert endpoints.get_stats()['sse_cache_hits'] >= 2
+        assert endpoints.get_stats()['sse_encodes'] == 2
+
+        for _, writer in viewers:
+            writer.close()
+        await chat_log.add_message("Bob", "Missed")
+
+        # A reconnect resumes from Last-Event-ID
+        reader, writer = await open_events(port, headers="Last-Event-ID: 2\r\n")
+        _, snapshot = await next_event(reader)
+        assert json.loads(snapshot)['messages'] == []
+        _, history = await next_event(reader)
+        assert [m['content'] for m in json.loads(history)['messages']] == ["Missed"]
+        writer.close()
+
+        await asyncio.sleep(0.2)
+        assert web_server.get_client_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_client_bytes_are_discarded(self, stack):
+        """Test bytes an SSE client sends are read and dropped, and EOF still ends the stream."""
+        web_server, _, endpoints, port = stack
+        reader, writer = await open_events(port)
+        await next_event(reader)
+
+        writer.write(b"x" * 200_000)
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        assert web_server.get_client_count() == 1
+
+        writer.close()
+        await asyncio.sleep(0.05)
+        assert web_server.get_client_count() == 0
+        assert web_server.get_admission_stats()['clients'] == 0
+
+
+class TestFailedJoin:
+    """Test a join that raises releases everything it took."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/events", "/poll"])
+    async def test_failed_join_is_released(self, stack, monkeypatch, path):
+        web_server, _, endpoints, port = stack
+
+        def broken_snapshot(include_history=True):
+            raise RuntimeError("snapshot failed")
+        monkeypatch.setattr(web_server, 'get_room_snapshot', broken_snapshot)
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+        await asyncio.wait_for(reader.read(), 1)
+        writer.close()
+        await asyncio.sleep(0.01)
+
+        assert web_server.get_client_count() == 0
+        assert web_server.get_admission_stats()['clients'] == 0
+        assert not web_server.senders and not endpoints.sessions and not endpoints.sse_clients
+
+
+class TestLongPoll:
+    """Test the long-poll fallback."""
+
+    @pytest.mark.asyncio
+    async def test_session_batches(self, stack):
+        web_server, chat_log, endpoints, port = stack
+
+        status, body = await poll(port, "?channels=chat")
+        assert status == 200
+        session = body['session']
+        assert [frame['type'] for frame in body['frames']] == ['room_snapshot']
+
+        await chat_log.add_message("Alice", "One")
+        await chat_log.add_message("Alice", "Two")
+        await web_server.broadcast_stats({'phase': 'debate'})  # not subscribed
+
+        status, body = await poll(port, f"?session={session}")
+        assert [frame['content'] for frame in body['frames']] == ["One", "Two"]
+
+        # Nothing new: the request waits out the poll timeout
+        status, body = await poll(port, f"?session={session}")
+        assert status == 200 and body['frames'] == []
+
+        status, body = await poll(port, "?session=unknown")
+        assert status == 410 and body['type'] == 'session_expired'
+
+    @pytest.mark.asyncio
+    async def test_idle_session_expires(self, stack):
+        web_server, _, endpoints, port = stack
+        endpoints.session_timeout = 0.05
+
+        await poll(port, "")
+        assert web_server.get_client_count() == 1
+        await asyncio.sleep(0.2)
+
+        assert web_server.get_client_count() == 0
+        assert endpoints.get_stats()['sessions_expired'] == 1
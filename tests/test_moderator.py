@@ -269,4 +269,32 @@ async def test_moderator_message_validation(moderator):
     # Should have been truncated
     messages = moderator.chat_log.get_messages()
     last_message = messages[-1]
-    assert len(last_message.content) <= 503  # 500 + "..."
\ No newline at end of file
+    assert len(last_message.content) <= 503  # 500 + "..."
+
+@pytest.mark.asyncio
+async def test_voting_phase_collects_bot_votes_and_closes_early():
+    """Test bots vote concurrently and the phase ends once everyone voted."""
+    class FakeProvider:
+        def __init__(self, response):
+            self.response = response
+
+        async def generate_response(self, messages, config):
+            await asyncio.sleep(0.05)
+            return self.response
+
+    bots = []
+    for name, vote in (("Socrates", "Plato"), ("Plato", "Socrates")):
+        bot = BotClient(name, "gpt-4", "openai", "philosophical", "neutral", api_key="test")
+        bot.ai_provider = FakeProvider(f'{{"vote": "{vote}", "reasoning": "Sound logic."}}')
+        bots.append(bot)
+
+    voting_system = VotingSystem({'enabled': True, 'require_justification': True})
+    moderator = Moderator("Test topic", bots, ChatLog(), voting_system,
+                          {'voting_duration': 30, 'api_keys': {'openai': 'test'}})
+
+    start = asyncio.get_running_loop().time()
+    results = await moderator._voting_phase()
+
+    assert asyncio.get_running_loop().time() - start < 1
+    assert results.vote_counts == {'Plato': 1, 'Socrates': 1}
+    assert results.votes_by_voter['Socrates'].justification == "Sound logic."
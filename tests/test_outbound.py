@@ -0,0 +1,156 @@
+"""
+Tests for per-client outbound queues.
+"""
+
+import pytest
+import asyncio
+import json
+from app.outbound import ClientSender, SLOW_CONSUMER_CLOSE_CODE
+from app.web_server import DebateWebServer
+
+
+class FakeWebSocket:
+    """Websocket stand-in with a configurable send delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+        self.remote_address = ("127.0.0.1", 0)
+
+    async def send(self, frame):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = (code, reason)
+
+
+async def drain(sender, timeout=1.0):
+    """Wait until a sender's queue is empty and the last send finished."""
+    async def wait():
+        while sender.queue_depth:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(sender.websocket.delay + 0.01)
+    await asyncio.wait_for(wait(), timeout)
+
+
+class TestClientSender:
+    """Test suite for ClientSender."""
+
+    @pytest.mark.asyncio
+    async def test_sends_in_order(self):
+        """Test frames are delivered in the order they were queued."""
+        websocket = FakeWebSocket()
+        sender = ClientSender(websocket)
+
+        for i in range(10):
+            assert sender.send(str(i))
+        await drain(sender)
+
+        assert websocket.sent == [str(i) for i in range(10)]
+        assert sender.frames_sent == 10
+        await sender.close()
+
+    @pytest.mark.asyncio
+    async def test_overflow_downgrades_before_evicting(self):
+        """Test a full queue first drops low-priority frames."""
+        websocket = FakeWebSocket(delay=0.05)
+        sender = ClientSender(websocket, max_queue=4)
+
+        for i in range(3):
+            sender.send(f"activity {i}", droppable=True)
+        sender.send("message 0")
+        assert sender.send("message 1")
+
+        assert sender.degraded
+        assert not sender.closed
+        assert sender.frames_dropped >= 2
+        assert not sender.send("activity late", droppable=True)
+        await sender.close()
+
+    @pytest.mark.asyncio
+    async def test_overflow_of_essential_frames_evicts(self):
+        """Test a client that cannot keep up with messages is evicted."""
+        websocket = FakeWebSocket(delay=1.0)
+        evicted = []
+        sender = ClientSender(websocket, max_queue=3,
+                              on_evict=lambda s, reason: evicted.append(reason))
+
+        results = [sender.send(f"message {i}") for i in range(6)]
+        await asyncio.sleep(0.01)
+
+        assert results[-1] is False
+        assert sender.closed
+        assert evicted == ["send queue overflow"]
+        assert websocket.closed_with[0] == SLOW_CONSUMER_CLOSE_CODE
+        await sender.close()
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_evicts(self):
+        """Test a stalled send evicts the client."""
+        websocket = FakeWebSocket(delay=10)
+        evicted = []
+        sender = ClientSender(websocket, send_timeout=0.05,
+                              on_evict=lambda s, reason: evicted.append(reason))
+
+        sender.send("message")
+        await asyncio.sleep(0.2)
+
+        assert evicted == ["send timeout"]
+        await sender.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_sends_downgrade(self):
+        """Test send latency above the threshold downgrades the client."""
+        websocket = FakeWebSocket(delay=0.03)
+        sender = ClientSender(websocket, slow_send_threshold=0.01)
+
+        sender.send("message 0")
+        sender.send("message 1")
+        await asyncio.sleep(0.045)
+
+        assert sender.degraded
+        assert not sender.send("activity", droppable=True)
+        assert sender.send("message 2")
+        await drain(sender)
+        assert websocket.sent == ["message 0", "message 1", "message 2"]
+        await sender.close()
+
+
+class TestBroadcast:
+    """Test DebateWebServer broadcasting through the queues."""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self):
+        """Test broadcast returns immediately and fast clients are served first."""
+        server = DebateWebServer(max_client_queue=10, send_timeout=5)
+        fast = [FakeWebSocket() for _ in range(20)]
+        slow = FakeWebSocket(delay=0.5)
+        server.clients.update(fast + [slow])
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await server.broadcast_to_all({'type': 'message', 'content': 'hi'})
+        assert loop.time() - started < 0.1
+
+        await asyncio.sleep(0.05)
+        assert all(json.loads(ws.sent[0])['content'] == 'hi' for ws in fast)
+        assert slow.sent == []
+
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_evicted_client_is_removed(self):
+        """Test an overflowing client is removed from the broadcast set."""
+        server = DebateWebServer(max_client_queue=2, send_timeout=5)
+        slow = FakeWebSocket(delay=5)
+        server.clients.add(slow)
+
+        for i in range(5):
+            await server.broadcast_to_all({'type': 'message', 'content': str(i)})
+
+        assert slow not in server.clients
+        assert server.get_outbound_stats()['evicted_clients'] == 1
+        await server.stop_server()
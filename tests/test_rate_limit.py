@@ -0,0 +1,156 @@
+"""
+Tests for inbound websocket rate limiting.
+"""
+
+import pytest
+import asyncio
+import json
+from app.chat_log import ChatLog
+from app.rate_limit import InboundLimiter, TokenBucket
+from app.web_server import DebateWebServer
+
+
+class RecordingWebSocket:
+    """Websocket stand-in that records frames sent to it."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+
+def chat(sender: str, content: str) -> str:
+    return json.dumps({'type': 'human_message', 'sender': sender, 'content': content})
+
+
+class TestTokenBucket:
+    """Test token refill and consumption."""
+
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+        assert [bucket.consume(now=0.0) for _ in range(4)] == [True, True, True, False]
+        assert bucket.retry_after() == pytest.approx(0.5)
+
+        assert bucket.consume(now=0.5)
+        assert not bucket.consume(now=0.5)
+        # Refill never exceeds the burst size
+        assert [bucket.consume(now=100.0) for _ in range(4)] == [True, True, True, False]
+
+
+class TestInboundLimiter:
+    """Test frame, type and sender limits."""
+
+    def test_frame_checks(self):
+        """Test oversized frames and frame floods are rejected before parsing."""
+        limiter = InboundLimiter({'max_frame_bytes': 100, 'connection': {'rate': 0, 'burst': 3}})
+        assert limiter.check_frame("a", "x" * 101) == 'frame_too_large'
+        # The limit is in bytes, not characters
+        assert limiter.check_frame("a", "é" * 60) == 'frame_too_large'
+        assert limiter.check_frame("a", "é" * 50) is None
+        assert limiter.check_frame("a", "{}") is None
+        assert limiter.check_frame("a", "{}") is None
+        assert limiter.check_frame("a", "{}") == 'connection_rate'
+        assert limiter.check_frame("b", "{}") is None
+
+        stats = limiter.get_stats()
+        assert stats['rejections'] == {'frame_too_large': 2, 'connection_rate': 1}
+
+    def test_type_and_chat_quotas(self):
+        """Test quotas are per connection and rejected messages cost nothing."""
+        limiter = InboundLimiter({
+            'types': {'human_message': {'rate': 0, 'burst': 2}},
+            'chat': {'rate': 0, 'burst': 3}
+        })
+        assert limiter.check_message("a", 'human_message') is None
+        assert limiter.check_message("a", 'human_message') is None
+        assert limiter.check_message("a", 'human_message') == 'type_rate:human_message'
+        assert limiter.is_flooding("a")
+
+        # Chat types share one budget per connection
+        assert limiter.check_message("a", 'user_message') is None
+        assert limiter.check_message("a", 'user_message') == 'chat_rate'
+
+        # The chat budget rejects without spending the type token
+        limiter = InboundLimiter({
+            'types': {'human_message': {'rate': 0, 'burst': 2}},
+            'chat': {'rate': 0, 'burst': 0}
+        })
+        assert limiter.check_message("b", 'human_message') == 'chat_rate'
+        assert limiter._connections["b"].types['human_message'].tokens == 2
+
+    def test_replay_requests_have_quotas(self):
+        """Test resume and state_resync cannot be spammed at the connection rate."""
+        limiter = InboundLimiter()
+        results = [limiter.check_message("a", 'resume') for _ in range(20)]
+        assert results.count(None) == 10
+        assert results[-1] == 'type_rate:resume'
+        assert [limiter.check_message("a", 'state_resync') for _ in range(4)][-1] == \
+            'type_rate:state_resync'
+
+    def test_connections_are_independent(self):
+        """Test one connection cannot spend or flag another's budget."""
+        limiter = InboundLimiter({'chat': {'rate': 0, 'burst': 1}})
+        assert limiter.check_message("a", 'human_message') is None
+        assert limiter.check_message("a", 'human_message') == 'chat_rate'
+
+        assert limiter.check_message("b", 'human_message') is None
+        assert not limiter.is_flooding("b")
+
+        # Unlimited types pass; forgotten connections start fresh
+        assert limiter.check_message("a", 'subscribe') is None
+        assert limiter.get_stats()['flooding_connections'] == 1
+        limiter.forget("a")
+        assert not limiter.is_flooding("a")
+        assert limiter.check_message("a", 'human_message') is None
+
+
+class TestWebServerLimits:
+    """Test limits applied to the web server's inbound frames."""
+
+    @pytest.mark.asyncio
+    async def test_flood_is_rejected_and_does_not_trigger_bots(self):
+        server = DebateWebServer(telemetry_tick=0, rate_limits={
+            'types': {'human_message': {'rate': 0, 'burst': 2}},
+            'chat': {'rate': 0, 'burst': 100}
+        })
+        server.set_chat_log(ChatLog())
+        checked = []
+
+        async def record_check(content):
+            checked.append(content)
+        server.simulate_bot_checking = record_check
+
+        flooder = RecordingWebSocket()
+        for i in range(4):
+            await server.handle_message(flooder, chat("Mallory", f"spam {i}"))
+        await server.handle_message(flooder, "x" * 10000)
+        await asyncio.sleep(0.01)
+
+        assert [m.content for m in server.chat_log.messages] == ["spam 0", "spam 1"]
+        limited = [frame for frame in flooder.sent if frame['type'] == 'rate_limited']
+        assert len(limited) == 2
+        assert limited[0]['reason'] == 'type_rate:human_message'
+
+        # Mallory cannot mute or throttle Alice by sending under her name
+        alice = RecordingWebSocket()
+        await server.handle_message(alice, chat("Alice", "my turn"))
+        assert not server.chat_log.messages[-1].has_metadata
+        assert checked == ["spam 0", "spam 1", "my turn"]
+
+        # The flooding connection's accepted messages do not trigger bots
+        await server.handle_message(flooder, json.dumps({'type': 'user_message',
+                                                         'content': "sneaky"}))
+        message = server.chat_log.messages[-1]
+        assert message.content == "sneaky"
+        assert message.metadata['suppress_bots'] is True
+        assert checked == ["spam 0", "spam 1", "my turn"]
+
+        stats = server.get_inbound_stats()
+        assert stats['rejections'] == {'type_rate:human_message': 2, 'frame_too_large': 1}
+        assert stats['flooding_connections'] == 1
+
+        for sender in list(server.senders.values()):
+            await sender.close()
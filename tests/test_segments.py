@@ -0,0 +1,77 @@
+"""
+Tests for on-disk message segments.
+"""
+
+import time
+from app.chat_log import Message
+from app.segments import SegmentStore
+
+
+def make_messages(count, start=1):
+    """Create messages with consecutive ids."""
+    return [
+        Message(f"User{i % 3}", f"Message {i}", time.time(), i)
+        for i in range(start, start + count)
+    ]
+
+
+class TestSegmentStore:
+    """Test suite for SegmentStore."""
+
+    def test_append_and_iterate(self, tmp_path):
+        """Test messages round-trip through segments."""
+        store = SegmentStore(str(tmp_path), segment_size=10, index_interval=4)
+        for message in make_messages(25):
+            store.append(message)
+
+        assert len(store) == 25
+        assert len(store.segments) == 3
+        assert store.first_id == 1
+        assert store.last_id == 25
+        assert [m.message_id for m in store.iter_messages()] == list(range(1, 26))
+        assert list(store.iter_messages())[4].content == "Message 5"
+
+    def test_sealed_segments_write_index(self, tmp_path):
+        """Test full segments are sealed with an index sidecar."""
+        store = SegmentStore(str(tmp_path), segment_size=10)
+        for message in make_messages(15):
+            store.append(message)
+
+        assert store.segments[0].sealed
+        assert not store.segments[1].sealed
+        assert (tmp_path / "segment-000000000001.idx").exists()
+        assert not (tmp_path / "segment-000000000011.idx").exists()
+
+    def test_iterate_after_cursor(self, tmp_path):
+        """Test reads seek to the cursor across segments."""
+        store = SegmentStore(str(tmp_path), segment_size=10, index_interval=4)
+        for message in make_messages(25):
+            store.append(message)
+
+        assert [m.message_id for m in store.iter_messages(17)] == list(range(18, 26))
+        assert [m.message_id for m in store.iter_messages(10)][0] == 11
+        assert list(store.iter_messages(25)) == []
+
+    def test_snapshot_ignores_later_appends(self, tmp_path):
+        """Test a snapshot only covers messages appended before it."""
+        store = SegmentStore(str(tmp_path), segment_size=10)
+        messages = make_messages(8)
+        for message in messages[:5]:
+            store.append(message)
+
+        snapshot = store.snapshot()
+        for message in messages[5:]:
+            store.append(message)
+
+        assert [m.message_id for m in store.iter_messages(snapshot=snapshot)] == [1, 2, 3, 4, 5]
+
+    def test_temporary_directory_removed_on_close(self):
+        """Test the default temporary directory is cleaned up."""
+        store = SegmentStore()
+        for message in make_messages(3):
+            store.append(message)
+
+        directory = store.directory
+        assert directory.exists()
+        store.close()
+        assert not directory.exists()
@@ -0,0 +1,142 @@
+"""
+Tests for the shared-ring spectator tier.
+"""
+
+import pytest
+import asyncio
+import json
+from types import SimpleNamespace
+from app.chat_log import ChatLog
+from app.spectators import FrameRing, SpectatorRoom
+from app.web_server import DebateWebServer
+
+
+class SpectatorSocket:
+    """Websocket stand-in whose sends can be held back."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self, path: str = "/"):
+        self.sent = []
+        self.request = SimpleNamespace(path=path)
+        self.disconnect = asyncio.Event()
+        self.writable = asyncio.Event()
+        self.writable.set()
+
+    async def send(self, frame):
+        await self.writable.wait()
+        self.sent.append(frame)
+
+    async def close(self):
+        self.disconnect.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self.disconnect.wait()
+        raise StopAsyncIteration
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFrameRing:
+    """Test the ring's addressing."""
+
+    def test_wraps_and_forgets(self):
+        ring = FrameRing(capacity=3)
+        for i in range(5):
+            assert ring.append(f"f{i}") == i
+
+        assert (ring.tail, ring.head) == (2, 5)
+        assert [ring.get(i) for i in range(6)] == [None, None, "f2", "f3", "f4", None]
+
+
+class TestSpectatorRoom:
+    """Test spectators reading the shared ring."""
+
+    @pytest.mark.asyncio
+    async def test_spectators_follow_in_order(self):
+        room = SpectatorRoom(capacity=16)
+        sockets = [SpectatorSocket(), SpectatorSocket()]
+        tasks = [asyncio.create_task(room.serve(ws, ["snapshot"])) for ws in sockets]
+        await settle()
+
+        for i in range(3):
+            room.publish(f"frame {i}")
+        await settle()
+
+        for ws in sockets:
+            assert ws.sent == ["snapshot", "frame 0", "frame 1", "frame 2"]
+        assert len(room) == 2
+
+        sockets[0].disconnect.set()
+        await tasks[0]
+        assert len(room) == 1
+
+        await room.close()
+        await tasks[1]
+        assert len(room) == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_spectator_skips_ahead(self):
+        """Test a spectator that falls out of the ring restarts from a snapshot."""
+        room = SpectatorRoom(capacity=4, snapshot=lambda: "fresh snapshot")
+        slow, fast = SpectatorSocket(), SpectatorSocket()
+        tasks = [asyncio.create_task(room.serve(ws)) for ws in (slow, fast)]
+        await settle()
+
+        room.publish("frame 0")
+        await settle()
+        slow.writable.clear()
+
+        for i in range(1, 10):
+            room.publish(f"frame {i}")
+            await settle()
+        assert room.get_stats()['max_lag'] >= 8
+
+        slow.writable.set()
+        await settle()
+
+        assert fast.sent == [f"frame {i}" for i in range(10)]
+        assert slow.sent == ["frame 0", "frame 1", "fresh snapshot"]
+        assert room.get_stats()['overruns'] == 1
+
+        room.publish("frame 10")
+        await settle()
+        assert slow.sent[-1] == fast.sent[-1] == "frame 10"
+
+        await room.close()
+        await asyncio.gather(*tasks)
+
+
+class TestWebServerSpectators:
+    """Test spectators joining the debate web server."""
+
+    @pytest.mark.asyncio
+    async def test_spectator_gets_broadcasts_without_a_queue(self):
+        server = DebateWebServer(telemetry_tick=0)
+        chat_log = ChatLog()
+        chat_log.set_web_server(server)
+        server.set_chat_log(chat_log)
+
+        spectator = SpectatorSocket("/?spectate=1")
+        task = asyncio.create_task(server.handle_client(spectator))
+        await settle()
+
+        await chat_log.add_message("Alice", "Hello spectators")
+        await settle()
+
+        frames = [json.loads(frame) for frame in spectator.sent]
+        assert [frame['type'] for frame in frames] == ['room_snapshot', 'message']
+        assert frames[1]['content'] == "Hello spectators"
+        assert server.get_client_count() == 1
+        assert not server.senders
+        assert server.get_outbound_stats()['spectators']['spectators'] == 1
+
+        spectator.disconnect.set()
+        await task
+        assert server.get_client_count() == 0
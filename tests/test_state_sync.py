@@ -0,0 +1,123 @@
+"""
+Tests for versioned state synchronisation.
+"""
+
+import pytest
+import asyncio
+import copy
+import json
+from app.state_sync import StateSync, apply_ops, diff_state
+from app.web_server import DebateWebServer
+
+
+class TestDiffState:
+    """Test suite for diff_state and apply_ops."""
+
+    def test_only_changed_fields(self):
+        """Test unchanged fields produce no operations."""
+        old = {'message_count': 40, 'by_sender': {'Alice': 3, 'Bob': 5}, 'phase': 'debate'}
+        new = {'message_count': 41, 'by_sender': {'Alice': 4, 'Bob': 5}, 'phase': 'debate'}
+
+        assert diff_state(old, new) == [
+            {'op': 'replace', 'path': '/message_count', 'value': 41},
+            {'op': 'replace', 'path': '/by_sender/Alice', 'value': 4}
+        ]
+
+    def test_round_trip(self):
+        """Test applying the diff reproduces the new state."""
+        old = {'a': 1, 'gone': True, 'nested': {'x': [1, 2], 'y': {'z': 1}}, 'a/b': 1}
+        new = {'a': 1.5, 'nested': {'x': [1, 2, 3], 'y': 'flat'}, 'added': {'k': None}, 'a/b': 2}
+
+        assert apply_ops(copy.deepcopy(old), diff_state(old, new)) == new
+
+    def test_type_change_is_replaced(self):
+        """Test equal-comparing values of different types are still sent."""
+        assert diff_state({'flag': 1}, {'flag': True}) == [
+            {'op': 'replace', 'path': '/flag', 'value': True}]
+
+
+class TestStateSync:
+    """Test suite for StateSync."""
+
+    def test_versions_and_snapshots(self):
+        """Test deltas chain by version and snapshots carry full state."""
+        sync = StateSync()
+        assert sync.snapshot('stats') is None
+
+        first = sync.publish('stats', {'count': 1, 'phase': 'opening'})
+        second = sync.publish('stats', {'count': 2, 'phase': 'opening'})
+
+        assert (first['base_version'], first['version']) == (0, 1)
+        assert (second['base_version'], second['version']) == (1, 2)
+        assert second['ops'] == [{'op': 'replace', 'path': '/count', 'value': 2}]
+        assert sync.publish('stats', {'count': 2, 'phase': 'opening'}) is None
+        assert sync.snapshot('stats') == {'type': 'state_snapshot', 'channel': 'stats',
+                                          'version': 2, 'state': {'count': 2, 'phase': 'opening'}}
+
+    def test_published_state_is_copied(self):
+        """Test later mutation of the caller's dict is still detected."""
+        sync = StateSync()
+        state = {'by_sender': {'Alice': 1}}
+        sync.publish('stats', state)
+        state['by_sender']['Alice'] = 2
+
+        assert sync.publish('stats', state)['ops'] == [
+            {'op': 'replace', 'path': '/by_sender/Alice', 'value': 2}]
+
+
+class RecordingWebSocket:
+    """Websocket stand-in that records sent frames."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+
+class TestWebServerStateSync:
+    """Test DebateWebServer stats and bot status deltas."""
+
+    @pytest.mark.asyncio
+    async def test_stats_are_sent_as_deltas(self):
+        """Test repeated stats broadcasts only carry changed fields."""
+        server = DebateWebServer(telemetry_tick=0)
+        websocket = RecordingWebSocket()
+        server.clients.add(websocket)
+
+        stats = {'messages_by_sender': {'Alice': 10, 'Bob': 12}, 'phase': 'debate',
+                 'elapsed_time': 100}
+        await server.broadcast_stats(stats)
+        await server.broadcast_stats({**stats, 'elapsed_time': 105})
+        await server.broadcast_stats({**stats, 'elapsed_time': 105})
+        await asyncio.sleep(0.01)
+
+        assert [frame['type'] for frame in websocket.sent] == ['state_delta', 'state_delta']
+        assert websocket.sent[1]['ops'] == [
+            {'op': 'replace', 'path': '/elapsed_time', 'value': 105}]
+
+        state = {}
+        for frame in websocket.sent:
+            apply_ops(state, frame['ops'])
+        assert state == server.state_sync.get_state('stats')
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_resync_sends_snapshot(self):
+        """Test a client that asks for resync gets the full state."""
+        server = DebateWebServer(telemetry_tick=0)
+        await server.broadcast_stats({'phase': 'debate'})
+        server.bot_stats = {'Socrates': {'checks': 3}}
+        await server.broadcast_bot_status('Socrates', 'thinking')
+
+        websocket = RecordingWebSocket()
+        await server.handle_message(websocket, json.dumps({'type': 'state_resync'}))
+        await asyncio.sleep(0.01)
+
+        snapshots = {frame['channel']: frame for frame in websocket.sent}
+        assert snapshots['stats']['state']['phase'] == 'debate'
+        assert snapshots['bots']['state']['Socrates']['status'] == 'thinking'
+        assert snapshots['bots']['state']['Socrates']['checks'] == 3
+        await server.stop_server()
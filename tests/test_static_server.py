@@ -0,0 +1,146 @@
+"""
+Tests for the asyncio static file server.
+"""
+
+import pytest
+import asyncio
+import gzip
+import os
+from app.static_server import StaticAssets, StaticFileServer, accepts_gzip
+
+
+@pytest.fixture
+def web_dir(tmp_path):
+    (tmp_path / "index.html").write_text("<html>" + "debate " * 200 + "</html>")
+    (tmp_path / "app.js").write_text("console.log('hi');")
+    (tmp_path / "secret.txt").write_text("outside")
+    web = tmp_path / "web"
+    web.mkdir()
+    (web / "index.html").write_text("<html>" + "debate " * 200 + "</html>")
+    (web / "app.js").write_text("console.log('hi');")
+    return web
+
+
+def headers_of(response_headers):
+    return dict(response_headers)
+
+
+class TestStaticAssets:
+    """Test in-memory asset responses."""
+
+    def test_cached_and_compressed(self, web_dir):
+        """Test the index is read once, gzipped and revalidated by ETag."""
+        assets = StaticAssets(web_dir)
+
+        status, headers, body = assets.respond('GET', '/', {'accept-encoding': 'gzip, br'})
+        headers = headers_of(headers)
+        assert status == 200
+        assert headers['Content-Encoding'] == 'gzip'
+        assert headers['Cache-Control'] == 'no-cache'
+        assert gzip.decompress(body).startswith(b"<html>debate")
+
+        status, _, body = assets.respond('GET', '/index.html?v=2', {})
+        assert status == 200 and body.startswith(b"<html>")
+
+        status, _, body = assets.respond('GET', '/', {'if-none-match': headers['ETag']})
+        assert status == 304 and body == b''
+        assert assets.disk_reads == 1
+
+        (web_dir / "index.html").write_text("changed")
+        assert assets.respond('GET', '/', {})[2] != b"changed"
+
+    def test_small_assets_and_cache_control(self, web_dir):
+        """Test small files are not compressed and non-HTML assets are cacheable."""
+        assets = StaticAssets(web_dir, max_age=600)
+        status, headers, body = assets.respond('GET', '/app.js', {'accept-encoding': 'gzip'})
+        headers = headers_of(headers)
+        assert status == 200
+        assert 'Content-Encoding' not in headers
+        assert headers['Cache-Control'] == 'public, max-age=600'
+        assert headers['Content-Type'].endswith('charset=utf-8')
+
+    def test_accept_encoding_quality(self):
+        """Test q-values decide whether gzip is acceptable."""
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+        assert accepts_gzip("*")
+        assert not accepts_gzip("gzip;q=0")
+        assert not accepts_gzip("br, gzip; q=0.000")
+        assert not accepts_gzip("*;q=1, gzip;q=0")
+        assert not accepts_gzip("identity")
+        assert not accepts_gzip("")
+
+    def test_errors(self, web_dir):
+        """Test missing files, traversal and other methods are refused."""
+        assets = StaticAssets(web_dir)
+        assert assets.respond('GET', '/missing.css', {})[0] == 404
+        assert assets.respond('GET', '/../secret.txt', {})[0] == 404
+        assert assets.respond('GET', '/%2e%2e/secret.txt', {})[0] == 404
+        assert assets.respond('POST', '/', {})[0] == 405
+
+        status, _, body = assets.respond('HEAD', '/', {})
+        assert status == 200 and body == b''
+
+    def test_auto_reload(self, web_dir):
+        """Test development mode picks up edited files."""
+        assets = StaticAssets(web_dir, auto_reload=True)
+        assets.respond('GET', '/app.js', {})
+        path = web_dir / "app.js"
+        path.write_text("console.log('edited');")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+        assert assets.respond('GET', '/app.js', {})[2] == b"console.log('edited');"
+
+
+class TestStaticFileServer:
+    """Test HTTP serving on the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_requests(self, web_dir):
+        """Test two requests on one connection, the second revalidated."""
+        server = StaticFileServer(web_dir, host="127.0.0.1", port=0)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET / HTTP/1.1\r\nHost: x\r\nAccept-Encoding: gzip\r\n\r\n")
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            assert head.startswith("HTTP/1.1 200 OK")
+            headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if line)
+            body = await reader.readexactly(int(headers['Content-Length']))
+            assert gzip.decompress(body).startswith(b"<html>")
+
+            writer.write(f"GET / HTTP/1.1\r\nHost: x\r\nIf-None-Match: {headers['ETag']}\r\n"
+                         "Connection: close\r\n\r\n".encode())
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            assert head.startswith("HTTP/1.1 304 Not Modified")
+            assert await reader.read() == b""
+            writer.close()
+
+            assert server.assets.get_stats()['disk_reads'] == 2  # preloaded index.html and app.js
+        finally:
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_request_body_is_skipped(self, web_dir):
+        """Test a refused POST body is not read as the next request."""
+        server = StaticFileServer(web_dir, host="127.0.0.1", port=0)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = b"GET /secret HTTP/1.1\r\n\r\n"
+            writer.write(b"POST / HTTP/1.1\r\nHost: x\r\nContent-Length: "
+                         + str(len(body)).encode() + b"\r\n\r\n" + body)
+            writer.write(b"HEAD /app.js HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+
+            first = (await reader.readuntil(b"\r\n\r\n")).decode()
+            assert first.startswith("HTTP/1.1 405")
+            second = (await reader.readuntil(b"\r\n\r\n")).decode()
+            assert second.startswith("HTTP/1.1 200 OK")
+            assert await reader.read() == b""
+            writer.close()
+        finally:
+            await server.stop()
@@ -0,0 +1,154 @@
+"""
+Tests for durable storage backends.
+"""
+
+import pytest
+import sqlite3
+import time
+from app.chat_log import ChatLog, Message
+from app.storage import SQLiteStorage, StorageBackend, create_storage
+from app.voting import Vote, VotingSystem
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Create a SQLite storage backend."""
+    backend = SQLiteStorage(str(tmp_path / "debates.db"), batch_size=50)
+    yield backend
+    backend.close()
+
+
+class TestSQLiteStorage:
+    """Test suite for SQLiteStorage."""
+
+    def test_uses_wal_mode(self, storage):
+        """Test the database is opened in WAL mode."""
+        connection = sqlite3.connect(storage.path)
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        connection.close()
+
+    def test_message_round_trip(self, storage):
+        """Test messages are persisted in batches and read back in order."""
+        for i in range(1, 121):
+            metadata = {'round': i} if i % 2 else None
+            storage.save_message("debate-1", Message(f"User{i % 3}", f"Message {i}",
+                                                     time.time(), i, "chat", metadata))
+        storage.flush()
+
+        messages = storage.get_messages("debate-1")
+        assert [m.message_id for m in messages] == list(range(1, 121))
+        assert messages[0].metadata == {'round': 1}
+        assert not messages[1].has_metadata
+
+        assert [m.message_id for m in storage.get_messages("debate-1", after_message_id=115)] == [
+            116, 117, 118, 119, 120]
+        assert len(storage.get_messages("debate-1", sender="User0", limit=5)) == 5
+        assert storage.get_messages("debate-2") == []
+
+    def test_debates_are_separate(self, storage):
+        """Test messages are keyed by debate."""
+        storage.save_message("a", Message("Alice", "Hi", time.time(), 1))
+        storage.save_message("b", Message("Bob", "Hello", time.time(), 1))
+        storage.flush()
+
+        assert storage.get_messages("a")[0].sender == "Alice"
+        assert storage.get_messages("b")[0].sender == "Bob"
+        assert {d['debate_id'] for d in storage.get_debates()} == {"a", "b"}
+
+    def test_vote_replaces_previous_vote(self, storage):
+        """Test votes are keyed by (session, voter)."""
+        storage.save_vote("s1", Vote("alice", "Bot1", "first"))
+        storage.save_vote("s1", Vote("alice", "Bot2", "changed my mind"))
+        storage.save_vote("s1", Vote("bob", "Bot1"))
+        storage.flush()
+
+        votes = {v.voter_id: v for v in storage.get_votes("s1")}
+        assert len(votes) == 2
+        assert votes["alice"].candidate == "Bot2"
+        assert storage.get_votes("s2") == []
+
+    def test_data_survives_reopen(self, tmp_path):
+        """Test closing flushes and a new backend sees the data."""
+        path = str(tmp_path / "debates.db")
+        first = SQLiteStorage(path)
+        first.save_message("d", Message("Alice", "Persisted", time.time(), 1))
+        first.close()
+
+        second = SQLiteStorage(path)
+        assert second.get_messages("d")[0].content == "Persisted"
+        second.close()
+
+    def test_failed_writes_are_retried_then_counted(self, storage, monkeypatch):
+        """Test a failing batch is retried and, if it keeps failing, shows in stats."""
+        apply = storage._apply
+        failures = iter([True, False, True, True, True, True])
+
+        def flaky_apply(connection, writes):
+            if next(failures, False):
+                raise sqlite3.OperationalError("database is locked")
+            apply(connection, writes)
+
+        storage.RETRY_DELAY = 0
+        monkeypatch.setattr(storage, '_apply', flaky_apply)
+
+        storage.save_message("d", Message("Alice", "Retried", time.time(), 1))
+        storage.flush()
+        storage.save_message("d", Message("Alice", "Lost", time.time(), 2))
+        storage.flush()
+
+        assert [m.content for m in storage.get_messages("d")] == ["Retried"]
+        stats = storage.get_stats()
+        assert stats['writes'] == 1 and stats['failed_writes'] == 1
+        assert stats['retries'] == 4
+        assert stats['last_error'] == "database is locked"
+
+    def test_indexes_are_scoped_to_debate(self, storage):
+        """Test sender and timestamp lookups use per-debate indexes."""
+        connection = sqlite3.connect(storage.path)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM messages WHERE debate_id = ? AND sender = ?",
+            ("d", "Alice")).fetchall()
+        connection.close()
+        assert "idx_messages_debate_sender" in str(plan)
+
+    def test_backend_interface_is_abstract(self):
+        """Test a backend must implement the storage interface."""
+        with pytest.raises(TypeError):
+            StorageBackend()
+
+    def test_create_storage(self, tmp_path):
+        """Test building a backend from config."""
+        assert create_storage({}) is None
+
+        backend = create_storage({'backend': 'sqlite', 'path': str(tmp_path / "x.db")})
+        assert isinstance(backend, SQLiteStorage)
+        backend.close()
+
+        with pytest.raises(ValueError):
+            create_storage({'backend': 'redis'})
+
+
+class TestStorageIntegration:
+    """Test ChatLog and VotingSystem writing through a backend."""
+
+    @pytest.mark.asyncio
+    async def test_chat_log_persists_messages(self, storage):
+        """Test every added message reaches storage."""
+        chat_log = ChatLog(storage=storage, debate_id="debate-1")
+        for i in range(3):
+            await chat_log.add_message("Alice", f"Message {i}")
+        storage.flush()
+
+        assert [m.content for m in storage.get_messages("debate-1")] == [
+            "Message 0", "Message 1", "Message 2"]
+
+    @pytest.mark.asyncio
+    async def test_voting_system_persists_votes(self, storage):
+        """Test cast votes reach storage under the session id."""
+        voting = VotingSystem({'require_justification': False}, storage=storage)
+        await voting.start_voting(["Bot1", "Bot2"])
+        await voting.cast_vote("Bot1", "Bot2")
+        storage.flush()
+
+        votes = storage.get_votes(voting.session_id)
+        assert [(v.voter_id, v.candidate) for v in votes] == [("Bot1", "Bot2")]
@@ -0,0 +1,196 @@
+"""
+Tests for streaming sessions: one shared port and coalesced vote updates.
+"""
+
+import pytest
+import asyncio
+import json
+import time
+import websockets
+from app.chat_log import ChatLog
+from app.streaming import StreamingManager, StreamingServer
+from app.voting import VotingSystem
+
+
+async def connect(port: int, path: str):
+    """Open a client and read its welcome frame."""
+    ws = await websockets.connect(f"ws://127.0.0.1:{port}{path}")
+    welcome = json.loads(await asyncio.wait_for(ws.recv(), 1))
+    await asyncio.wait_for(ws.recv(), 1)  # history
+    return ws, welcome
+
+
+class TestStreamingManager:
+    """Test sessions sharing one listener."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_one_port(self):
+        manager = StreamingManager(host="127.0.0.1", port=0)
+        logs = {name: ChatLog() for name in ("math", "history")}
+        try:
+            for name, chat_log in logs.items():
+                await manager.create_streaming_session(name, chat_log, VotingSystem({}),
+                                                       {'max_connections': 20})
+            port = manager.port
+            assert {manager.get_session_info(name)['port'] for name in logs} == {port}
+
+            # Concurrent connects get distinct ids within their session
+            clients = await asyncio.gather(*[connect(port, "/rooms/math") for _ in range(10)],
+                                           connect(port, "/history"),
+                                           connect(port, "/?room=history"))
+            ids = [welcome['client_id'] for _, welcome in clients]
+            assert len(set(ids[:10])) == 10 and len(set(ids[10:])) == 2
+
+            # Each session only broadcasts its own chat
+            await logs['history'].add_message("Alice", "1066")
+            for ws, _ in clients[10:]:
+                frame = json.loads(await asyncio.wait_for(ws.recv(), 1))
+                assert frame['data']['content'] == "1066"
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(clients[0][0].recv(), 0.1)
+
+            stats = manager.get_stats()
+            assert stats['sessions']['math']['connected_clients'] == 10
+            assert stats['sessions']['history']['connected_clients'] == 2
+            assert stats['connected_clients'] == 12
+
+            for ws, _ in clients:
+                await ws.close()
+        finally:
+            await manager.stop_all_sessions()
+        assert manager.gateway is None
+
+    @pytest.mark.asyncio
+    async def test_stale_cursor_still_gets_live_messages(self):
+        manager = StreamingManager(host="127.0.0.1", port=0)
+        chat_log = ChatLog()
+        try:
+            await manager.create_streaming_session("room", chat_log, VotingSystem({}), {})
+            await chat_log.add_message("Alice", "Since restart")
+
+            # A cursor from before a restart is ahead of the chat log
+            ws = await websockets.connect(f"ws://127.0.0.1:{manager.port}/room?after=50")
+            await asyncio.wait_for(ws.recv(), 1)  # welcome
+            history = json.loads(await asyncio.wait_for(ws.recv(), 1))
+            assert [m['content'] for m in history['data']] == ["Since restart"]
+
+            await chat_log.add_message("Alice", "Live")
+            frame = json.loads(await asyncio.wait_for(ws.recv(), 1))
+            assert frame['data']['content'] == "Live"
+            await ws.close()
+        finally:
+            await manager.stop_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_subscribe_by_message_type(self):
+        manager = StreamingManager(host="127.0.0.1", port=0)
+        chat_log = ChatLog()
+        try:
+            await manager.create_streaming_session("room", chat_log, VotingSystem({}), {})
+            legacy, _ = await connect(manager.port, "/room")
+            current, _ = await connect(manager.port, "/room")
+
+            # The pre-channel payload named message types in 'channels'
+            await legacy.send(json.dumps({'type': 'subscribe', 'channels': ['moderator', 'system']}))
+            await current.send(json.dumps({'type': 'subscribe', 'channels': ['chat'],
+                                           'message_types': ['chat']}))
+            reply = json.loads(await asyncio.wait_for(legacy.recv(), 1))
+            assert reply['message_types'] == ['moderator', 'system']
+            assert 'votes' in reply['channels']
+            await asyncio.wait_for(current.recv(), 1)
+
+            await chat_log.add_message("Alice", "Hi")
+            await chat_log.add_message("Moderator", "Next round", message_type="moderator")
+
+            frame = json.loads(await asyncio.wait_for(legacy.recv(), 1))
+            assert frame['data']['content'] == "Next round"
+            frame = json.loads(await asyncio.wait_for(current.recv(), 1))
+            assert frame['data']['content'] == "Hi"
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(current.recv(), 0.1)
+
+            for ws in (legacy, current):
+                await ws.close()
+        finally:
+            await manager.stop_all_sessions()
+
+    @pytest.mark.asyncio
+    async def test_per_session_connection_cap(self):
+        manager = StreamingManager(host="127.0.0.1", port=0)
+        try:
+            await manager.create_streaming_session("small", ChatLog(), VotingSystem({}),
+                                                   {'max_connections': 1})
+            await manager.create_streaming_session("large", ChatLog(), VotingSystem({}),
+                                                   {'max_connections': 10})
+            with pytest.raises(ValueError):
+                await manager.create_streaming_session("small", ChatLog(), VotingSystem({}), {})
+
+            first, _ = await connect(manager.port, "/rooms/small")
+            extra = await websockets.connect(f"ws://127.0.0.1:{manager.port}/rooms/small")
+            with pytest.raises(websockets.exceptions.ConnectionClosed) as closed:
+                await asyncio.wait_for(extra.recv(), 1)
+            assert closed.value.rcvd.code == 1013
+
+            other, _ = await connect(manager.port, "/rooms/large")
+            assert manager.get_stats()['sessions']['small']['rejected_connections'] == 1
+
+            await manager.stop_streaming_session("small")
+            assert manager.list_active_sessions() == ["large"]
+
+            for ws in (first, other):
+                await ws.close()
+        finally:
+            await manager.stop_all_sessions()
+
+
+class TestVoteUpdates:
+    """Test vote_update broadcasts are coalesced."""
+
+    @pytest.mark.asyncio
+    async def test_votes_share_throttled_updates(self):
+        server = StreamingServer(ChatLog(), VotingSystem({}), {'vote_update_interval': 0.05})
+        broadcasts = []
+
+        async def broadcast():
+            broadcasts.append(time.monotonic())
+
+        server._broadcast_vote_update = broadcast
+
+        for _ in range(100):
+            server._schedule_vote_update()
+        await asyncio.sleep(0.01)
+        assert len(broadcasts) == 1
+
+        # Votes inside the interval wait for the next tick
+        for _ in range(100):
+            server._schedule_vote_update()
+        await asyncio.sleep(0.01)
+        assert len(broadcasts) == 1
+        await asyncio.sleep(0.06)
+        assert len(broadcasts) == 2
+        assert broadcasts[1] - broadcasts[0] >= 0.045
+
+    @pytest.mark.asyncio
+    async def test_final_tally_is_sent_after_voting_ends(self):
+        """Test votes cast just before end_voting still reach clients."""
+        voting = VotingSystem({'require_justification': False, 'allow_participant_voting': False})
+        server = StreamingServer(ChatLog(), voting, {'vote_update_interval': 0.05})
+        frames = []
+
+        async def send_frame(client, frame):
+            frames.append(json.loads(frame))
+
+        server._send_frame = send_frame
+        server.channels.add(object())
+
+        await voting.start_voting(["Alice", "Bob"], duration=60)
+        server._last_vote_update = time.monotonic()  # an update just went out
+        await voting.cast_vote("viewer_1", "Alice")
+        server._schedule_vote_update()
+        await voting.end_voting()
+
+        await asyncio.sleep(0.1)
+        assert len(frames) == 1
+        assert frames[0]['type'] == 'vote_update'
+        assert frames[0]['data']['vote_counts'] == {'Alice': 1}
+        assert frames[0]['data']['is_active'] is False
@@ -0,0 +1,131 @@
+"""
+Tests for tick-based telemetry coalescing.
+"""
+
+import pytest
+import asyncio
+import json
+from app.state_sync import apply_ops
+from app.telemetry import TelemetryAggregator
+from app.web_server import DebateWebServer
+
+
+class TestTelemetryAggregator:
+    """Test suite for TelemetryAggregator."""
+
+    @pytest.mark.asyncio
+    async def test_updates_in_one_tick_become_one_frame(self):
+        """Test a burst of updates is emitted as a single merged frame."""
+        frames = []
+
+        async def emit(frame):
+            frames.append(frame)
+
+        aggregator = TelemetryAggregator(emit, tick=0.02)
+        for i in range(10):
+            aggregator.add_activity("Socrates", "check", f"Checking {i}")
+            aggregator.update_bot_status("Socrates", {'status': 'monitoring', 'checks': i})
+        aggregator.update_bot_status("Socrates", {'status': 'thinking'})
+        aggregator.update_stats({'message_count': 1})
+        aggregator.update_stats({'message_count': 2})
+
+        await asyncio.sleep(0.05)
+
+        assert len(frames) == 1
+        frame = frames[0]
+        assert frame['type'] == 'telemetry'
+        assert len(frame['activity']) == 10
+        assert frame['activity_counts'] == {'Socrates': {'check': 10}}
+        assert frame['bot_status']['Socrates'] == {'status': 'thinking', 'checks': 9}
+        assert frame['stats'] == {'message_count': 2}
+        await aggregator.close()
+
+    @pytest.mark.asyncio
+    async def test_no_frames_when_idle(self):
+        """Test nothing is emitted without updates."""
+        frames = []
+
+        async def emit(frame):
+            frames.append(frame)
+
+        aggregator = TelemetryAggregator(emit, tick=0.01)
+        aggregator.update_stats({'message_count': 1})
+        await asyncio.sleep(0.05)
+
+        assert len(frames) == 1
+        await aggregator.close()
+        assert len(frames) == 1
+
+    @pytest.mark.asyncio
+    async def test_activity_is_bounded(self):
+        """Test only the newest activity lines are kept per frame."""
+        frames = []
+
+        async def emit(frame):
+            frames.append(frame)
+
+        aggregator = TelemetryAggregator(emit, tick=1, max_activity=5)
+        for i in range(8):
+            aggregator.add_activity("Skeptic", "check", str(i))
+        await aggregator.close()
+
+        assert [entry['message'] for entry in frames[0]['activity']] == ['3', '4', '5', '6', '7']
+        assert frames[0]['dropped_activity'] == 3
+        assert frames[0]['activity_counts'] == {'Skeptic': {'check': 8}}
+
+
+class RecordingWebSocket:
+    """Websocket stand-in that records sent frames."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+
+class TestWebServerTelemetry:
+    """Test DebateWebServer coalescing telemetry."""
+
+    @pytest.mark.asyncio
+    async def test_busy_debate_sends_far_fewer_frames(self):
+        """Test telemetry collapses while chat messages go straight out."""
+        server = DebateWebServer(telemetry_tick=0.05)
+        websocket = RecordingWebSocket()
+        server.clients.add(websocket)
+        bots = ["Socrates", "Advocate", "Skeptic", "Mediator"]
+        server.bot_stats = {name: {'checks': 0, 'triggers': 0, 'responses': 0} for name in bots}
+
+        for i in range(10):
+            await server.broadcast_message("Human_1", f"Point {i}", "human")
+            for bot in bots:
+                await server.log_bot_check(bot, f"Point {i}")
+            await server.broadcast_stats({'total_messages': i})
+
+        await asyncio.sleep(0.02)
+        chat = [frame for frame in websocket.sent if frame['type'] == 'message']
+        assert len(chat) == 10
+
+        await asyncio.sleep(0.1)
+        telemetry = [frame for frame in websocket.sent if frame['type'] == 'telemetry']
+        assert len(telemetry) == 1
+        bots = next(delta for delta in telemetry[0]['state'] if delta['channel'] == 'bots')
+        assert apply_ops({}, bots['ops'])['Socrates']['checks'] == 10
+        assert server.telemetry.updates_received == 90
+
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_tick_zero_disables_coalescing(self):
+        """Test telemetry_tick=0 keeps one frame per update."""
+        server = DebateWebServer(telemetry_tick=0)
+        websocket = RecordingWebSocket()
+        server.clients.add(websocket)
+
+        await server.broadcast_bot_activity("Socrates", "check", "Checking")
+        await asyncio.sleep(0.01)
+
+        assert [frame['type'] for frame in websocket.sent] == ['bot_activity']
+        await server.stop_server()
@@ -0,0 +1,211 @@
+"""
+Tests for streaming transcript export.
+"""
+
+import pytest
+import asyncio
+import gzip
+import json
+import time
+from app.chat_log import ChatLog, Message
+from app.transcript import export_transcript, TranscriptReader
+
+
+@pytest.fixture
+def messages():
+    """Create a batch of messages for export."""
+    return [
+        Message(f"User{i % 3}", f"Message {i}", time.time(), i + 1)
+        for i in range(1200)
+    ]
+
+
+class TestExportTranscript:
+    """Test suite for export_transcript."""
+
+    def test_json_export_round_trip(self, messages, tmp_path):
+        """Test the streamed JSON is valid and complete."""
+        output_file = tmp_path / "transcript.json"
+        written = export_transcript(iter(messages), str(output_file), "json",
+                                    statistics={'total_messages': 1200}, total=1200)
+
+        assert written == 1200
+        data = json.loads(output_file.read_text(encoding='utf-8'))
+        assert data["metadata"]["total_messages"] == 1200
+        assert len(data["messages"]) == 1200
+        assert data["messages"][-1]["content"] == "Message 1199"
+
+    def test_json_export_empty(self, tmp_path):
+        """Test exporting an empty transcript."""
+        output_file = tmp_path / "empty.json"
+        export_transcript(iter([]), str(output_file), "json")
+
+        data = json.loads(output_file.read_text(encoding='utf-8'))
+        assert data["messages"] == []
+
+    def test_gzip_export(self, messages, tmp_path):
+        """Test gzip output is chosen from the .gz suffix."""
+        output_file = tmp_path / "transcript.json.gz"
+        export_transcript(iter(messages), str(output_file), "json")
+
+        with gzip.open(output_file, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        assert len(data["messages"]) == 1200
+        assert not (tmp_path / "transcript.json.gz.part").exists()
+
+    def test_html_export_escapes_content(self, tmp_path):
+        """Test HTML content is escaped and newlines become line breaks."""
+        msg = Message("Alice", "<b>bold</b>\nsecond line", time.time(), 1)
+        output_file = tmp_path / "transcript.html"
+        export_transcript([msg], str(output_file), "html")
+
+        content = output_file.read_text(encoding='utf-8')
+        assert "&lt;b&gt;bold&lt;/b&gt;<br>second line" in content
+        assert "<br>s<br>" not in content
+
+    def test_progress_callback(self, messages, tmp_path):
+        """Test progress is reported during and after the export."""
+        progress = []
+        export_transcript(iter(messages), str(tmp_path / "t.txt"), "txt",
+                          progress_callback=lambda done, total: progress.append((done, total)),
+                          total=len(messages))
+
+        assert progress[0] == (500, 1200)
+        assert progress[-1] == (1200, 1200)
+
+    def test_unsupported_format(self, tmp_path):
+        """Test unsupported formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported format"):
+            export_transcript([], str(tmp_path / "t.xml"), "xml")
+
+
+@pytest.mark.asyncio
+async def test_save_transcript_runs_off_loop(tmp_path):
+    """Test ChatLog exports in a worker thread and reports progress on the loop."""
+    chat_log = ChatLog(max_messages=2000)
+    for i in range(1000):
+        await chat_log.add_message("Alice", f"Message {i}")
+
+    progress = []
+    output_file = tmp_path / "transcript.json"
+    written = await chat_log.save_transcript(
+        str(output_file), "json",
+        progress_callback=lambda done, total: progress.append(done)
+    )
+    await asyncio.sleep(0)
+
+    assert written == 1000
+    assert progress[-1] == 1000
+    data = json.loads(output_file.read_text(encoding='utf-8'))
+    assert data["metadata"]["statistics"]["total_messages"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_header_counts_exported_messages(tmp_path):
+    """Test the header counts the messages in the file, not every message ever added."""
+    chat_log = ChatLog(max_messages=50, spill_to_disk=False)
+    for i in range(120):
+        await chat_log.add_message("Alice", f"Message {i}")
+
+    output_file = tmp_path / "transcript.json"
+    written = await chat_log.save_transcript(str(output_file), "json")
+
+    data = json.loads(output_file.read_text(encoding='utf-8'))
+    assert written == len(data["messages"]) == 50
+    assert data["metadata"]["total_messages"] == 50
+    assert data["metadata"]["statistics"]["total_messages"] == 120
+
+
+class TestTranscriptReader:
+    """Test suite for incremental transcript decoding."""
+
+    def test_reads_messages_and_metadata(self, messages, tmp_path):
+        """Test small chunks decode the same values as json.load."""
+        output_file = tmp_path / "transcript.json"
+        export_transcript(messages, str(output_file), "json",
+                          statistics={'total_messages': 1200})
+
+        reader = TranscriptReader(str(output_file), chunk_size=64)
+        decoded = list(reader)
+
+        assert decoded == json.loads(output_file.read_text(encoding='utf-8'))["messages"]
+        assert reader.metadata["total_messages"] == 1200
+
+    def test_reads_pretty_printed_gzip(self, tmp_path):
+        """Test indented legacy transcripts inside gzip are decoded."""
+        data = {
+            "metadata": {"total_messages": 2},
+            "messages": [
+                {"sender": "Alice", "content": "Hi \u00e9", "timestamp": 1.5,
+                 "message_id": 1, "message_type": "chat", "metadata": {}},
+                {"sender": "Bob", "content": "[not, an] {array}", "timestamp": 2.0,
+                 "message_id": 2, "message_type": "chat", "metadata": {"n": 12345}}
+            ]
+        }
+        output_file = tmp_path / "legacy.json.gz"
+        with gzip.open(output_file, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+        assert list(TranscriptReader(str(output_file), chunk_size=7)) == data["messages"]
+
+    def test_empty_and_malformed(self, tmp_path):
+        """Test empty transcripts and truncated files."""
+        empty = tmp_path / "empty.json"
+        empty.write_text('{"metadata": {}, "messages": []}')
+        assert list(TranscriptReader(str(empty))) == []
+
+        truncated = tmp_path / "truncated.json"
+        truncated.write_text('{"messages": [{"sender": "Alice"}, {"sen')
+        with pytest.raises(ValueError):
+            list(TranscriptReader(str(truncated)))
+
+
+class TestLoadTranscript:
+    """Test suite for ChatLog.load_transcript."""
+
+    @pytest.mark.asyncio
+    async def test_load_restores_statistics(self, tmp_path):
+        """Test every counter is rebuilt on load."""
+        chat_log = ChatLog()
+        for sender in ["Moderator", "Socrates", "Advocate", "Human_1", "Socrates"]:
+            await chat_log.add_message(sender, f"From {sender}")
+        expected = dict(chat_log.stats)
+
+        output_file = tmp_path / "transcript.json"
+        await chat_log.save_transcript(str(output_file))
+
+        loaded = ChatLog()
+        assert await loaded.load_transcript(str(output_file)) == 5
+
+        for key in ['total_messages', 'messages_by_sender', 'bot_responses',
+                    'human_responses', 'moderator_messages', 'silence_breaks']:
+            assert loaded.stats[key] == expected[key]
+        assert loaded.message_counter == 5
+
+    @pytest.mark.asyncio
+    async def test_large_load_spills_and_reports_progress(self, messages, tmp_path):
+        """Test a load bigger than the ring keeps every message and reports progress."""
+        output_file = tmp_path / "transcript.json.gz"
+        export_transcript(messages, str(output_file), "json",
+                          statistics={'total_messages': 1200})
+
+        chat_log = ChatLog(max_messages=100)
+        progress = []
+        await chat_log.load_transcript(str(output_file),
+                                       progress_callback=lambda n, total: progress.append((n, total)))
+
+        assert len(chat_log.messages) == 100
+        assert len(chat_log.get_messages()) == 1200
+        assert chat_log.stats['total_messages'] == 1200
+        assert progress[-1] == (1200, 1200)
+        assert len(progress) > 1
+
+    @pytest.mark.asyncio
+    async def test_load_archive(self, messages, tmp_path):
+        """Test archives load through the same path."""
+        output_file = tmp_path / "transcript.dbarc"
+        export_transcript(iter(messages), str(output_file), "archive")
+
+        chat_log = ChatLog()
+        assert await chat_log.load_transcript(str(output_file)) == 1200
+        assert chat_log.get_messages(limit=1)[0].content == "Message 1199"
@@ -0,0 +1,151 @@
+"""
+Tests for typing indicator aggregation.
+"""
+
+import pytest
+import asyncio
+import json
+from app.bot_client import BotClient
+from app.typing_state import TypingTracker
+from app.web_server import DebateWebServer
+
+
+def make_tracker(**kwargs):
+    published = []
+
+    async def publish(room, users):
+        published.append((room, users))
+
+    return TypingTracker(publish, **kwargs), published
+
+
+class RecordingWebSocket:
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+
+class TestTypingTracker:
+    """Test expiry and throttling."""
+
+    @pytest.mark.asyncio
+    async def test_aggregates_and_throttles(self):
+        tracker, published = make_tracker(ttl=10, interval=0.05)
+
+        for _ in range(5):
+            tracker.start("debate", "Alice")
+        tracker.start("debate", "Bob")
+        await asyncio.sleep(0.01)
+        assert published == [("debate", ["Alice", "Bob"])]
+
+        # Within the interval: held back, then one frame with the final state
+        tracker.stop("debate", "Alice")
+        tracker.start("debate", "Alice")
+        tracker.stop("debate", "Bob")
+        await asyncio.sleep(0.01)
+        assert len(published) == 1
+        await asyncio.sleep(0.06)
+        assert published[-1] == ("debate", ["Alice"])
+
+        assert tracker.is_typing("debate") and tracker.is_typing()
+        assert not tracker.is_typing("other")
+        tracker.close()
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_disconnect(self):
+        tracker, published = make_tracker(ttl=0.05, interval=0)
+        connection = object()
+
+        tracker.start("debate", "Alice")
+        tracker.start("debate", "Bob", owner=connection)
+        await asyncio.sleep(0.01)
+
+        tracker.drop_owner(connection)
+        await asyncio.sleep(0.01)
+        assert published[-1] == ("debate", ["Alice"])
+
+        await asyncio.sleep(0.06)
+        assert published[-1] == ("debate", [])
+        assert not tracker.is_typing()
+        assert tracker.get_stats()['expired'] == 1
+
+
+class TestTypingIntegration:
+    """Test the web server's typing frames and bots holding off."""
+
+    @pytest.mark.asyncio
+    async def test_keystrokes_become_one_frame(self):
+        server = DebateWebServer(telemetry_tick=0)
+        viewer = RecordingWebSocket()
+        await server.join_client(viewer)
+
+        typist = RecordingWebSocket()
+        for _ in range(5):
+            await server.handle_message(typist, json.dumps({'type': 'typing', 'sender': 'Human_1'}))
+        await asyncio.sleep(0.01)
+
+        frames = [frame for frame in viewer.sent if frame['type'] == 'typing']
+        assert [frame['users'] for frame in frames] == [['Human_1']]
+
+        await server.leave_client(typist)
+        assert not server.typing.is_typing()
+
+        await server.leave_client(viewer)
+        server.typing.close()
+
+    @pytest.mark.asyncio
+    async def test_bot_holds_off_while_human_types(self):
+        tracker, _ = make_tracker()
+        bot = BotClient("Socrates", "gpt-4", "openai", "philosophical", "neutral", api_key="test")
+        calls = []
+
+        class FakeProvider:
+            async def generate_response(self, messages, config):
+                calls.append(messages)
+                return ""
+
+        bot.ai_provider = FakeProvider()
+        bot.set_typing_state(tracker)
+
+        tracker.start("debate", "Human_1")
+        await bot._generate_autonomous_response([], spontaneous=True)
+        assert calls == []
+        assert bot.stats['typing_holds'] == 1
+
+        tracker.stop("debate", "Human_1")
+        await bot._generate_autonomous_response([], spontaneous=True)
+        assert len(calls) == 1
+        tracker.close()
+
+    @pytest.mark.asyncio
+    async def test_typing_hold_is_capped(self):
+        tracker, _ = make_tracker()
+        bot = BotClient("Socrates", "gpt-4", "openai", "philosophical", "neutral", api_key="test")
+        calls = []
+
+        class FakeProvider:
+            async def generate_response(self, messages, config):
+                calls.append(messages)
+                return ""
+
+        bot.ai_provider = FakeProvider()
+        bot.set_typing_state(tracker, max_hold=10.0)
+
+        # Someone who never stops typing holds the bot for max_hold at most
+        tracker.start("debate", "Human_1")
+        await bot._generate_autonomous_response([], spontaneous=True)
+        assert calls == []
+        bot._typing_hold_since -= 10.0
+        await bot._generate_autonomous_response([], spontaneous=True)
+        assert len(calls) == 1
+        assert bot.stats['typing_hold_overrides'] == 1
+
+        # Then a new hold starts
+        await bot._generate_autonomous_response([], spontaneous=True)
+        assert len(calls) == 1
+        assert bot.stats['typing_holds'] == 2
+        tracker.close()
@@ -5,7 +5,7 @@ Tests for the VotingSystem class.
 import pytest
 import asyncio
 import time
-from app.voting import VotingSystem, Vote, VotingResults
+from app.voting import VotingSystem, Vote, VotingResults, parse_ballot
 
 
 @pytest.fixture
@@ -250,12 +250,12 @@ class TestVotingSystem:
     def test_is_eligible_voter(self, voting_system):
         """Test voter eligibility checking."""
         # Empty eligible voters list means open voting
-        assert voting_system._is_eligible_voter('anyone') == True
+        assert voting_system.is_eligible_voter('anyone') == True
 
         # With specific eligible voters
         voting_system.add_eligible_voter('voter1')
-        assert voting_system._is_eligible_voter('voter1') == True
-        assert voting_system._is_eligible_voter('voter2') == False
+        assert voting_system.is_eligible_voter('voter1') == True
+        assert voting_system.is_eligible_voter('voter2') == False
 
     @pytest.mark.asyncio
     async def test_vote_history(self, voting_system):
@@ -452,4 +452,93 @@ class TestVotingResults:
         assert results.total_votes == 3
         assert len(results.votes_by_voter) == 3
         assert results.voting_duration == 60.0
-        assert results.participation_rate == 1.0
\ No newline at end of file
+        assert results.participation_rate == 1.0
+
+class TestParseBallot:
+    """Test extracting votes from model responses."""
+
+    def test_formats(self):
+        candidates = ['YES', 'NO', 'ABSTAIN']
+
+        assert parse_ballot('Sure! {"vote": "no", "reasoning": "Weak evidence."}', candidates) == \
+            ('NO', 'Weak evidence.')
+        assert parse_ballot('**VOTE:** [YES]\nREASONING: Strong case.', candidates) == \
+            ('YES', 'Strong case.')
+        assert parse_ballot('{"vote": "Bob"}', ['Alice', 'Bob']) == ('Bob', None)
+        assert parse_ballot('I think Alice argued best.', ['Alice', 'Bob']) == ('Alice', None)
+
+    def test_ambiguous_or_missing(self):
+        assert parse_ballot('Alice and Bob were both great', ['Alice', 'Bob']) is None
+        assert parse_ballot('VOTE: Carol', ['Alice', 'Bob']) is None
+        assert parse_ballot('', ['Alice']) is None
+
+
+class TestVoteCollection:
+    """Test concurrent vote collection."""
+
+    @pytest.mark.asyncio
+    async def test_collects_concurrently_and_closes_early(self, voting_system):
+        await voting_system.start_voting(['YES', 'NO'], 30, voters=['A', 'B', 'C'])
+
+        def ballot(response, delay):
+            async def ask():
+                await asyncio.sleep(delay)
+                return response
+            return ask
+
+        start = time.time()
+        votes = await voting_system.collect_votes({
+            'A': ballot('{"vote": "YES", "reasoning": "r"}', 0.1),
+            'B': ballot('VOTE: NO', 0.1),
+            'C': ballot('{"vote": "YES"}', 0.1)
+        })
+        assert time.time() - start < 0.2
+        assert votes == {'A': 'YES', 'B': 'NO', 'C': 'YES'}
+        assert await voting_system.wait_for_votes() is True
+
+        results = await voting_system.end_voting()
+        assert results.vote_counts == {'YES': 2, 'NO': 1}
+
+    @pytest.mark.asyncio
+    async def test_shared_deadline(self, voting_system):
+        await voting_system.start_voting(['YES', 'NO'], 30, voters=['A', 'B', 'C'])
+        voting_system.end_time = time.time() + 0.1
+
+        async def slow():
+            await asyncio.sleep(5)
+            return 'VOTE: YES'
+
+        async def broken():
+            raise RuntimeError("provider down")
+
+        async def fast():
+            return 'VOTE: NO'
+
+        start = time.time()
+        votes = await voting_system.collect_votes({'A': slow, 'B': broken, 'C': fast})
+        assert time.time() - start < 1
+        assert votes == {'A': None, 'B': None, 'C': 'NO'}
+        assert await voting_system.wait_for_votes() is False
+
+
+class TestLiveTally:
+    """Test the maintained vote counts."""
+
+    @pytest.mark.asyncio
+    async def test_counts_follow_changes_of_vote(self, voting_system):
+        await voting_system.start_voting(['YES', 'NO'], 30, voters=[])
+
+        await voting_system.cast_vote('a', 'YES')
+        await voting_system.cast_vote('b', 'YES')
+        await voting_system.cast_vote('a', 'NO')
+        await voting_system.cast_vote('b', 'NO')
+
+        assert voting_system.vote_counts == {'NO': 2}
+        assert voting_system.get_vote_summary()['vote_counts'] == {'NO': 2}
+
+        results = await voting_system.end_voting()
+        assert results.vote_counts == {'NO': 2}
+        assert results.winner == 'NO'
+
+        await voting_system.start_voting(['YES', 'NO'], 30, voters=[])
+        assert voting_system.get_vote_summary()['vote_counts'] == {}
@@ -0,0 +1,174 @@
+"""
+Tests for the debate web server's room snapshot.
+"""
+
+import pytest
+import asyncio
+import json
+from types import SimpleNamespace
+from app.chat_log import ChatLog
+from app.voting import VotingSystem
+from app.web_server import DebateWebServer
+
+
+class ConnectingWebSocket:
+    """Websocket stand-in that records frames and stays open until told."""
+
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self, path: str = "/"):
+        self.sent = []
+        self.request = SimpleNamespace(path=path)
+        self.disconnect = asyncio.Event()
+
+    async def send(self, frame):
+        self.sent.append(json.loads(frame))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self.disconnect.wait()
+        raise StopAsyncIteration
+
+
+def make_server():
+    """Server with a moderator, chat log and voting system."""
+    server = DebateWebServer(telemetry_tick=0)
+    bot = SimpleNamespace(name="Socrates",
+                          config=SimpleNamespace(stance="neutral", personality="Philosopher"))
+    server.set_moderator(SimpleNamespace(topic="Remote work",
+                                         participants=[bot, SimpleNamespace(name="Human_1")]))
+    server.set_chat_log(ChatLog())
+    server.set_voting_system(VotingSystem({'require_justification': False}))
+    return server
+
+
+class TestRoomSnapshot:
+    """Test the cached join frame."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_contents(self):
+        """Test one frame carries topic, participants, history, votes and state."""
+        server = make_server()
+        await server.chat_log.add_message("Human_1", "Hello")
+        await server.broadcast_stats({'phase': 'debate'})
+
+        snapshot = json.loads(server.get_room_snapshot())
+
+        assert snapshot['type'] == 'room_snapshot'
+        assert snapshot['topic'] == "Remote work"
+        assert [p['name'] for p in snapshot['participants']] == ["Socrates", "Human_1"]
+        assert [m['content'] for m in snapshot['messages']] == ["Hello"]
+        assert snapshot['last_message_id'] == 1
+        assert snapshot['votes']['is_active'] is False
+        assert snapshot['state'][0]['channel'] == 'stats'
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_cached_until_room_changes(self):
+        """Test joins reuse one encoding and changes invalidate it."""
+        server = make_server()
+
+        first = server.get_room_snapshot()
+        for _ in range(50):
+            assert server.get_room_snapshot() is first
+        assert server.room_snapshot_builds == 1
+        assert server.room_snapshot_hits == 50
+
+        await server.chat_log.add_message("Human_1", "Hello")
+        after_message = server.get_room_snapshot()
+        assert after_message is not first
+
+        await server.voting_system.start_voting(["Socrates"], duration=60)
+        await server.voting_system.cast_vote("Socrates", "Socrates")
+        after_vote = json.loads(server.get_room_snapshot())
+        assert after_vote['votes']['vote_counts'] == {"Socrates": 1}
+
+        await server.broadcast_stats({'phase': 'voting'})
+        assert json.loads(server.get_room_snapshot())['version'] == after_vote['version'] + 1
+        assert server.room_snapshot_builds == 4
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_join_sends_single_frame(self):
+        """Test a new client receives exactly one frame on connect."""
+        server = make_server()
+        await server.chat_log.add_message("Human_1", "Hello")
+
+        websocket = ConnectingWebSocket()
+        task = asyncio.create_task(server.handle_client(websocket))
+        await asyncio.sleep(0.01)
+
+        assert [frame['type'] for frame in websocket.sent] == ['room_snapshot']
+        assert websocket in server.clients
+
+        websocket.disconnect.set()
+        await task
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_send_participants_to_client(self):
+        """Test the participant list can be re-sent to one client."""
+        server = make_server()
+        websocket = ConnectingWebSocket()
+
+        await server.send_participants_to_client(websocket)
+        await asyncio.sleep(0.01)
+
+        assert websocket.sent == [{'type': 'participants',
+                                   'participants': server._get_participants()}]
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_resuming_client_gets_replay(self):
+        """Test a client with a cursor gets the snapshot without history, then its replay."""
+        server = make_server()
+        for i in range(3):
+            await server.chat_log.add_message("Human_1", f"Message {i}")
+
+        websocket = ConnectingWebSocket("/?after=1")
+        task = asyncio.create_task(server.handle_client(websocket))
+        await asyncio.sleep(0.01)
+
+        snapshot, history = websocket.sent
+        assert snapshot['messages'] == []
+        assert [m['message_id'] for m in history['messages']] == [2, 3]
+
+        websocket.disconnect.set()
+        await task
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_long_replay_is_paged(self):
+        """Test a replay from an old cursor is capped and marked so the client can page."""
+        server = make_server()
+        server.REPLAY_LIMIT = 4
+        for i in range(10):
+            await server.chat_log.add_message("Human_1", f"Message {i}")
+
+        first = server._get_history(0)
+        assert [m['message_id'] for m in first['messages']] == [1, 2, 3, 4]
+        assert first['truncated'] and first['last_message_id'] == 4
+
+        second = server._get_history(8)
+        assert [m['message_id'] for m in second['messages']] == [9, 10]
+        assert 'truncated' not in second and second['last_message_id'] == 10
+        await server.stop_server()
+
+    @pytest.mark.asyncio
+    async def test_stale_cursor_gets_fresh_snapshot(self):
+        """Test a cursor ahead of the chat log (e.g. after a restart) starts over."""
+        server = make_server()
+        await server.chat_log.add_message("Human_1", "First since restart")
+
+        websocket = ConnectingWebSocket("/?after=40")
+        task = asyncio.create_task(server.handle_client(websocket))
+        await asyncio.sleep(0.01)
+
+        assert [frame['type'] for frame in websocket.sent] == ['room_snapshot']
+        assert [m['content'] for m in websocket.sent[0]['messages']] == ["First since restart"]
+
+        websocket.disconnect.set()
+        await task
+        await server.stop_server()
@@ -0,0 +1,126 @@
+"""
+Tests for the optional binary wire format.
+"""
+
+import pytest
+import asyncio
+import json
+import websockets
+from app.chat_log import ChatLog
+from app.gateway import RealtimeGateway
+from app.web_server import DebateWebServer
+from app.wire import (SUBPROTOCOL, WireDecoder, WireEncoder, read_varint, unzigzag,
+                      write_varint, zigzag)
+
+
+class TestEncoding:
+    """Test varints and message round trips."""
+
+    def test_varints(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 41):
+            buf = bytearray()
+            write_varint(buf, value)
+            assert read_varint(bytes(buf), 0) == (value, len(buf))
+        for value in (0, -1, 1, -1500, 1500):
+            assert unzigzag(zigzag(value)) == value
+
+    def test_round_trip_with_shared_table(self):
+        encoder = WireEncoder(epoch=1000.0)
+        frame = {'type': 'message', 'sender': 'Sócrates', 'content': 'Ποιος; 🤔',
+                 'message_type': 'bot', 'timestamp': 1002.5, 'response_time': 1.25,
+                 'message_id': 41, 'participant_info': {'model': 'gpt-4'}}
+
+        define, message = encoder.encode_message(frame)
+        assert define is not None
+        assert len(message) < len(json.dumps(frame))
+
+        decoder = WireDecoder()
+        decoder.decode(encoder.hello())
+        decoder.decode(define)
+        decoded = decoder.decode(message)
+        assert decoded == {key: value for key, value in frame.items() if key != 'participant_info'}
+
+        # Known strings are not announced again; late joiners get them in HELLO
+        again, _ = encoder.encode_message(dict(frame, message_id=42))
+        assert again is None
+        late = WireDecoder()
+        late.decode(encoder.hello())
+        decoded = late.decode(encoder.encode_message({'sender': 'Sócrates', 'content': 'x',
+                                                      'message_type': 'bot',
+                                                      'timestamp': 999.0})[1])
+        assert decoded['sender'] == 'Sócrates'
+        assert decoded['timestamp'] == 999.0
+        assert 'message_id' not in decoded and 'response_time' not in decoded
+
+    def test_client_names_are_sent_inline(self):
+        """Test senders chosen by clients never enter the shared table."""
+        encoder = WireEncoder(epoch=1000.0)
+        decoder = WireDecoder()
+        decoder.decode(encoder.hello())
+
+        for i in range(50):
+            define, message = encoder.encode_message(
+                {'sender': f"Visitor {i}", 'content': 'hi', 'message_type': 'human',
+                 'timestamp': 1001.0}, intern_sender=False)
+            if define is not None:
+                decoder.decode(define)
+            decoded = decoder.decode(message)
+            assert decoded['sender'] == f"Visitor {i}"
+            assert decoded['message_type'] == 'human'
+
+        # Unknown message types are inline too
+        define, message = encoder.encode_message({'sender': 'Socrates', 'content': 'x',
+                                                  'message_type': 'x' * 40,
+                                                  'timestamp': 1001.0})
+        assert decoder.decode(define) is None
+        assert decoder.decode(message)['message_type'] == 'x' * 40
+
+        assert encoder.strings == ['human', 'Socrates']
+        assert len(encoder._pairs) == 0
+
+
+class TestNegotiation:
+    """Test binary and JSON clients sharing one server."""
+
+    @pytest.mark.asyncio
+    async def test_binary_and_json_clients(self):
+        server = DebateWebServer(telemetry_tick=0)
+        chat_log = ChatLog()
+        chat_log.set_web_server(server)
+        server.set_chat_log(chat_log)
+
+        gateway = RealtimeGateway(port=0)
+        await server.start_server(gateway=gateway)
+        await gateway.start()
+        port = gateway.server.sockets[0].getsockname()[1]
+        try:
+            binary = await websockets.connect(f"ws://localhost:{port}/",
+                                              subprotocols=[SUBPROTOCOL])
+            assert binary.subprotocol == SUBPROTOCOL
+            plain = await websockets.connect(f"ws://localhost:{port}/")
+            assert plain.subprotocol is None
+
+            decoder = WireDecoder()
+            assert decoder.decode(await asyncio.wait_for(binary.recv(), 1)) is None
+            assert json.loads(await asyncio.wait_for(binary.recv(), 1))['type'] == 'room_snapshot'
+            assert json.loads(await asyncio.wait_for(plain.recv(), 1))['type'] == 'room_snapshot'
+
+            await chat_log.add_message("Alice", "Hello")
+
+            # New strings arrive first, then the message itself
+            frames = [await asyncio.wait_for(binary.recv(), 1) for _ in range(2)]
+            assert all(isinstance(frame, bytes) for frame in frames)
+            decoded = [decoder.decode(frame) for frame in frames]
+            assert decoded[0] is None
+            assert decoded[1]['sender'] == "Alice" and decoded[1]['content'] == "Hello"
+
+            message = json.loads(await asyncio.wait_for(plain.recv(), 1))
+            assert message['content'] == "Hello"
+            assert message['message_id'] == decoded[1]['message_id']
+
+            assert server.get_outbound_stats()['wire']['binary_clients'] == 1
+            for ws in (binary, plain):
+                await ws.close()
+        finally:
+            await gateway.stop()
+            server.typing.close()